@@ -0,0 +1,168 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#asyncio keywords, module requires Python 3 and it is imported by JMeterLib only if available
+
+import asyncio
+import concurrent.futures
+import functools
+
+import JMeterClasses
+
+
+def runKeyword(keywordName, args):
+    return getattr(JMeterClasses.JMeterKeywords(), keywordName)(*args)
+
+
+class JMeterAsyncKeywords(object):
+    executorKind = "thread"
+    maxWorkers = None
+    executor = None
+
+    def setAsyncExecutor(self, kind="thread", maxWorkers=None):
+        """
+        Selects executor used by asynchronous analysis keywords. Thread executor shares
+        analysis cache and handles with synchronous keywords, process executor parses log
+        files in parallel on many CPU cores, but results are copied between processes and
+        settings of other keywords (e.g. `Set Jtl Index`) are not passed to worker processes.
+        Returns None.
+        Parameters:
+            - kind (optional) - thread or process
+            - maxWorkers (optional) - maximum number of threads or processes, default is chosen
+             by Python
+        Examples:
+        | set async executor | process | 4 |
+        """
+        if kind not in ["thread", "process"]:
+            raise JMeterClasses.JMeterLibException("Unknown executor %s, use thread or process" % kind)
+        if JMeterAsyncKeywords.executor != None:
+            JMeterAsyncKeywords.executor.shutdown(wait=False)
+            JMeterAsyncKeywords.executor = None
+        JMeterAsyncKeywords.executorKind = kind
+        JMeterAsyncKeywords.maxWorkers = None if maxWorkers in [None, ""] else int(maxWorkers)
+
+    def _getExecutor(self):
+        if JMeterAsyncKeywords.executor == None:
+            if JMeterAsyncKeywords.executorKind == "process":
+                JMeterAsyncKeywords.executor = concurrent.futures.ProcessPoolExecutor(JMeterAsyncKeywords.maxWorkers)
+            else:
+                JMeterAsyncKeywords.executor = concurrent.futures.ThreadPoolExecutor(JMeterAsyncKeywords.maxWorkers)
+        return JMeterAsyncKeywords.executor
+
+    async def _runInExecutor(self, keywordName, *args):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._getExecutor(), functools.partial(runKeyword, keywordName, args))
+
+    async def runJmeterAsync(self, jmeterPath, testPlanPath, logFilePath, otherParams=""):
+        """
+        Runs JMeter as asyncio subprocess, so event loop is not blocked while test is running.
+        Parameters are the same as in `Run Jmeter`. Returns None.
+        JMeter process is killed if keyword is cancelled.
+        Examples:
+        | run jmeter async | D:/apache-jmeter-2.12/bin/jmeter.bat | D:/Tests/Test1Thread1Loop.jmx | D:/Tests/output1.jtl |
+        """
+        runner = JMeterClasses.JMeterRunner(jmeterPath, testPlanPath, logFilePath, otherParams, start=False)
+        runList = runner.getRunList()
+        print("asyncio subprocess input list: " + str(runList))
+        process = await asyncio.create_subprocess_exec(*runList)
+        try:
+            retValue = await process.wait()
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+        runner.checkReturnValue(retValue)
+
+    async def analyseJtlAsync(self, logFilePath, *args):
+        """
+        Runs `Analyse Jtl` in executor selected by `Set Async Executor`.
+        Parameters are the same as in `Analyse Jtl`.
+        Examples:
+        | ${result}= | analyse jtl async | D:/Tests/output1.jtl |
+        """
+        return await self._runInExecutor("analyseJtl", logFilePath, *args)
+
+    async def analyseJtlConvertAsync(self, logFilePath, *args):
+        """
+        Runs `Analyse Jtl Convert` in executor selected by `Set Async Executor`.
+        Parameters are the same as in `Analyse Jtl Convert`.
+        Examples:
+        | ${result}= | analyse jtl convert async | D:/Tests/output1.jtl |
+        """
+        return await self._runInExecutor("analyseJtlConvert", logFilePath, *args)
+
+    async def analyseJtlConvertToHtmlAsync(self, logFilePath, *args):
+        """
+        Runs `Analyse Jtl Convert To Html` in executor selected by `Set Async Executor`.
+        Parameters are the same as in `Analyse Jtl Convert To Html`.
+        Examples:
+        | ${result}= | analyse jtl convert to html async | D:/Tests/output1.jtl |
+        """
+        return await self._runInExecutor("analyseJtlConvertToHtml", logFilePath, *args)
+
+    async def analyseJtlConvertToDbAsync(self, logFilePath, *args):
+        """
+        Runs `Analyse Jtl Convert To Db` in executor selected by `Set Async Executor`.
+        Parameters are the same as in `Analyse Jtl Convert To Db`.
+        Examples:
+        | ${result}= | analyse jtl convert to db async | D:/Tests/output1.jtl |
+        """
+        return await self._runInExecutor("analyseJtlConvertToDb", logFilePath, *args)
+
+    async def parseJtlAsync(self, logFilePath, *args):
+        """
+        Runs `Parse Jtl` in executor selected by `Set Async Executor` and returns analysis handle.
+        Parameters are the same as in `Parse Jtl`. With process executor the handle is a copy of
+        analysis made in worker process, all its samples are copied between processes and they are
+        not stored in analysis cache, so thread executor is better suited for handles.
+        Examples:
+        | ${handle}= | parse jtl async | D:/Tests/output1.jtl |
+        """
+        return await self._runInExecutor("parseJtl", logFilePath, *args)
+
+    async def runJmeterAnalyseJtlConvertAsync(self, jmeterPath, testPlanPath, logFilePath, otherParams="", *args):
+        """
+        Runs JMeter with `Run Jmeter Async` and analyses its log file with `Analyse Jtl Convert Async`.
+        Parameters following otherParams are the same as in `Analyse Jtl Convert`.
+        Examples:
+        | ${result}= | run jmeter analyse jtl convert async | D:/apache-jmeter-2.12/bin/jmeter.bat | D:/Tests/Test1Thread1Loop.jmx | D:/Tests/output1.jtl |
+        """
+        await self.runJmeterAsync(jmeterPath, testPlanPath, logFilePath, otherParams)
+        return await self.analyseJtlConvertAsync(logFilePath, *args)
+
+    async def runJmeterAnalyseJtlConvertConcurrently(self, jmeterPath, testPlanPaths, logFilePaths, otherParams=""):
+        """
+        Runs many JMeter tests concurrently and analyses every log file as soon as its test ends.
+        Returns list of results of `Analyse Jtl Convert` in order of test plans. If any run fails,
+        remaining runs are cancelled and the error is raised.
+        Parameters:
+            - jmeterPath - path to JMeter executable file
+            - testPlanPaths - list of paths to test plans
+            - logFilePaths - list of paths to log files, one per test plan
+            - otherParams (optional) - other JMeter parameters used for every run
+        Examples:
+        | ${results}= | run jmeter analyse jtl convert concurrently | D:/apache-jmeter-2.12/bin/jmeter.bat | ${plans} | ${logs} |
+        """
+        if len(testPlanPaths) != len(logFilePaths):
+            raise JMeterClasses.JMeterLibException("Amount of test plans and log files differs.")
+        tasks = [asyncio.ensure_future(self.runJmeterAnalyseJtlConvertAsync(jmeterPath, plan, log, otherParams))
+                 for plan, log in zip(testPlanPaths, logFilePaths)]
+        try:
+            return await asyncio.gather(*tasks)
+        except Exception:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
@@ -21,9 +21,51 @@ import time
 import datetime
 import math
 import sqlite3
+import hashlib
+import collections
+import itertools
+import array
+import codecs
+import struct
+import sys
+import json
+import bisect
+import random
+import glob
+import threading
+import multiprocessing
+import copy
 import xml.dom.minidom
+import xml.parsers.expat
+import xml.etree.ElementTree
 from xml.dom.minidom import getDOMImplementation
 from time import gmtime, strftime
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+try:
+    import resource
+except ImportError:
+    resource = None
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+try:
+    import cProfile
+except ImportError:
+    cProfile = None
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+try:
+    unicode
+except NameError:
+    unicode = str
 
 class JMeterKeywords(object):
     def runJmeter(self, jmeterPath, testPlanPath, logFilePath, otherParams=""):
@@ -40,7 +82,8 @@ class JMeterKeywords(object):
         """
         JMeterRunner(jmeterPath, testPlanPath, logFilePath, otherParams)
 
-    def runJmeterAnalyseJtlConvert(self, jmeterPath, testPlanPath, logFilePath, otherParams="", disableReports=None):
+    def runJmeterAnalyseJtlConvert(self, jmeterPath, testPlanPath, logFilePath, otherParams="", disableReports=None, maxInlineSamples=None, startOffset=None, endOffset=None, windowStart=None, windowEnd=None,
+                   includeLabels=None, excludeLabels=None, labelGroups=None):
         """
         Runs JMeter and parses log file. Converts results into HTML and SQLite format.
         Returns list of dictionaries containing summary report of parsed output.
@@ -56,16 +99,32 @@ class JMeterKeywords(object):
     			 0b00000010 -> disable aggregated samples;
     			 0b00000100 -> disable response time graph;
     			 0b00001000 -> disable all samples;
+    			 0b00010000 -> disable response codes and failures;
               For example disabling aggr samples and resp time graph needs 0b00000110 which is integer 6.
+            - maxInlineSamples (optional) - maximum number of samples embedded in html file, remaining
+             samples are written into separate files (log file path + ".samples-<hash>-<N>.js") loaded on demand
+            - startOffset (optional) - seconds skipped from the beginning of the log file (ramp-up)
+            - endOffset (optional) - seconds skipped from the end of the log file (ramp-down)
+            - windowStart (optional) - samples started earlier are skipped, epoch milliseconds
+             or YYYY-MM-DD HH:MM:SS in local time
+            - windowEnd (optional) - samples started later are skipped, format as windowStart
+            - includeLabels (optional) - regular expression, samples with not matching label are skipped
+            - excludeLabels (optional) - regular expression, samples with matching label are skipped
+            - labelGroups (optional) - list or semicolon separated string of <regex>=><group> rules,
+             label matching regex is replaced by group (first matching rule wins, group may use \\1)
         Examples:
         | run jmeter analyse jtl convert | D:/apache-jmeter-2.12/bin/jmeter.bat | D:/Tests/Test1Thread1Loop.jmx | D:/Tests/output1.jtl |
         | run jmeter analyse jtl convert | D:/apache-jmeter-2.12/bin/jmeter.bat | D:/Tests/Test1Thread1Loop.jmx | D:/Tests/output1.jtl | -H my.proxy.server -P 8000 |
+        | run jmeter analyse jtl convert | D:/apache-jmeter-2.12/bin/jmeter.bat | D:/Tests/Test1Thread1Loop.jmx | D:/Tests/output1.jtl | startOffset=60 | endOffset=30 |
         """
         JMeterRunner(jmeterPath, testPlanPath, logFilePath, otherParams)
-        lai = LogAnalysisInitiator(logFilePath, True, True, disableReports=disableReports)
+        lai = LogAnalysisInitiator(logFilePath, True, True, disableReports=disableReports, maxInlineSamples=maxInlineSamples,
+                                   sampleFilter=SampleFilter(startOffset, endOffset, windowStart, windowEnd,
+                                                             includeLabels, excludeLabels, labelGroups))
         return lai.getReturnStructure()
 
-    def runJmeterAnalyseJtlConvertToDb(self, jmeterPath, testPlanPath, logFilePath, otherParams=""):
+    def runJmeterAnalyseJtlConvertToDb(self, jmeterPath, testPlanPath, logFilePath, otherParams="", historyDbPath=None, startOffset=None, endOffset=None, windowStart=None, windowEnd=None,
+                   includeLabels=None, excludeLabels=None, labelGroups=None):
         """
         Runs JMeter and parses log file. Converts results into SQLite format.
         Returns list of dictionaries containing summary report of parsed output.
@@ -74,15 +133,29 @@ class JMeterKeywords(object):
             - testPlanPath - path to jmx file
             - logFilePath - path to a log file
             - otherParams (optional) - other parameters to be called
+            - historyDbPath (optional) - SQLite file to which results are appended, see `Analyse Jtl Convert To Db`
+            - startOffset (optional) - seconds skipped from the beginning of the log file (ramp-up)
+            - endOffset (optional) - seconds skipped from the end of the log file (ramp-down)
+            - windowStart (optional) - samples started earlier are skipped, epoch milliseconds
+             or YYYY-MM-DD HH:MM:SS in local time
+            - windowEnd (optional) - samples started later are skipped, format as windowStart
+            - includeLabels (optional) - regular expression, samples with not matching label are skipped
+            - excludeLabels (optional) - regular expression, samples with matching label are skipped
+            - labelGroups (optional) - list or semicolon separated string of <regex>=><group> rules,
+             label matching regex is replaced by group (first matching rule wins, group may use \\1)
         Examples:
         | run jmeter analyse jtl convert to db | D:/apache-jmeter-2.12/bin/jmeter.bat | D:/Tests/Test1Thread1Loop.jmx | D:/Tests/output1.jtl |
         | run jmeter analyse jtl convert to db | D:/apache-jmeter-2.12/bin/jmeter.bat | D:/Tests/Test1Thread1Loop.jmx | D:/Tests/output1.jtl | -H my.proxy.server -P 8000 |
+        | run jmeter analyse jtl convert to db | D:/apache-jmeter-2.12/bin/jmeter.bat | D:/Tests/Test1Thread1Loop.jmx | D:/Tests/output1.jtl | | D:/Tests/history.sql |
         """
         JMeterRunner(jmeterPath, testPlanPath, logFilePath, otherParams)
-        lai = LogAnalysisInitiator(logFilePath, True)
+        lai = LogAnalysisInitiator(logFilePath, True, historyDbPath=historyDbPath,
+                                   sampleFilter=SampleFilter(startOffset, endOffset, windowStart, windowEnd,
+                                                             includeLabels, excludeLabels, labelGroups))
         return lai.getReturnStructure()
 
-    def runJmeterAnalyseJtlConvertToHtml(self, jmeterPath, testPlanPath, logFilePath, otherParams="", disableReports=None):
+    def runJmeterAnalyseJtlConvertToHtml(self, jmeterPath, testPlanPath, logFilePath, otherParams="", disableReports=None, maxInlineSamples=None, startOffset=None, endOffset=None, windowStart=None, windowEnd=None,
+                   includeLabels=None, excludeLabels=None, labelGroups=None):
         """
         Runs JMeter and parses log file. Converts results into html format.
         Returns list of dictionaries containing summary report of parsed output.
@@ -98,16 +171,31 @@ class JMeterKeywords(object):
     			 0b00000010 -> disable aggregated samples;
     			 0b00000100 -> disable response time graph;
     			 0b00001000 -> disable all samples;
+    			 0b00010000 -> disable response codes and failures;
               For example disabling aggr samples and resp time graph needs 0b00000110 which is integer 6.
+            - maxInlineSamples (optional) - maximum number of samples embedded in html file, remaining
+             samples are written into separate files (log file path + ".samples-<hash>-<N>.js") loaded on demand
+            - startOffset (optional) - seconds skipped from the beginning of the log file (ramp-up)
+            - endOffset (optional) - seconds skipped from the end of the log file (ramp-down)
+            - windowStart (optional) - samples started earlier are skipped, epoch milliseconds
+             or YYYY-MM-DD HH:MM:SS in local time
+            - windowEnd (optional) - samples started later are skipped, format as windowStart
+            - includeLabels (optional) - regular expression, samples with not matching label are skipped
+            - excludeLabels (optional) - regular expression, samples with matching label are skipped
+            - labelGroups (optional) - list or semicolon separated string of <regex>=><group> rules,
+             label matching regex is replaced by group (first matching rule wins, group may use \\1)
         Examples:
         | run jmeter analyse jtl convert to html | D:/apache-jmeter-2.12/bin/jmeter.bat | D:/Tests/Test1Thread1Loop.jmx | D:/Tests/output1.jtl |
         | run jmeter analyse jtl convert to html | D:/apache-jmeter-2.12/bin/jmeter.bat | D:/Tests/Test1Thread1Loop.jmx | D:/Tests/output1.jtl | -H my.proxy.server -P 8000 |
         """
         JMeterRunner(jmeterPath, testPlanPath, logFilePath, otherParams)
-        lai = LogAnalysisInitiator(logFilePath, createHtmlReport=True, disableReports=disableReports)
+        lai = LogAnalysisInitiator(logFilePath, createHtmlReport=True, disableReports=disableReports, maxInlineSamples=maxInlineSamples,
+                                   sampleFilter=SampleFilter(startOffset, endOffset, windowStart, windowEnd,
+                                                             includeLabels, excludeLabels, labelGroups))
         return lai.getReturnStructure()
 
-    def runJmeterAnalyseJtl(self, jmeterPath, testPlanPath, logFilePath, otherParams=""):
+    def runJmeterAnalyseJtl(self, jmeterPath, testPlanPath, logFilePath, otherParams="", startOffset=None, endOffset=None, windowStart=None, windowEnd=None,
+                   includeLabels=None, excludeLabels=None, labelGroups=None):
         """
         Runs JMeter and parses log file.
         Returns list of dictionaries containing summary report of parsed output.
@@ -116,15 +204,26 @@ class JMeterKeywords(object):
             - testPlanPath - path to jmx file
             - logFilePath - path to a log file
             - otherParams (optional) - other parameters to be called
+            - startOffset (optional) - seconds skipped from the beginning of the log file (ramp-up)
+            - endOffset (optional) - seconds skipped from the end of the log file (ramp-down)
+            - windowStart (optional) - samples started earlier are skipped, epoch milliseconds
+             or YYYY-MM-DD HH:MM:SS in local time
+            - windowEnd (optional) - samples started later are skipped, format as windowStart
+            - includeLabels (optional) - regular expression, samples with not matching label are skipped
+            - excludeLabels (optional) - regular expression, samples with matching label are skipped
+            - labelGroups (optional) - list or semicolon separated string of <regex>=><group> rules,
+             label matching regex is replaced by group (first matching rule wins, group may use \\1)
         Examples:
         | run jmeter analyse jtl | D:/apache-jmeter-2.12/bin/jmeter.bat | D:/Tests/Test1Thread1Loop.jmx | D:/Tests/output1.jtl |
         | run jmeter analyse jtl | D:/apache-jmeter-2.12/bin/jmeter.bat | D:/Tests/Test1Thread1Loop.jmx | D:/Tests/output1.jtl | -H my.proxy.server -P 8000 |
         """
         JMeterRunner(jmeterPath, testPlanPath, logFilePath, otherParams)
-        lai = LogAnalysisInitiator(logFilePath)
+        lai = LogAnalysisInitiator(logFilePath, sampleFilter=SampleFilter(startOffset, endOffset, windowStart, windowEnd,
+                                                                          includeLabels, excludeLabels, labelGroups))
         return lai.getReturnStructure()
 
-    def analyseJtlConvert(self, logFilePath, disableReports=None):
+    def analyseJtlConvert(self, logFilePath, disableReports=None, maxInlineSamples=None, startOffset=None, endOffset=None, windowStart=None, windowEnd=None,
+                   includeLabels=None, excludeLabels=None, labelGroups=None):
         """
         Parses JMeter log file. Converts results into HTML and SQLite format.
         Returns list of dictionaries containing summary report of parsed output.
@@ -137,26 +236,90 @@ class JMeterKeywords(object):
     			 0b00000010 -> disable aggregated samples;
     			 0b00000100 -> disable response time graph;
     			 0b00001000 -> disable all samples;
+    			 0b00010000 -> disable response codes and failures;
               For example disabling aggr samples and resp time graph needs 0b00000110 which is integer 6.
+            - maxInlineSamples (optional) - maximum number of samples embedded in html file, remaining
+             samples are written into separate files (log file path + ".samples-<hash>-<N>.js") loaded on demand
+            - startOffset (optional) - seconds skipped from the beginning of the log file (ramp-up)
+            - endOffset (optional) - seconds skipped from the end of the log file (ramp-down)
+            - windowStart (optional) - samples started earlier are skipped, epoch milliseconds
+             or YYYY-MM-DD HH:MM:SS in local time
+            - windowEnd (optional) - samples started later are skipped, format as windowStart
+            - includeLabels (optional) - regular expression, samples with not matching label are skipped
+            - excludeLabels (optional) - regular expression, samples with matching label are skipped
+            - labelGroups (optional) - list or semicolon separated string of <regex>=><group> rules,
+             label matching regex is replaced by group (first matching rule wins, group may use \\1)
         Examples:
         | analyse jtl convert | D:/Tests/output1.jtl |
+        | analyse jtl convert | D:/Tests/output1.jtl | startOffset=60 | endOffset=30 |
         """
-        lai = LogAnalysisInitiator(logFilePath, True, True, disableReports=disableReports)
+        lai = LogAnalysisInitiator(logFilePath, True, True, disableReports=disableReports, maxInlineSamples=maxInlineSamples,
+                                  sampleFilter=SampleFilter(startOffset, endOffset, windowStart, windowEnd,
+                                                            includeLabels, excludeLabels, labelGroups))
         return lai.getReturnStructure()
 
-    def analyseJtlConvertToDb(self, logFilePath):
+    def analyseJtlConvertToDb(self, logFilePath, startOffset=None, endOffset=None, windowStart=None, windowEnd=None,
+                   includeLabels=None, excludeLabels=None, labelGroups=None, historyDbPath=None):
         """
         Parses JMeter log file. Converts results into SQLite format.
+        Sample table keeps start time of every sample and SampleRollup table keeps amount of samples,
+        errors, sum, min and max of response times and sum of latencies per label and second, so
+        time-based queries don't need to read all samples.
         Returns list of dictionaries containing summary report of parsed output.
         Parameters:
             - logFilePath - path to a log file
+            - startOffset (optional) - seconds skipped from the beginning of the log file (ramp-up)
+            - endOffset (optional) - seconds skipped from the end of the log file (ramp-down)
+            - windowStart (optional) - samples started earlier are skipped, epoch milliseconds
+             or YYYY-MM-DD HH:MM:SS in local time
+            - windowEnd (optional) - samples started later are skipped, format as windowStart
+            - includeLabels (optional) - regular expression, samples with not matching label are skipped
+            - excludeLabels (optional) - regular expression, samples with matching label are skipped
+            - labelGroups (optional) - list or semicolon separated string of <regex>=><group> rules,
+             label matching regex is replaced by group (first matching rule wins, group may use \\1)
+            - historyDbPath (optional) - SQLite file to which results are appended as a new Testrun,
+             it's created if it doesn't exist. Otherwise new SQLite file (log file path + ".sql") is created.
+             History file is used by `Create Jtl Trend Dashboard`.
         Examples:
         | analyse jtl convert to db | D:/Tests/output1.jtl |
+        | analyse jtl convert to db | D:/Tests/output1.jtl | historyDbPath=D:/Tests/history.sql |
         """
-        lai = LogAnalysisInitiator(logFilePath, True)
+        lai = LogAnalysisInitiator(logFilePath, True, sampleFilter=SampleFilter(startOffset, endOffset, windowStart, windowEnd,
+                                                                                includeLabels, excludeLabels, labelGroups),
+                                   historyDbPath=historyDbPath)
         return lai.getReturnStructure()
 
-    def analyseJtlConvertToHtml(self, logFilePath, disableReports=None):
+    def analyseJtlConvertToParquet(self, logFilePath, fileFormat="parquet", batchSize=65536, startOffset=None, endOffset=None, windowStart=None, windowEnd=None,
+                   includeLabels=None, excludeLabels=None, labelGroups=None):
+        """
+        Parses JMeter log file. Exports samples, assertions and aggregated results into
+        Parquet or Arrow IPC files (log file path + ".samples", ".assertions" and ".aggregated"
+        with ".parquet" or ".arrow" extension). Requires optional pyarrow package.
+        Returns list of dictionaries containing summary report of parsed output.
+        Parameters:
+            - logFilePath - path to a log file
+            - fileFormat (optional) - parquet or arrow
+            - batchSize (optional) - number of samples written in one row group / record batch
+            - startOffset (optional) - seconds skipped from the beginning of the log file (ramp-up)
+            - endOffset (optional) - seconds skipped from the end of the log file (ramp-down)
+            - windowStart (optional) - samples started earlier are skipped, epoch milliseconds
+             or YYYY-MM-DD HH:MM:SS in local time
+            - windowEnd (optional) - samples started later are skipped, format as windowStart
+            - includeLabels (optional) - regular expression, samples with not matching label are skipped
+            - excludeLabels (optional) - regular expression, samples with matching label are skipped
+            - labelGroups (optional) - list or semicolon separated string of <regex>=><group> rules,
+             label matching regex is replaced by group (first matching rule wins, group may use \\1)
+        Examples:
+        | analyse jtl convert to parquet | D:/Tests/output1.jtl |
+        | analyse jtl convert to parquet | D:/Tests/output1.jtl | arrow | 100000 |
+        """
+        lai = LogAnalysisInitiator(logFilePath, sampleFilter=SampleFilter(startOffset, endOffset, windowStart, windowEnd,
+                                                                          includeLabels, excludeLabels, labelGroups))
+        lai.convertLogToParquet(fileFormat, int(batchSize))
+        return lai.getReturnStructure()
+
+    def analyseJtlConvertToHtml(self, logFilePath, disableReports=None, maxInlineSamples=None, startOffset=None, endOffset=None, windowStart=None, windowEnd=None,
+                   includeLabels=None, excludeLabels=None, labelGroups=None):
         """
         Parses JMeter log file. Converts results into HTML format.
         Returns list of dictionaries containing summary report of parsed output.
@@ -169,27 +332,636 @@ class JMeterKeywords(object):
     			 0b00000010 -> disable aggregated samples;
     			 0b00000100 -> disable response time graph;
     			 0b00001000 -> disable all samples;
+    			 0b00010000 -> disable response codes and failures;
               For example disabling aggr samples and resp time graph needs 0b00000110 which is integer 6.
+            - maxInlineSamples (optional) - maximum number of samples embedded in html file, remaining
+             samples are written into separate files (log file path + ".samples-<hash>-<N>.js") loaded on demand
+            - startOffset (optional) - seconds skipped from the beginning of the log file (ramp-up)
+            - endOffset (optional) - seconds skipped from the end of the log file (ramp-down)
+            - windowStart (optional) - samples started earlier are skipped, epoch milliseconds
+             or YYYY-MM-DD HH:MM:SS in local time
+            - windowEnd (optional) - samples started later are skipped, format as windowStart
+            - includeLabels (optional) - regular expression, samples with not matching label are skipped
+            - excludeLabels (optional) - regular expression, samples with matching label are skipped
+            - labelGroups (optional) - list or semicolon separated string of <regex>=><group> rules,
+             label matching regex is replaced by group (first matching rule wins, group may use \\1)
         Examples:
         | analyse jtl convert to html | D:/Tests/output1.jtl |
         """
-        lai = LogAnalysisInitiator(logFilePath, createHtmlReport=True, disableReports=disableReports)
+        lai = LogAnalysisInitiator(logFilePath, createHtmlReport=True, disableReports=disableReports, maxInlineSamples=maxInlineSamples,
+                                  sampleFilter=SampleFilter(startOffset, endOffset, windowStart, windowEnd,
+                                                            includeLabels, excludeLabels, labelGroups))
         return lai.getReturnStructure()
 
-    def analyseJtl(self, logFilePath):
+    def analyseJtl(self, logFilePath, startOffset=None, endOffset=None, windowStart=None, windowEnd=None,
+                   includeLabels=None, excludeLabels=None, labelGroups=None):
         """
         Parses JMeter log file.
         Returns list of dictionaries containing summary report of parsed output.
+        If logFilePath is a list or glob pattern, log files are analysed by `Analyse Jtl Files`
+        and its combined summary report is returned.
         Parameters:
-            - logFilePath - path to a log file
+            - logFilePath - path to a log file, list of paths or glob pattern
+            - startOffset (optional) - seconds skipped from the beginning of the log file (ramp-up)
+            - endOffset (optional) - seconds skipped from the end of the log file (ramp-down)
+            - windowStart (optional) - samples started earlier are skipped, epoch milliseconds
+             or YYYY-MM-DD HH:MM:SS in local time
+            - windowEnd (optional) - samples started later are skipped, format as windowStart
+            - includeLabels (optional) - regular expression, samples with not matching label are skipped
+            - excludeLabels (optional) - regular expression, samples with matching label are skipped
+            - labelGroups (optional) - list or semicolon separated string of <regex>=><group> rules,
+             label matching regex is replaced by group (first matching rule wins, group may use \\1)
         Examples:
         | analyse jtl | D:/Tests/output1.jtl |
+        | analyse jtl | D:/Tests/build42/*.jtl |
+        | analyse jtl | D:/Tests/output1.jtl | windowStart=2024-05-01 10:00:00 | windowEnd=2024-05-01 10:30:00 |
+        | analyse jtl | D:/Tests/output1.jtl | excludeLabels=^(setUp|tearDown) | labelGroups=^Search .*=>Search |
         """
-        lai = LogAnalysisInitiator(logFilePath)
+        if isinstance(logFilePath, list) or (not os.path.isfile(logFilePath) and glob.has_magic(logFilePath)):
+            return self.analyseJtlFiles(logFilePath, None, startOffset, endOffset, windowStart, windowEnd,
+                                        includeLabels, excludeLabels, labelGroups)['combined']
+        lai = LogAnalysisInitiator(logFilePath, sampleFilter=SampleFilter(startOffset, endOffset, windowStart, windowEnd,
+                                                                          includeLabels, excludeLabels, labelGroups))
         return lai.getReturnStructure()
 
+    def analyseJtlFiles(self, logFilePaths, workers=None, startOffset=None, endOffset=None, windowStart=None, windowEnd=None,
+                        includeLabels=None, excludeLabels=None, labelGroups=None):
+        """
+        Parses many JMeter log files, every log file in its own worker process.
+        Returns dictionary with keys combined (summary report of all samples of all log files,
+        samples with the same label are aggregated together) and files (dictionary with summary
+        report of every log file). Summary reports have the same format as in `Analyse Jtl`,
+        only timeTable contains response times sorted in ascending order.
+        Settings of `Set Jtl Index`, `Set Jtl Parsing`, `Set Thread Breakdown` and `Set Percentiles`
+        are used, analysis cache is not used.
+        Parameters:
+            - logFilePaths - list of paths or glob patterns of log files, or single string with
+             paths or patterns separated by semicolon
+            - workers (optional) - maximum amount of worker processes, default is amount of CPUs,
+             log files are parsed in the current process if it is 1
+            - other parameters (optional) - filter applied to every log file, see `Analyse Jtl`
+        Examples:
+        | ${result}= | analyse jtl files | D:/Tests/build42/*.jtl |
+        | ${result}= | analyse jtl files | ${logFiles} | 4 | startOffset=60 |
+        | ${total}= | get from list | ${result['combined']} | -1 |
+        | ${login}= | get from dictionary | ${result['files']} | D:/Tests/build42/login.jtl |
+        """
+        analyser = MultiLogAnalyser(logFilePaths, workers, SampleFilter(startOffset, endOffset, windowStart, windowEnd,
+                                                                       includeLabels, excludeLabels, labelGroups))
+        return analyser.analyse()
+
+    def parseJtl(self, logFilePath, startOffset=None, endOffset=None, windowStart=None, windowEnd=None,
+                   includeLabels=None, excludeLabels=None, labelGroups=None):
+        """
+        Parses JMeter log file once and returns analysis handle. Handle can be passed
+        to other keywords which convert or query results without reading log file again.
+        Parameters:
+            - logFilePath - path to a log file
+            - startOffset (optional) - seconds skipped from the beginning of the log file (ramp-up)
+            - endOffset (optional) - seconds skipped from the end of the log file (ramp-down)
+            - windowStart (optional) - samples started earlier are skipped, epoch milliseconds
+             or YYYY-MM-DD HH:MM:SS in local time
+            - windowEnd (optional) - samples started later are skipped, format as windowStart
+            - includeLabels (optional) - regular expression, samples with not matching label are skipped
+            - excludeLabels (optional) - regular expression, samples with matching label are skipped
+            - labelGroups (optional) - list or semicolon separated string of <regex>=><group> rules,
+             label matching regex is replaced by group (first matching rule wins, group may use \\1)
+        Examples:
+        | ${handle}= | parse jtl | D:/Tests/output1.jtl |
+        | ${handle}= | parse jtl | D:/Tests/output1.jtl | 120 | 60 |
+        | convert handle to html | ${handle} |
+        | convert handle to db | ${handle} |
+        | ${result}= | get handle summary | ${handle} |
+        """
+        return LogAnalysisInitiator(logFilePath, sampleFilter=SampleFilter(startOffset, endOffset, windowStart, windowEnd,
+                                                                           includeLabels, excludeLabels, labelGroups))
+
+    def convertHandleToHtml(self, handle, disableReports=None, maxInlineSamples=None):
+        """
+        Converts results of parsed log file into HTML format.
+        Returns path to created HTML file.
+        Parameters:
+            - handle - analysis handle returned by `Parse Jtl`
+            - disableReports - optional paramter for disabling particular parts of html report.
+             Meaning of bits is the same as in `Analyse Jtl Convert To Html`.
+            - maxInlineSamples (optional) - maximum number of samples embedded in html file
+        Examples:
+        | ${htmlPath}= | convert handle to html | ${handle} |
+        | ${htmlPath}= | convert handle to html | ${handle} | 8 |
+        | ${htmlPath}= | convert handle to html | ${handle} | 0 | 10000 |
+        """
+        self._validateHandle(handle)
+        return handle.convertLogToHtml(disableReports, maxInlineSamples)
+
+    def convertHandleToDb(self, handle, historyDbPath=None):
+        """
+        Converts results of parsed log file into SQLite format.
+        Returns path to created SQLite file.
+        Parameters:
+            - handle - analysis handle returned by `Parse Jtl`
+            - historyDbPath (optional) - SQLite file to which results are appended, see `Analyse Jtl Convert To Db`
+        Examples:
+        | ${dbPath}= | convert handle to db | ${handle} |
+        | ${dbPath}= | convert handle to db | ${handle} | D:/Tests/history.sql |
+        """
+        self._validateHandle(handle)
+        return handle.convertLogToSql(historyDbPath)
+
+    def convertHandleToParquet(self, handle, fileFormat="parquet", batchSize=65536):
+        """
+        Exports results of parsed log file into Parquet or Arrow IPC files.
+        Requires optional pyarrow package.
+        Returns list of paths to created samples, assertions and aggregated results files.
+        Parameters:
+            - handle - analysis handle returned by `Parse Jtl`
+            - fileFormat (optional) - parquet or arrow
+            - batchSize (optional) - number of samples written in one row group / record batch
+        Examples:
+        | ${paths}= | convert handle to parquet | ${handle} |
+        | ${paths}= | convert handle to parquet | ${handle} | arrow |
+        """
+        self._validateHandle(handle)
+        return handle.convertLogToParquet(fileFormat, int(batchSize))
+
+    def getHandleSummary(self, handle):
+        """
+        Returns list of dictionaries containing summary report of parsed log file.
+        Thread breakdown is the last item if `Set Thread Breakdown` was enabled.
+        Parameters:
+            - handle - analysis handle returned by `Parse Jtl`
+        Examples:
+        | ${result}= | get handle summary | ${handle} |
+        """
+        self._validateHandle(handle)
+        return handle.getReturnStructure()
+
+    def getHandleLabelStatistics(self, handle, label):
+        """
+        Returns dictionary containing aggregated statistics of samples with given label.
+        Label TOTAL returns statistics of all samples.
+        Keys averageConnect, connectPercentil90, sentKBytesPerSec, averageIdleTime
+        and maxActiveThreads are None when log file doesn't contain those fields.
+        Parameters:
+            - handle - analysis handle returned by `Parse Jtl`
+            - label - sample label
+        Examples:
+        | ${stats}= | get handle label statistics | ${handle} | Login page |
+        | should be true | ${stats['percentil90']} < 500 |
+        """
+        self._validateHandle(handle)
+        return handle.getLabelStatistics(label)
+
+    def getHandleThreadBreakdown(self, handle):
+        """
+        Returns dictionary with keys threadGroups and threads. Both contain list of dictionaries
+        with keys name, samples, errors, errorRate, averageTime, minTime, maxTime, median,
+        percentil90 and throughput. Thread groups contain also amount of threads, threads
+        contain name of their threadGroup. Requires `Set Thread Breakdown` before parsing.
+        Parameters:
+            - handle - analysis handle returned by `Parse Jtl`
+        Examples:
+        | set thread breakdown |
+        | ${handle}= | parse jtl | D:/Tests/output1.jtl |
+        | ${breakdown}= | get handle thread breakdown | ${handle} |
+        """
+        self._validateHandle(handle)
+        return handle.getThreadBreakdown()
+
+    def _validateHandle(self, handle):
+        if not isinstance(handle, LogAnalysisInitiator):
+            raise JMeterLibException("Incorrect analysis handle.")
+
+    def setAnalysisCache(self, maxEntries=8, maxSamples=2000000, cacheDir=None, maxDiskMegabytes=512):
+        """
+        Configures cache of parsed and aggregated results. Repeated analysis of unchanged
+        log file (same path, modification time and size) is then served from the cache.
+        Cache is disabled by default, cached samples stay in memory until they are evicted
+        or `Clear Analysis Cache` is called.
+        Returns None.
+        Parameters:
+            - maxEntries (optional) - maximum number of log files kept in memory, 0 disables in-memory cache
+            - maxSamples (optional) - maximum number of samples kept in memory for all cached log files
+            - cacheDir (optional) - directory for on-disk cache, on-disk cache is disabled if not given.
+             Cache files are read with pickle module, so the directory has to be trusted and not
+             writable by other users (loading a crafted cache file can execute arbitrary code)
+            - maxDiskMegabytes (optional) - maximum size of on-disk cache in megabytes
+        Examples:
+        | set analysis cache | 4 |
+        | set analysis cache | 8 | 2000000 | D:/Tests/jtlCache | 1024 |
+        """
+        analysisCache.configure(int(maxEntries), int(maxSamples), cacheDir, int(maxDiskMegabytes))
+
+    def clearAnalysisCache(self):
+        """
+        Removes all entries from in-memory and on-disk cache of analysed log files and from
+        cache of html report parts.
+        Returns None.
+        Examples:
+        | clear analysis cache |
+        """
+        analysisCache.clear()
+        htmlFragmentCache.clear()
+
+    def setHtmlReportCache(self, maxMegabytes=64, externalAssets=False):
+        """
+        Configures cache of html report parts. The cache is disabled until this keyword is called.
+        Parts which depend on samples (response codes and failures, samples data, response time graph
+        of every label) are cached in memory, so html report regenerated for unchanged samples or
+        labels reuses them instead of rendering them again. Parts are identified by log file, time
+        window and response times of labels, so reports of different label filters share graphs
+        of labels which they both contain.
+        CSS styles and JavaScript code may be written into shared files (jmeterlib-<hash>.css and
+        jmeterlib-<hash>.js in html report directory) instead of being embedded in every html report.
+        Returns None.
+        Parameters:
+            - maxMegabytes (optional) - maximum size of cached html parts in megabytes, 0 disables the cache.
+             Default is 64.
+            - externalAssets (optional) - True to write CSS and JavaScript into shared files,
+             html report is then not a single self-contained file. Default is False.
+        Examples:
+        | set html report cache | 128 |
+        | set html report cache | 64 | True |
+        """
+        externalAssets = toBoolean(externalAssets)
+        htmlFragmentCache.configure(int(maxMegabytes), externalAssets)
+
+    def checkJtlThresholds(self, logFilePath, thresholds, failFast=False):
+        """
+        Evaluates thresholds (SLA) against aggregated results of a log file.
+        Returns dictionary with keys: passed (True/False), aborted (True if aggregation was stopped
+        by failFast), failedEarly (threshold which stopped aggregation) and results (list of
+        dictionaries with keys threshold, label, metric, operator, limit, value and passed).
+        Parameters:
+            - logFilePath - path to a log file or analysis handle returned by `Parse Jtl`
+            - thresholds - list of thresholds or single string with thresholds separated by semicolon.
+             Threshold format is: <label> <metric> <operator> <value>. Label * means every label
+             except TOTAL. Operators: <, <=, >, >=, ==. Metrics: samples, average, min, max, median,
+             percentil90, stddev, errorRate, errorRateInclAssert (percents), errors, errorsInclAssert
+             (amount of failed samples), throughput (per second), kbPerSec and pNN (any percentile,
+             e.g. p95 or p99.9, calculated in mode selected by `Set Percentiles`, legacy and jmeter
+             modes as in JMeter Aggregate Report).
+            - failFast (optional) - stop aggregation as soon as failure of threshold on samples, min,
+             max, errors or errorsInclAssert is certain. Not used for analysis handles.
+        Examples:
+        | ${report}= | check jtl thresholds | D:/Tests/output1.jtl | TOTAL p95 < 250; * errorRate < 0.5; TOTAL throughput > 200 |
+        | ${report}= | check jtl thresholds | ${handle} | ${thresholdList} |
+        | should be true | ${report['passed']} |
+        """
+        slaEvaluator = SlaEvaluator(thresholds)
+        if isinstance(logFilePath, LogAnalysisInitiator):
+            return logFilePath.checkThresholds(slaEvaluator)
+        if not toBoolean(failFast):
+            lai = LogAnalysisInitiator(logFilePath)
+        else:
+            lai = LogAnalysisInitiator(logFilePath, slaEvaluator=slaEvaluator)
+        return lai.checkThresholds(slaEvaluator)
+
+    def jtlShouldMeetThresholds(self, logFilePath, thresholds, failFast=False):
+        """
+        Fails if any threshold (SLA) is not met. Parameters are the same as in `Check Jtl Thresholds`.
+        Returns report returned by `Check Jtl Thresholds`.
+        Examples:
+        | jtl should meet thresholds | D:/Tests/output1.jtl | TOTAL p95 < 250; * errorRate < 0.5 |
+        | jtl should meet thresholds | D:/Tests/output1.jtl | TOTAL max < 2000; TOTAL errors < 10 | True |
+        """
+        report = self.checkJtlThresholds(logFilePath, thresholds, failFast)
+        if not report['passed']:
+            failures = []
+            if report['aborted']:
+                failures.append("aggregation stopped by threshold " + str(report['failedEarly']))
+            for r in report['results']:
+                if not r['passed']:
+                    failures.append("%s: %s is %s" % (r['label'], r['threshold'], r['value']))
+            raise AssertionError("Thresholds not met:\n" + "\n".join(failures))
+        return report
+
+    def compareJtlRuns(self, baseline, current, dbPath=None, alpha=0.05, minDegradation=5):
+        """
+        Compares two test runs per label. Response times are compared with latency histograms
+        (exact up to 1 s, 0.5% resolution above) and Mann-Whitney U test. Samples of log files
+        are added to histograms while log files are read, so full sample sets of both runs are
+        not kept in memory.
+        Returns dictionary with keys: regression (True if any label regressed), unmatchedLabels
+        (labels present only in one run) and labels (list of dictionaries with keys label,
+        baselineSamples, currentSamples, baselineP50, currentP50, deltaP50 (percents) and the same
+        for P90, P95, P99 and Throughput, pValue, regression and improvement).
+        Label is marked as regression if difference of response times is statistically significant
+        (pValue < alpha) and median or 90th percentile got worse by at least minDegradation percents,
+        or if throughput dropped by at least minDegradation percents. Testruns stored in SQLite
+        with sample retention policy other than "all" (see `Set Sample Retention`) can't be compared.
+        Parameters:
+            - baseline - path to a log file, analysis handle returned by `Parse Jtl`, path to SQLite
+             file created by `Analyse Jtl Convert To Db` (the latest Testrun in it is used) or
+             Testrun id if dbPath is given
+            - current - the same as baseline
+            - dbPath (optional) - SQLite file containing both Testrun ids
+            - alpha (optional) - significance level of Mann-Whitney U test
+            - minDegradation (optional) - minimal change in percents reported as regression
+        Examples:
+        | ${report}= | compare jtl runs | D:/Tests/nightly1.jtl | D:/Tests/nightly2.jtl |
+        | ${report}= | compare jtl runs | ${baselineHandle} | ${currentHandle} |
+        | ${report}= | compare jtl runs | 1 | 2 | D:/Tests/history.sql |
+        | should not be true | ${report['regression']} |
+        """
+        comparator = RunComparator(float(alpha), float(minDegradation))
+        baselineStatistics = comparator.getRunStatistics(baseline, dbPath)
+        currentStatistics = comparator.getRunStatistics(current, dbPath)
+        return comparator.compare(baselineStatistics, currentStatistics)
+
+    def jtlRunShouldNotRegress(self, baseline, current, dbPath=None, alpha=0.05, minDegradation=5):
+        """
+        Fails if any label regressed. Parameters are the same as in `Compare Jtl Runs`.
+        Returns report returned by `Compare Jtl Runs`.
+        Examples:
+        | jtl run should not regress | D:/Tests/nightly1.jtl | D:/Tests/nightly2.jtl |
+        """
+        report = self.compareJtlRuns(baseline, current, dbPath, alpha, minDegradation)
+        if report['regression']:
+            failures = []
+            for r in report['labels']:
+                if r['regression']:
+                    failures.append("%s: median %s%%, 90%% line %s%%, throughput %s%%, p-value %s"
+                                    % (r['label'], r['deltaP50'], r['deltaP90'], r['deltaThroughput'], r['pValue']))
+            raise AssertionError("Performance regression:\n" + "\n".join(failures))
+        return report
+
+    def createJtlTrendDashboard(self, historyDbPaths, htmlPath=None, labels=None, lastRuns=None):
+        """
+        Creates html dashboard showing trends of median, 90% line, throughput and error rate of
+        every label across test runs stored in SQLite files. Dashboard reads LabelTrend table,
+        one row per label of every run, which is filled when results are converted into SQLite
+        format (runs stored by older versions are read from Aggregated table). SQLite files are
+        not modified.
+        Returns path to created html file, existing file is overwritten.
+        Parameters:
+            - historyDbPaths - SQLite file with many test runs (see historyDbPath of
+             `Analyse Jtl Convert To Db`), list of SQLite files or glob pattern (e.g. D:/Tests/*.sql)
+            - htmlPath (optional) - path to html file, default is path of the first SQLite file + ".trend.html"
+            - labels (optional) - regular expression, only matching labels are shown
+            - lastRuns (optional) - only given number of the latest test runs is shown
+        Examples:
+        | ${dashboard}= | create jtl trend dashboard | D:/Tests/history.sql |
+        | ${dashboard}= | create jtl trend dashboard | D:/Tests/*.sql | D:/Tests/trend.html | Login|TOTAL | 50 |
+        """
+        return TrendDashboard(historyDbPaths, labels, lastRuns).createHtml(htmlPath)
+
+    def analyseJtlFailures(self, logFilePath, topN=10, capacity=100):
+        """
+        Counts response codes and most frequent failure messages per label. Failure messages are
+        response messages of failed samples and failure messages of failed assertions. They are
+        counted with Space-Saving algorithm, so memory is bounded by capacity even if messages
+        contain unique values; count of a message may be overestimated by at most maxOverestimate.
+        Samples of a log file are counted while it is parsed, they are not kept in memory.
+        Returns list of dictionaries (one per label, TOTAL is the last one) with keys label,
+        samples, failures, responseCodes (list of dictionaries with keys responseCode, count and
+        percent), topFailureMessages (keys responseCode, message, count, maxOverestimate) and
+        topAssertionFailures (keys assertion, message, count, maxOverestimate).
+        Parameters:
+            - logFilePath - path to a log file or analysis handle returned by `Parse Jtl`
+            - topN (optional) - amount of reported failure messages per label
+            - capacity (optional) - amount of distinct messages tracked per label
+        Examples:
+        | ${failures}= | analyse jtl failures | D:/Tests/output1.jtl |
+        | ${failures}= | analyse jtl failures | ${handle} | 5 |
+        """
+        failureAnalyser = FailureAnalyser(int(topN), int(capacity))
+        if isinstance(logFilePath, LogAnalysisInitiator):
+            return failureAnalyser.analyse(logFilePath.samples)
+        #samples are counted while log file is parsed, so they are not kept in memory
+        analyser = LogAnalysisInitiator.createAnalyserObject(logFilePath)
+        analyser.sampleConsumer = failureAnalyser.addSample
+        analyser.getSamples()
+        return failureAnalyser.getResults()
+
+    def analyseJtlScalability(self, logFilePath, threadsColumn="allThreads", minSamples=1):
+        """
+        Groups samples by amount of active threads and calculates throughput and response
+        times for every concurrency level. Universal Scalability Law
+        X(N) = lambda*N / (1 + sigma*(N-1) + kappa*N*(N-1)) is fitted to throughput of levels
+        (at least 3 levels are needed), so saturation point of tested system can be read from
+        step load test.
+        Returns dictionary with keys: threadsColumn, levels (list of dictionaries with keys
+        threads, samples, seconds, throughput (per second of the level), errorRate, average, p50,
+        p90, p95, p99) and usl (dictionary with keys lambda (throughput of one thread), sigma
+        (contention), kappa (coherency), peakThreads, peakThroughput and rSquared, or None).
+        peakThreads is None when throughput doesn't degrade (kappa is 0).
+        Parameters:
+            - logFilePath - path to a log file or analysis handle returned by `Parse Jtl`.
+             Log file has to contain grpThreads/allThreads (ng/na in xml) fields
+            - threadsColumn (optional) - allThreads (all thread groups) or grpThreads
+            - minSamples (optional) - levels with less samples are ignored
+        Examples:
+        | ${scalability}= | analyse jtl scalability | D:/Tests/stepLoad.jtl |
+        | ${scalability}= | analyse jtl scalability | ${handle} | grpThreads | 100 |
+        | should be true | ${scalability['usl']['peakThreads']} > 50 |
+        """
+        if not isinstance(logFilePath, LogAnalysisInitiator):
+            logFilePath = LogAnalysisInitiator(logFilePath)
+        return ScalabilityAnalyser(threadsColumn, int(minSamples)).analyse(logFilePath.samples)
+
+    def getAnalysisProfile(self, handle=None):
+        """
+        Returns list of dictionaries describing stages of log file analysis (cache lookup,
+        parse, aggregate, percentiles, index write, sql, html, parquet/arrow).
+        Every dictionary contains keys: stage, wallTime, cpuTime (seconds), rows, bytesRead,
+        processPeakRssMb (peak resident memory of the whole Python process since its start,
+        so it includes earlier stages, analyses and other libraries) and peakRssDeltaMb (growth
+        of processPeakRssMb during the stage, 0 when the stage stayed below an earlier peak).
+        Both are None if resource module is not available (Windows).
+        Parameters:
+            - handle (optional) - analysis handle returned by `Parse Jtl`, profile of the last
+             analysed log file is returned if not given
+        Examples:
+        | analyse jtl convert | D:/Tests/output1.jtl |
+        | ${profile}= | get analysis profile |
+        | ${profile}= | get analysis profile | ${handle} |
+        """
+        if handle == None or handle == "":
+            if LogAnalysisInitiator.lastProfile == None:
+                raise JMeterLibException("No log file was analysed yet.")
+            return LogAnalysisInitiator.lastProfile.convertToList()
+        self._validateHandle(handle)
+        return handle.profile.convertToList()
+
+    def setAnalysisProfiling(self, cProfileDumpPath=None, tracemallocDumpPath=None):
+        """
+        Enables dumps for deep analysis of performance. Settings apply to log files analysed
+        afterwards. Calling keyword without parameters disables dumps. Files are written once at
+        the end of analysis (or of conversion of analysis handle) and contain all its stages.
+        Returns None.
+        Parameters:
+            - cProfileDumpPath (optional) - path to cProfile statistics file (readable with pstats module)
+            - tracemallocDumpPath (optional) - path to tracemalloc snapshot file, it also adds
+             tracedPeakMemoryMb to every stage of analysis profile (requires Python 3). Memory
+             allocations are traced only during analysis, because tracing slows Python down
+        Examples:
+        | set analysis profiling | D:/Tests/analysis.pstats |
+        | set analysis profiling | ${None} | D:/Tests/analysis.tracemalloc |
+        | set analysis profiling |
+        """
+        AnalysisProfile.cProfileDumpPath = cProfileDumpPath or None
+        AnalysisProfile.tracemallocDumpPath = tracemallocDumpPath or None
+        if AnalysisProfile.tracemallocDumpPath != None and tracemalloc == None:
+            print("WARNING, tracemalloc is not available in this Python version")
+
+    def setJtlIndex(self, enabled=True):
+        """
+        Enables or disables binary index file (log file path + ".idx") created during first
+        analysis of csv log file. Index stores samples in typed columns, so next analysis of
+        unchanged log file memory-maps it instead of parsing csv text (samples are still created
+        from the columns for aggregation and reports). Index is disabled by default, when it is
+        enabled, index file is written next to every analysed log file, so the directory of log
+        files has to be writable. The setting is global: it applies to all library instances of the Python process until it is changed or `Reset Jtl Settings` is called.
+        Returns None.
+        Parameters:
+            - enabled - True or False
+        Examples:
+        | set jtl index |
+        | set jtl index | False |
+        """
+        JtlIndex.enabled = toBoolean(enabled)
+
+    def setJtlParsing(self, mode="lenient", quarantine=True):
+        """
+        Selects handling of malformed rows of csv log files and samples of xml log files (unknown
+        layout, wrong amount of columns, missing attributes, incorrect numbers) and of damaged
+        end of log files (e.g. log file of killed JMeter process). In lenient mode malformed rows
+        are skipped, their amount is returned as malformedRows of summary and they are written
+        with line number and reason to quarantine file (log file path + ".quarantine"). Samples
+        before damaged part of log file are analysed. Binary index is not created for log files
+        with malformed rows. Settings are global: it applies to all library instances of the Python process until it is changed or `Reset Jtl Settings` is called.
+        Returns None.
+        Parameters:
+            - mode (optional) - lenient (default) or strict (analysis fails on the first malformed row)
+            - quarantine (optional) - True (default) or False, write quarantine file in lenient mode
+        Examples:
+        | set jtl parsing | strict |
+        | set jtl parsing | lenient | False |
+        """
+        mode = str(mode).lower()
+        if mode not in JtlQuarantine.modes:
+            raise JMeterLibException("Unknown parsing mode %s, use one of %s" % (mode, ", ".join(JtlQuarantine.modes)))
+        JtlQuarantine.mode = mode
+        JtlQuarantine.enabled = toBoolean(quarantine)
+
+    def setThreadBreakdown(self, enabled=True):
+        """
+        Enables or disables aggregation of samples per thread group and per thread. Thread group
+        name is thread name without thread number (e.g. "Thread Group 1" for "Thread Group 1-5").
+        Breakdown is calculated during aggregation of log files analysed afterwards and it is
+        added as the last item of returned summary, as ThreadBreakdown table of SQLite file and
+        as "Thread groups" part of html report. It is disabled by default. The setting is
+        global: it applies to all library instances of the Python process until it is changed or `Reset Jtl Settings` is called.
+        Returns None.
+        Parameters:
+            - enabled - True or False
+        Examples:
+        | set thread breakdown |
+        | ${result}= | analyse jtl convert | D:/Tests/output1.jtl |
+        | ${breakdown}= | get from list | ${result} | -1 |
+        """
+        ThreadBreakdown.enabled = toBoolean(enabled)
+
+    def setSampleRetention(self, policy="all", size=10000):
+        """
+        Selects which raw samples are written into SQLite files (Sample and Assert tables) and
+        html reports (aggregated samples and all samples parts) created afterwards. Aggregated
+        results, SampleRollup table, response time graphs and failures are always calculated
+        from all samples, so size of outputs of long tests is limited without losing statistics.
+        The policy is global: it applies to all library instances of the Python process until it is changed or `Reset Jtl Settings` is called.
+        Returns None.
+        Parameters:
+            - policy (optional) - one of:
+             all - every sample is written (default);
+             aggregates - no raw sample is written;
+             failures - every failed sample (including failed assertions) and a random sample of
+             size successful samples (the same samples are chosen for the same log file);
+             nth - every size-th sample is written
+            - size (optional) - amount of successful samples for failures policy or step of nth policy
+        Examples:
+        | set sample retention | failures | 5000 |
+        | set sample retention | nth | 100 |
+        | set sample retention | all |
+        """
+        policy = str(policy).lower()
+        if policy not in SampleRetention.policies:
+            raise JMeterLibException("Unknown sample retention policy %s, use one of %s" % (policy, ", ".join(SampleRetention.policies)))
+        size = int(size)
+        if size < 0 or (policy == "nth" and size < 1):
+            raise JMeterLibException("Incorrect sample retention size %s" % size)
+        SampleRetention.policy = policy
+        SampleRetention.size = size
+
+    def setPercentiles(self, percents="50,75,90,95,99,99.9", mode="legacy"):
+        """
+        Selects percentiles of response time calculated for every sample label and TOTAL of log
+        files analysed afterwards. Percentiles are exact, they are selected from counts of
+        millisecond values, so no list of response times is sorted. They are added to returned
+        summary as "percentiles" dictionary (e.g. p99.9). Mode is used also for median, 90% line
+        and pNN metrics of `Check Jtl Thresholds`. Settings are global: it applies to all library instances of the Python process until it is changed or `Reset Jtl Settings` is called.
+        Use `Get Jtl Percentiles` for percentiles of a single call.
+        Returns None.
+        Parameters:
+            - percents (optional) - comma separated list of percents, default is 50,75,90,95,99,99.9
+            - mode (optional) - one of:
+             legacy - median is average of two middle values and 90% line is calculated in the
+             same way as in previous versions of library, other percentiles as in jmeter mode (default);
+             jmeter - the same numbers as JMeter Aggregate Report (the smallest value greater than
+             or equal to given percent of values);
+             dashboard - the same numbers as JMeter HTML dashboard (values interpolated between
+             two nearest samples from the last 20000 samples of label, rounded to 2 decimals)
+        Examples:
+        | set percentiles | 50,90,95,99 |
+        | set percentiles | 90,99,99.9 | jmeter |
+        """
+        ExactPercentiles.percents = ExactPercentiles.parsePercents(percents)
+        ExactPercentiles.mode = ExactPercentiles.parseMode(mode)
+
+    def getJtlPercentiles(self, logFilePath, percents="50,90,95,99", mode=None, label=None):
+        """
+        Returns percentiles of response time requested for this call only. Result is dictionary
+        with sample labels (including TOTAL) as keys and dictionaries of percentiles (e.g. p95, p99)
+        as values, or only dictionary of percentiles when label is given.
+        Parameters:
+            - logFilePath - path to a log file or analysis handle returned by `Parse Jtl`
+            - percents (optional) - comma separated list of percents, default is 50,90,95,99
+            - mode (optional) - legacy, jmeter or dashboard (see `Set Percentiles`), default is
+             mode selected by `Set Percentiles`
+            - label (optional) - sample label
+        Examples:
+        | ${percentiles}= | get jtl percentiles | D:/Tests/output1.jtl | 95,99 | jmeter |
+        | should be true | ${percentiles['Login page']['p95']} < 500 |
+        | ${total}= | get jtl percentiles | ${handle} | 99.9 | dashboard | TOTAL |
+        """
+        percents = ExactPercentiles.parsePercents(percents)
+        mode = ExactPercentiles.mode if mode in [None, ""] else ExactPercentiles.parseMode(mode)
+        if isinstance(logFilePath, LogAnalysisInitiator):
+            return logFilePath.getPercentiles(percents, mode, label)
+        return LogAnalysisInitiator(logFilePath).getPercentiles(percents, mode, label)
+
+    def resetJtlSettings(self):
+        """
+        Restores default values of all settings of log file analysis: `Set Percentiles`,
+        `Set Jtl Index`, `Set Jtl Parsing`, `Set Thread Breakdown`, `Set Sample Retention`,
+        `Set Analysis Profiling`, `Set Analysis Cache` and `Set Html Report Cache`. These settings
+        are global for the Python process (library scope is GLOBAL), so suites which change them
+        may restore defaults in their teardown. Cached results are cleared as well.
+        Returns None.
+        Examples:
+        | [Teardown] | reset jtl settings |
+        """
+        self.setPercentiles()
+        self.setJtlIndex(False)
+        self.setJtlParsing()
+        self.setThreadBreakdown(False)
+        self.setSampleRetention()
+        self.setAnalysisProfiling()
+        self.setAnalysisCache(0)
+        self.setHtmlReportCache(0)
+        self.clearAnalysisCache()
+
 class JMeterRunner(object):
-    def __init__(self, jmeterPath, testPlanPath, logFilePath, otherParams):
+    def __init__(self, jmeterPath, testPlanPath, logFilePath, otherParams, start=True):
         self.jmeter = jmeterPath
         self.jmx = testPlanPath
         self.log = logFilePath
@@ -197,7 +969,8 @@ class JMeterRunner(object):
         self.validateInput()
         self.listOtherParams()
         print(self)
-        jmeterOutput = self.runAndPrintResult()
+        if start:
+            jmeterOutput = self.runAndPrintResult()
 
     def __str__(self):
         runnerPrint = "Starting JMeter with following parameters:\n"
@@ -217,16 +990,23 @@ class JMeterRunner(object):
     def listOtherParams(self):
         self.params = []
         if not self.paramsStr == "":
-            self.params = string.split(self.paramsStr)
+            self.params = self.paramsStr.split()
 
-    def runAndPrintResult(self):
-        import subprocess
+    def getRunList(self):
         runList = [self.jmeter, "-n", "-t", self.jmx, "-l", self.log]
         if len(self.params) > 0:
             for p in self.params:
                 runList.append(p)
+        return runList
+
+    def runAndPrintResult(self):
+        import subprocess
+        runList = self.getRunList()
         print("subprocess.call input list: " + str(runList))
         retValue = subprocess.call(runList)
+        self.checkReturnValue(retValue)
+
+    def checkReturnValue(self, retValue):
         msg = "Value returned by JMeter:"
         if retValue == 0:
             print("%s %s" % (msg, retValue))
@@ -235,30 +1015,288 @@ class JMeterRunner(object):
 
 class JMeterLibException(Exception):
     def __init__(self, msg):
+        super(JMeterLibException, self).__init__(msg)
         self.msg = msg
 
     def __str__(self):
          return repr(self.msg)
 
+def toBoolean(value):
+    #keyword arguments are often strings given in Robot Framework test data
+    return str(value).lower() not in ["false", "no", "off", "0", "none", ""]
+
+def getTemporaryPath(path):
+    return "%s.%s.%s.tmp" % (path, os.getpid(), threading.current_thread().ident)
+
+def replaceFile(sourcePath, targetPath):
+    if hasattr(os, 'replace'):
+        os.replace(sourcePath, targetPath)
+    else:
+        if os.name == 'nt' and os.path.exists(targetPath):
+            os.remove(targetPath)
+        os.rename(sourcePath, targetPath)
+
+class AnalysisCache(object):
+    formatVersion = 5
+
+    def __init__(self, maxEntries=0, maxSamples=2000000, cacheDir=None, maxDiskMegabytes=512):
+        self.entries = collections.OrderedDict()
+        self.lock = threading.RLock()
+        self.configure(maxEntries, maxSamples, cacheDir, maxDiskMegabytes)
+
+    def configure(self, maxEntries, maxSamples, cacheDir=None, maxDiskMegabytes=512):
+        self.maxEntries = maxEntries
+        self.maxSamples = maxSamples
+        self.cacheDir = cacheDir
+        self.maxDiskBytes = maxDiskMegabytes * 1024 * 1024
+        if self.cacheDir != None and not os.path.isdir(self.cacheDir):
+            try:
+                os.makedirs(self.cacheDir)
+            except OSError:
+                print("ERROR, cache directory " + str(self.cacheDir) + " couldn't be created")
+                self.cacheDir = None
+        self.evictFromMemory()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+        for f in self.listDiskFiles():
+            try:
+                os.remove(f)
+            except OSError:
+                pass
+
+    def makeKey(self, filePath, variant=None):
+        try:
+            fileStat = os.stat(filePath)
+        except OSError:
+            return None
+        return (os.path.abspath(filePath), fileStat.st_mtime, fileStat.st_size, self.formatVersion,
+                ThreadBreakdown.enabled, ExactPercentiles.getCacheKey(), JtlQuarantine.getCacheKey(), variant)
+
+    def get(self, filePath, variant=None):
+        key = self.makeKey(filePath, variant)
+        if key == None:
+            return None
+        with self.lock:
+            result = self.entries.pop(key, None)
+            if result != None:
+                self.entries[key] = result
+        if result != None:
+            print("Analysis results of " + filePath + " taken from in-memory cache")
+            return result
+        result = self.readFromDisk(key)
+        if result != None:
+            print("Analysis results of " + filePath + " taken from on-disk cache")
+            self.putInMemory(key, result)
+        return result
+
+    def put(self, filePath, result, variant=None):
+        key = self.makeKey(filePath, variant)
+        if key == None or result[2] == None:
+            return
+        self.putInMemory(key, result)
+        self.writeToDisk(key, result)
+
+    def putInMemory(self, key, result):
+        if self.maxEntries <= 0 or len(result[2]) > self.maxSamples:
+            return
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = result
+            self.evictFromMemory()
+
+    def evictFromMemory(self):
+        with self.lock:
+            cachedSamples = 0
+            for result in self.entries.values():
+                cachedSamples += len(result[2])
+            while len(self.entries) > 0 and (len(self.entries) > self.maxEntries or cachedSamples > self.maxSamples):
+                oldestKey, oldestResult = self.entries.popitem(last=False)
+                cachedSamples -= len(oldestResult[2])
+
+    def getDiskPath(self, key):
+        return os.path.join(self.cacheDir, hashlib.sha1(repr((key[0], key[-1])).encode("utf-8")).hexdigest() + ".cache")
+
+    def listDiskFiles(self):
+        if self.cacheDir == None:
+            return []
+        return [os.path.join(self.cacheDir, f) for f in os.listdir(self.cacheDir) if f.endswith(".cache")]
+
+    def readFromDisk(self, key):
+        if self.cacheDir == None:
+            return None
+        diskPath = self.getDiskPath(key)
+        if not os.path.isfile(diskPath):
+            return None
+        try:
+            with open(diskPath, "rb") as cacheFile:
+                cachedKey, result = pickle.load(cacheFile)
+        except Exception:
+            print("ERROR, problems while reading " + diskPath)
+            return None
+        if cachedKey != key:
+            return None
+        os.utime(diskPath, None)
+        return result
+
+    def writeToDisk(self, key, result):
+        if self.cacheDir == None:
+            return
+        diskPath = self.getDiskPath(key)
+        temporaryPath = getTemporaryPath(diskPath)
+        try:
+            with open(temporaryPath, "wb") as cacheFile:
+                pickle.dump((key, result), cacheFile, pickle.HIGHEST_PROTOCOL)
+            replaceFile(temporaryPath, diskPath)
+        except (IOError, OSError, pickle.PicklingError):
+            print("ERROR, problems while writing " + diskPath)
+            return
+        self.evictFromDisk()
+
+    def evictFromDisk(self):
+        diskFiles = []
+        diskBytes = 0
+        for f in self.listDiskFiles():
+            fileStat = os.stat(f)
+            diskFiles.append((fileStat.st_mtime, fileStat.st_size, f))
+            diskBytes += fileStat.st_size
+        diskFiles.sort()
+        while len(diskFiles) > 0 and diskBytes > self.maxDiskBytes:
+            mtime, size, f = diskFiles.pop(0)
+            os.remove(f)
+            diskBytes -= size
+
+analysisCache = AnalysisCache()
+
+class AnalysisProfile(object):
+    cProfileDumpPath = None
+    tracemallocDumpPath = None
+
+    def __init__(self):
+        self.stages = []
+        self.currentStage = None
+        self.profiler = None
+        self.depth = 0
+        self.startedTracing = False
+
+    def startAnalysis(self):
+        #dumps are written once per analysis (or per conversion of analysis handle), nested
+        #conversions done during analysis are part of it
+        self.depth += 1
+        if self.depth > 1:
+            return
+        if self.cProfileDumpPath != None and cProfile != None:
+            self.profiler = cProfile.Profile()
+        if self.tracemallocDumpPath != None and tracemalloc != None and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.startedTracing = True
+
+    def endAnalysis(self):
+        self.depth -= 1
+        if self.depth > 0:
+            return
+        if self.profiler != None:
+            self.profiler.dump_stats(self.cProfileDumpPath)
+            self.profiler = None
+        if self.tracemallocDumpPath != None and tracemalloc != None and tracemalloc.is_tracing():
+            tracemalloc.take_snapshot().dump(self.tracemallocDumpPath)
+        if self.startedTracing:
+            #tracing slows down the whole process, so it isn't left running after analysis
+            tracemalloc.stop()
+            self.startedTracing = False
+
+    def startStage(self, name):
+        if self.tracemallocDumpPath != None and tracemalloc != None and hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        cpuTimes = os.times()
+        self.currentStage = {'stage': name, 'wallTime': time.time(), 'cpuTime': cpuTimes[0] + cpuTimes[1],
+                             'processPeakRssMb': self.getPeakRssMb()}
+        if self.profiler != None:
+            self.profiler.enable()
+
+    def endStage(self, rows=0, bytesRead=0):
+        if self.profiler != None:
+            self.profiler.disable()
+        cpuTimes = os.times()
+        stage = self.currentStage
+        stage['wallTime'] = round(time.time() - stage['wallTime'], 4)
+        stage['cpuTime'] = round(cpuTimes[0] + cpuTimes[1] - stage['cpuTime'], 4)
+        stage['rows'] = rows
+        stage['bytesRead'] = bytesRead
+        #peak RSS is a maximum of the whole process, growth of the peak is the part caused by the stage
+        startPeakRss = stage['processPeakRssMb']
+        stage['processPeakRssMb'] = self.getPeakRssMb()
+        stage['peakRssDeltaMb'] = None if startPeakRss == None else round(stage['processPeakRssMb'] - startPeakRss, 2)
+        if self.tracemallocDumpPath != None and tracemalloc != None and tracemalloc.is_tracing():
+            stage['tracedPeakMemoryMb'] = round(tracemalloc.get_traced_memory()[1] / (1024.0 * 1024.0), 2)
+        self.stages.append(stage)
+        self.currentStage = None
+
+    def getPeakRssMb(self):
+        if resource == None:
+            return None
+        peakRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            return round(peakRss / (1024.0 * 1024.0), 2)
+        return round(peakRss / 1024.0, 2)
+
+    def convertToList(self):
+        return [dict(stage) for stage in self.stages]
+
 class LogAnalysisInitiator(object):
-    def __init__(self, filePath, createSqlReport=False, createHtmlReport=False, disableReports=None):
+    lastProfile = None
+
+    def __init__(self, filePath, createSqlReport=False, createHtmlReport=False, disableReports=None, maxInlineSamples=None, slaEvaluator=None, sampleFilter=None,
+                 historyDbPath=None):
         debugNeeded = False
         self.jtlPath = filePath
         self.timeStamp = str(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        self.analyserObject = self.initiateNewAnalyserObject()
-        self.aggrSummary, self.aggrSamples, self.samples = self.analyserObject.analyzeLog()
-        if debugNeeded:
-            print("aggrSummary")
-            print(self.aggrSummary)
-            print("aggrSamples")
-            print(self.aggrSamples)
-            print("samples")
-            print(self.samples)
-        if createHtmlReport:
-            self.convertLogToHtml(disableReports)
-        if createSqlReport:
-            self.convertLogToSql()
+        self.profile = AnalysisProfile()
+        LogAnalysisInitiator.lastProfile = self.profile
+        self.profile.startAnalysis()
+        try:
+            self.profile.startStage("cache lookup")
+            if sampleFilter != None and not sampleFilter.isActive():
+                sampleFilter = None
+            self.sampleFilter = sampleFilter
+            cacheVariant = None if sampleFilter == None else sampleFilter.getCacheKey()
+            cachedResult = analysisCache.get(self.jtlPath, cacheVariant)
+            self.profile.endStage(0 if cachedResult == None else len(cachedResult[2]))
+            if cachedResult == None:
+                self.analyserObject = self.initiateNewAnalyserObject()
+                self.analyserObject.profile = self.profile
+                self.analyserObject.slaEvaluator = slaEvaluator
+                self.analyserObject.sampleFilter = sampleFilter
+                self.aggrSummary, self.aggrSamples, self.samples = self.analyserObject.analyzeLog()
+                self.threadBreakdown = self.analyserObject.threadBreakdown
+                self.aborted = self.analyserObject.aborted
+                if (JtlIndex.enabled and sampleFilter == None and not isinstance(self.analyserObject, IndexLogAnalyser)
+                        and self.analyserObject.malformedRows == 0):
+                    self.profile.startStage("index write")
+                    JtlIndex(self.jtlPath).write(self.samples)
+                    self.profile.endStage(len(self.samples))
+                if not self.aborted:
+                    analysisCache.put(self.jtlPath, (self.aggrSummary, self.aggrSamples, self.samples, self.threadBreakdown), cacheVariant)
+            else:
+                self.aborted = False
+                self.analyserObject = None
+                self.aggrSummary, self.aggrSamples, self.samples, self.threadBreakdown = cachedResult
+            if debugNeeded:
+                print("aggrSummary")
+                print(self.aggrSummary)
+                print("aggrSamples")
+                print(self.aggrSamples)
+                print("samples")
+                print(self.samples)
+            if createHtmlReport:
+                self.convertLogToHtml(disableReports, maxInlineSamples)
+            if createSqlReport:
+                self.convertLogToSql(historyDbPath)
+        finally:
+            self.profile.endAnalysis()
 
+    @classmethod
     def recognizeFormat(self, fileLines):
         logFileFormat = ""
         logLength = len(fileLines)
@@ -275,64 +1313,381 @@ class LogAnalysisInitiator(object):
         return logFileFormat
 
     def initiateNewAnalyserObject(self):
+        return self.createAnalyserObject(self.jtlPath)
+
+    @classmethod
+    def createAnalyserObject(self, jtlPath):
         newObject = None
         newFileLines = []
-        print("Opening log file " + self.jtlPath)
+        print("Opening log file " + jtlPath)
         try:
-            logFileHandler = open(self.jtlPath, 'r')
-            newFileLines = logFileHandler.readlines()
+            logFileHandler = open(jtlPath, 'r')
+            newFileLines = [l for l in [logFileHandler.readline(), logFileHandler.readline()] if l != ""]
             logFileHandler.close()
         except IOError:
-            raise JMeterLibException("File %s couldn't be opened" % self.jtlPath)
+            raise JMeterLibException("File %s couldn't be opened" % jtlPath)
         else:
-            if self.recognizeFormat(newFileLines) == "csv":
-                newObject = CsvLogAnalyser(self.jtlPath)
+            if JtlIndex.enabled and JtlIndex(jtlPath).isValid():
+                newObject = IndexLogAnalyser(jtlPath)
+                print("Log file format: binary index " + newObject.index.idxPath)
+            elif self.recognizeFormat(newFileLines) == "csv":
+                newObject = CsvLogAnalyser(jtlPath)
                 print("Log file format: csv")
             elif self.recognizeFormat(newFileLines) == "xml":
-                newObject = XmlLogAnalyser(self.jtlPath)
+                newObject = XmlLogAnalyser(jtlPath)
                 print("Log file format: xml")
             else:
                 raise JMeterLibException("Incorrect log file format")
         return newObject
 
-    def convertLogToHtml(self, disableReports=None):
-        self.lc = LogConverterHtml(self, disableReports=disableReports)
-        self.lc.createNewHtmlPath()
-        self.lc.createHtml(disableReports)
-
-    def convertLogToSql(self):
-        self.ls = LogConverterSql(self)
-        self.ls.createSql()
+    def convertLogToHtml(self, disableReports=None, maxInlineSamples=None):
+        self.profile.startAnalysis()
+        try:
+            self.profile.startStage("html")
+            self.lc = LogConverterHtml(self, disableReports=disableReports, maxInlineSamples=maxInlineSamples)
+            self.lc.createNewHtmlPath()
+            self.lc.createHtml(disableReports)
+            self.profile.endStage(len(self.samples))
+        finally:
+            self.profile.endAnalysis()
+        return self.lc.htmlLogPath
+
+    def convertLogToSql(self, historyDbPath=None):
+        self.profile.startAnalysis()
+        try:
+            self.profile.startStage("sql")
+            self.ls = LogConverterSql(self, historyDbPath)
+            self.ls.createSql()
+            self.profile.endStage(len(self.samples))
+        finally:
+            self.profile.endAnalysis()
+        return self.ls.dbName
+
+    def convertLogToParquet(self, fileFormat="parquet", batchSize=65536):
+        self.profile.startAnalysis()
+        try:
+            self.profile.startStage(fileFormat)
+            self.lp = LogConverterParquet(self, fileFormat, batchSize)
+            self.lp.createFiles()
+            self.profile.endStage(len(self.samples))
+        finally:
+            self.profile.endAnalysis()
+        return [self.lp.samplesPath, self.lp.assertionsPath, self.lp.aggregatedPath]
 
     def getReturnStructure(self):
         retStruct = []
         retStruct.append(self.aggrSummary.convertToDictionary())
         for ags in self.aggrSamples:
             retStruct.append(ags.convertToDictionary())
+        if self.threadBreakdown != None:
+            retStruct.append(self.threadBreakdown.convertToDictionary())
+        return retStruct
+
+    def checkThresholds(self, slaEvaluator):
+        return slaEvaluator.evaluate(self.aggrSamples, self.aborted)
+
+    def getThreadBreakdown(self):
+        if self.threadBreakdown == None:
+            raise JMeterLibException("Thread breakdown of %s was not calculated, enable it with Set Thread Breakdown" % self.jtlPath)
+        return self.threadBreakdown.convertToDictionary()
+
+    def getLabelStatistics(self, label):
+        for ags in self.aggrSamples:
+            if ags.sampleName == label:
+                return ags.convertToDictionary()
+        raise JMeterLibException("Label %s not found in %s" % (label, self.jtlPath))
+
+    def getPercentiles(self, percents, mode, label=None):
+        if label != None:
+            for ags in self.aggrSamples:
+                if ags.sampleName == label:
+                    return dict(ags.getPercentiles(percents, mode))
+            raise JMeterLibException("Label %s not found in %s" % (label, self.jtlPath))
+        return dict((ags.sampleName, dict(ags.getPercentiles(percents, mode))) for ags in self.aggrSamples)
+
+    def getSourceKey(self):
+        #log file and time window of samples, label filters are identified by labels they produce
+        window = None if self.sampleFilter == None else self.sampleFilter.getWindowKey()
+        return analysisCache.makeKey(self.jtlPath, window)
+
+def accumulateLogInWorker(arguments):
+    #runs in worker process of MultiLogAnalyser, settings of keywords are not shared with
+    #worker processes, so they are passed together with log file path
+    filePath, settings, sampleFilter = arguments
+    JtlIndex.enabled, ThreadBreakdown.enabled, JtlQuarantine.mode, JtlQuarantine.enabled = settings
+    try:
+        analyser = LogAnalysisInitiator.createAnalyserObject(filePath)
+        analyser.sampleFilter = sampleFilter
+        analyser.getSamples()
+    except JMeterLibException as e:
+        raise JMeterLibException("%s: %s" % (filePath, e.msg))
+    if (JtlIndex.enabled and sampleFilter == None and not isinstance(analyser, IndexLogAnalyser)
+            and analyser.malformedRows == 0):
+        JtlIndex(filePath).write(analyser.samples)
+    analyser.accumulate()
+    for agg in analyser.aggrSamples:
+        agg.countTimes()
+    return analyser.aggrSummary, analyser.aggrSamples, analyser.threadBreakdown
+
+class MultiLogAnalyser(object):
+    def __init__(self, filePaths, workers=None, sampleFilter=None):
+        self.filePaths = self.expandPaths(filePaths)
+        if len(self.filePaths) == 0:
+            raise JMeterLibException("No log files match %s" % str(filePaths))
+        if workers in [None, ""]:
+            workers = min(len(self.filePaths), multiprocessing.cpu_count())
+        self.workers = max(1, min(int(workers), len(self.filePaths)))
+        if sampleFilter != None and not sampleFilter.isActive():
+            sampleFilter = None
+        self.sampleFilter = sampleFilter
+
+    def expandPaths(self, filePaths):
+        if not isinstance(filePaths, list) and not isinstance(filePaths, tuple):
+            filePaths = [p for p in str(filePaths).split(";") if p.strip() != ""]
+        expandedPaths = []
+        for pattern in filePaths:
+            pattern = pattern.strip()
+            for path in sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]:
+                if path not in expandedPaths:
+                    expandedPaths.append(path)
+        return expandedPaths
+
+    def analyse(self):
+        settings = (JtlIndex.enabled, ThreadBreakdown.enabled, JtlQuarantine.mode, JtlQuarantine.enabled)
+        arguments = [(path, settings, copy.deepcopy(self.sampleFilter)) for path in self.filePaths]
+        print("Analysing %d log files in %d processes" % (len(self.filePaths), self.workers))
+        if self.workers == 1:
+            partialResults = [accumulateLogInWorker(a) for a in arguments]
+        else:
+            pool = multiprocessing.Pool(self.workers)
+            try:
+                partialResults = pool.map(accumulateLogInWorker, arguments, 1)
+            finally:
+                pool.terminate()
+                pool.join()
+        combined = self.mergeResults(partialResults)
+        fileResults = collections.OrderedDict()
+        for path, partialResult in zip(self.filePaths, partialResults):
+            fileResults[path] = self.finalizeResult(LogAnalyser(path), *partialResult)
+        return {'combined': self.finalizeResult(LogAnalyser(";".join(self.filePaths)), *combined),
+                'files': fileResults}
+
+    def mergeResults(self, partialResults):
+        #partial results are merged before they are finalized, finalizing changes counters to statistics
+        aggrSummary = AggregatedSummary()
+        aggrSamples = collections.OrderedDict()
+        totalSamples = AggregatedSamples("TOTAL")
+        threadBreakdown = None
+        for partialSummary, partialSamples, partialBreakdown in partialResults:
+            aggrSummary.mergeFrom(partialSummary)
+            for agg in partialSamples[:-1]:
+                if agg.sampleName not in aggrSamples:
+                    aggrSamples[agg.sampleName] = AggregatedSamples(agg.sampleName, len(aggrSamples))
+                aggrSamples[agg.sampleName].mergeFrom(agg)
+            totalSamples.mergeFrom(partialSamples[-1])
+            if partialBreakdown != None:
+                if threadBreakdown == None:
+                    threadBreakdown = ThreadBreakdown()
+                threadBreakdown.mergeFrom(partialBreakdown)
+        return aggrSummary, list(aggrSamples.values()) + [totalSamples], threadBreakdown
+
+    def finalizeResult(self, analyser, aggrSummary, aggrSamples, threadBreakdown):
+        analyser.aggrSummary, analyser.aggrSamples, analyser.threadBreakdown = aggrSummary, aggrSamples, threadBreakdown
+        analyser.finalize()
+        retStruct = [aggrSummary.convertToDictionary()]
+        for ags in aggrSamples:
+            retStruct.append(ags.convertToDictionary())
+        if threadBreakdown != None:
+            retStruct.append(threadBreakdown.convertToDictionary())
         return retStruct
 
+class SampleFilter(object):
+    def __init__(self, startOffset=None, endOffset=None, windowStart=None, windowEnd=None,
+                 includeLabels=None, excludeLabels=None, labelGroups=None):
+        self.startOffset = self.toNumber(startOffset)
+        self.endOffset = self.toNumber(endOffset)
+        self.windowStart = self.toTimestamp(windowStart)
+        self.windowEnd = self.toTimestamp(windowEnd)
+        self.minTimestamp = self.windowStart
+        self.maxTimestamp = self.windowEnd
+        self.includeLabels = self.toPattern(includeLabels)
+        self.excludeLabels = self.toPattern(excludeLabels)
+        self.labelGroups = self.toLabelGroups(labelGroups)
+        self.labelDecisions = {}
+
+    def toPattern(self, value):
+        if value == None or str(value) == "" or str(value).lower() == "none":
+            return None
+        try:
+            return re.compile(value)
+        except re.error:
+            raise JMeterLibException("Incorrect regular expression %s" % value)
+
+    def toLabelGroups(self, value):
+        if value == None or str(value) == "" or str(value).lower() == "none":
+            return []
+        if isinstance(value, dict):
+            rules = list(value.items())
+        else:
+            if not isinstance(value, (list, tuple)):
+                value = [r for r in value.split(";") if r.strip() != ""]
+            rules = []
+            for r in value:
+                if "=>" not in r:
+                    raise JMeterLibException("Incorrect label group %s, use <regex>=><group>" % r)
+                pattern, group = r.rsplit("=>", 1)
+                rules.append((pattern.strip(), group.strip()))
+        return [(self.toPattern(pattern), group) for pattern, group in rules]
+
+    def hasLabelRules(self):
+        return self.includeLabels != None or self.excludeLabels != None or len(self.labelGroups) > 0
+
+    def getLabel(self, label):
+        if label in self.labelDecisions:
+            return self.labelDecisions[label]
+        newLabel = label
+        if self.includeLabels != None and self.includeLabels.search(label) == None:
+            newLabel = None
+        elif self.excludeLabels != None and self.excludeLabels.search(label) != None:
+            newLabel = None
+        else:
+            for pattern, group in self.labelGroups:
+                match = pattern.search(label)
+                if match != None:
+                    newLabel = match.expand(group)
+                    break
+        self.labelDecisions[label] = newLabel
+        return newLabel
+
+    def toNumber(self, value):
+        if value == None or str(value) == "" or str(value).lower() == "none":
+            return None
+        return float(value)
+
+    def toTimestamp(self, value):
+        if value == None or str(value) == "" or str(value).lower() == "none":
+            return None
+        value = str(value).strip()
+        if value.isdigit():
+            return int(value)
+        for timeFormat in ["%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S"]:
+            try:
+                parsed = datetime.datetime.strptime(value, timeFormat)
+            except ValueError:
+                continue
+            return int(time.mktime(parsed.timetuple()) * 1000 + parsed.microsecond // 1000)
+        raise JMeterLibException("Incorrect time %s, use epoch milliseconds or YYYY-MM-DD HH:MM:SS" % value)
+
+    def isActive(self):
+        return (self.startOffset != None or self.endOffset != None or self.windowStart != None
+                or self.windowEnd != None or self.hasLabelRules())
+
+    def needsBounds(self):
+        return self.startOffset != None or self.endOffset != None
+
+    def resolve(self, firstTimestamp, lastTimestamp):
+        self.minTimestamp = self.windowStart
+        self.maxTimestamp = self.windowEnd
+        if self.startOffset != None and firstTimestamp != None:
+            offsetStart = firstTimestamp + int(self.startOffset * 1000)
+            if self.minTimestamp == None or offsetStart > self.minTimestamp:
+                self.minTimestamp = offsetStart
+        if self.endOffset != None and lastTimestamp != None:
+            offsetEnd = lastTimestamp - int(self.endOffset * 1000)
+            if self.maxTimestamp == None or offsetEnd < self.maxTimestamp:
+                self.maxTimestamp = offsetEnd
+
+    def acceptsTimestamp(self, timestamp):
+        try:
+            timestamp = int(timestamp)
+        except ValueError:
+            return True
+        if self.minTimestamp != None and timestamp < self.minTimestamp:
+            return False
+        if self.maxTimestamp != None and timestamp > self.maxTimestamp:
+            return False
+        return True
+
+    def getWindowKey(self):
+        return (self.startOffset, self.endOffset, self.windowStart, self.windowEnd)
+
+    def getCacheKey(self):
+        patterns = [None if p == None else p.pattern for p in [self.includeLabels, self.excludeLabels]]
+        groups = tuple((p.pattern, group) for p, group in self.labelGroups)
+        return self.getWindowKey() + (tuple(patterns), groups)
+
 class LogAnalyser(object):
     def __init__(self, filePath):
         self.filePath = filePath
         self.dbReady = False
+        self.profile = AnalysisProfile()
+        self.slaEvaluator = None
+        self.aborted = False
+        self.threadBreakdown = None
+        self.sampleFilter = None
+        self.malformedRows = 0
+        self.sampleConsumer = None
+        self.parsedSamples = 0
 
     def analyzeLog(self):
+        self.profile.startStage("parse")
         self.getSamples()
+        self.profile.endStage(len(self.samples), self.getBytesRead())
         if len(self.samples) > 0:
             self.calculate()
             return (self.aggrSummary, self.aggrSamples, self.samples)
         else:
             return (None, None, None)
 
+    def isFiltered(self):
+        return self.sampleFilter != None and self.sampleFilter.isActive()
+
+    def acceptsTimestamp(self, timestamp):
+        return self.sampleFilter == None or self.sampleFilter.acceptsTimestamp(timestamp)
+
+    def mapLabel(self, label):
+        if self.sampleFilter == None:
+            return label
+        return self.sampleFilter.getLabel(label)
+
+    def mapLabelInRow(self, row, index):
+        label = self.mapLabel(row[index])
+        if label == None:
+            return False
+        row[index] = label
+        return True
+
+    def getBytesRead(self):
+        try:
+            return os.path.getsize(self.filePath)
+        except OSError:
+            return 0
+
+    def addSample(self, sample):
+        #samples are passed to sampleConsumer instead of being kept in the list when only
+        #statistics of a log file are needed (see RunComparator)
+        self.parsedSamples += 1
+        if self.sampleConsumer == None:
+            self.samples.append(sample)
+        else:
+            self.sampleConsumer(sample)
+
     def printSamples(self):
         for s in self.samples:
             print(s)
 
     def calculate(self):
+        self.accumulate()
+        self.finalize()
+
+    def accumulate(self):
         print("Calculating statistical values")
+        self.profile.startStage("aggregate")
         self.aggrSummary = AggregatedSummary()
         self.aggrSamples = []
         self.totalSamples = AggregatedSamples("TOTAL")
+        if ThreadBreakdown.enabled:
+            self.threadBreakdown = ThreadBreakdown()
         for s in self.samples:
             whichAggr = self.checkWhichAggregated(s.getLabel(), s.getStartTime())
             if self.totalSamples.getStartTime()==None:
@@ -356,11 +1711,18 @@ class LogAnalyser(object):
             self.totalSamples.addAverageTime(s.getSampleTime())
             self.totalSamples.addAverageBytes(s.getBytes())
             self.totalSamples.setEndTime(s.getStartTime(), s.getSampleTime())
+            self.aggrSamples[whichAggr].addExtendedFields(s)
+            self.totalSamples.addExtendedFields(s)
+            if self.threadBreakdown != None:
+                self.threadBreakdown.addSample(s)
             if s.getStatus() == "true":
                 self.aggrSummary.addSuccessfullSampleNoAssert()
                 self.aggrSamples[whichAggr].addSuccessfullSampleNoAssert()
                 self.totalSamples.addSuccessfullSampleNoAssert()
                 sampleWithAssertOk = True
+            else:
+                self.aggrSamples[whichAggr].addError()
+                self.totalSamples.addError()
             for a in s.assertions:
                 self.aggrSummary.addAssertion()
                 self.aggrSamples[whichAggr].addAssertion()
@@ -375,11 +1737,24 @@ class LogAnalyser(object):
                 self.aggrSummary.addSuccessfullSampleInclAssert()
                 self.aggrSamples[whichAggr].addSuccessfullSampleInclAssert()
                 self.totalSamples.addSuccessfullSampleInclAssert()
+            else:
+                self.aggrSamples[whichAggr].addErrorInclAssert()
+                self.totalSamples.addErrorInclAssert()
+            if self.slaEvaluator != None and self.slaEvaluator.isCertainFailure(self.aggrSamples[whichAggr], self.totalSamples):
+                print("Threshold failed before all samples were aggregated, aggregation stopped")
+                self.aborted = True
+                break
+        self.aggrSummary.malformedRows = self.malformedRows
+        self.aggrSamples.append(self.totalSamples)
+        self.profile.endStage(self.totalSamples.getAmountOfSamples())
+
+    def finalize(self):
+        #accumulated counters (which can be merged with mergeFrom) are converted to statistics
+        self.profile.startStage("percentiles")
         self.aggrSummary.calculateAverageTime()
         self.aggrSummary.calculateSampleSuccessRateNoAssert()
         self.aggrSummary.calculateSampleSuccessRateInclAssert()
         self.aggrSummary.calculateAssertionPassRate()
-        self.aggrSamples.append(self.totalSamples)
         for agg in self.aggrSamples:
             agg.calculateAverageTime()
             agg.calculateSampleSuccessRateNoAssert()
@@ -387,8 +1762,13 @@ class LogAnalyser(object):
             agg.calculateThroughput()
             agg.calculateAverageBytes()
             agg.calculateKBytesPerSec()
+            agg.calculateExtendedFields()
+        for agg in self.aggrSamples:
             agg.calculatePercentils()
             agg.calculateStdDev()
+        if self.threadBreakdown != None:
+            self.threadBreakdown.calculate()
+        self.profile.endStage(self.aggrSamples[-1].getAmountOfSamples())
 
     def checkWhichAggregated(self, name, start):
         aggrId = -1
@@ -416,131 +1796,670 @@ class LogAnalyser(object):
         self.ls.createSql()
 
 class CsvLogAnalyser(LogAnalyser):
+    headerColumns = {'timeStamp': 'ts', 'elapsed': 't', 'label': 'lb', 'responseCode': 'rc',
+                     'responseMessage': 'rm', 'threadName': 'tn', 'dataType': 'dt', 'success': 's',
+                     'bytes': 'by', 'Latency': 'lt', 'sentBytes': 'sby', 'grpThreads': 'ng',
+                     'allThreads': 'na', 'URL': 'url', 'IdleTime': 'it', 'Connect': 'ct'}
+
     def getSamples(self):
         print("Extracting samples and assertions from " + self.filePath)
         self.samples = []
+        self.parsedSamples = 0
+        quarantine = JtlQuarantine(self.filePath)
+        self.continuationLines = 0
+        counter = 0
         try:
-            with open(self.filePath, "r") as csvfile:
-                csvReader = csv.reader(csvfile, delimiter=",", quoting=csv.QUOTE_ALL, quotechar="\"")
-                header_found = False
-                counter = 0
-                for row in csvReader:
-                    newSample = None
-                    if counter==0:
-                        try:
-                            if row[0].find('timeStamp') == 0 and row[1].find('elapsed') == 0 and row[0].find('timeStamp') == 0:
-                                header_found = True
-                        except Exception as e:
-                            pass
-                    if header_found:
-                        if counter >= 1:
-                            newSample = Sample(ts=row[0], t=row[1], lb=row[2], rc=row[3],
-                                               rm=row[4], tn=row[5], dt=row[6], s=row[7],
-                                               by=row[9], lt=row[13])
-                    elif len(row) == 10 and self.validateCsvSampleAttributes(row):
-                        newSample = Sample(ts=row[0], t=row[1], lb=row[2], rc=row[3],
-                                           rm=row[4], tn=row[5], dt=row[6], s=row[7],
-                                           by=row[8], lt=row[9])
-                    elif len(row) == 12 and self.validateCsvSampleAttributes(row):
-                        newSample = Sample2(ts=row[0], t=row[1], lb=row[2], rc=row[3],
-                                           rm=row[4], tn=row[5], dt=row[6], s=row[7],
-                                           by=row[8], lt=row[9], ng=row[10], na=row[11])
-                    if type(newSample) == Sample or type(newSample) == Sample2:
-                        self.samples.append(newSample)
-                    counter += 1
+            if self.isFiltered() and self.sampleFilter.needsBounds():
+                self.sampleFilter.resolve(*self.getFirstAndLastTimestamp())
+            header_found = False
+            for row in self.readRows():
+                newSample = None
+                if counter==0 and len(row) > 1:
+                    if row[0].find('timeStamp') == 0 and row[1].find('elapsed') == 0:
+                        #missing mandatory column is reported, header rows are not quarantined
+                        columnMapping = self.getHeaderMapping(row)
+                        tsIndex = columnMapping.index('ts')
+                        lbIndex = columnMapping.index('lb')
+                        numberIndexes = [columnMapping.index(key) for key in ['ts', 't', 'by', 'lt']]
+                        header_found = True
+                if len(row) == 0 or (len(row) == 1 and row[0] == ""):
+                    pass
+                elif header_found:
+                    if counter >= 1:
+                        if len(row) != len(columnMapping):
+                            quarantine.addRow(counter + 1 + self.continuationLines, "expected %d columns, found %d" % (len(columnMapping), len(row)), row)
+                        elif not self.validateCsvSampleAttributes(row, numberIndexes):
+                            quarantine.addRow(counter + 1 + self.continuationLines, self.getInvalidNumberReason(row, numberIndexes), row)
+                        elif self.acceptsTimestamp(row[tsIndex]) and self.mapLabelInRow(row, lbIndex):
+                            newSample = self.createSampleFromHeaderRow(row, columnMapping)
+                elif len(row) != 10 and len(row) != 12:
+                    quarantine.addRow(counter + 1 + self.continuationLines, "unknown layout with %d columns" % len(row), row)
+                elif not self.validateCsvSampleAttributes(row):
+                    quarantine.addRow(counter + 1 + self.continuationLines, self.getInvalidNumberReason(row), row)
+                elif not self.acceptsTimestamp(row[0]):
+                    pass
+                elif not self.mapLabelInRow(row, 2):
+                    pass
+                elif len(row) == 10:
+                    newSample = Sample(ts=row[0], t=row[1], lb=row[2], rc=row[3],
+                                       rm=row[4], tn=row[5], dt=row[6], s=row[7],
+                                       by=row[8], lt=row[9])
+                else:
+                    newSample = Sample2(ts=row[0], t=row[1], lb=row[2], rc=row[3],
+                                       rm=row[4], tn=row[5], dt=row[6], s=row[7],
+                                       by=row[8], lt=row[9], ng=row[10], na=row[11])
+                if newSample != None:
+                    self.addSample(newSample)
+                counter += 1
         except IOError:
             print("ERROR, problems while reading " + str(self.filePath))
-        if len(self.samples) <= 0:
+        except csv.Error as e:
+            #e.g. quoted field not closed at the end of truncated log file
+            quarantine.add(counter + 1 + self.continuationLines, "csv error: %s" % e, "")
+        finally:
+            quarantine.close()
+        self.malformedRows = quarantine.count
+        if self.parsedSamples <= 0:
             raise JMeterLibException("No samples were found in a log file.")
 
-    def validateCsvSampleAttributes(self, row):
-        validated = True
-        try:
-            intValue = int(row[0])
-            intValue = int(row[1])
-            intValue = int(row[8])
-            intValue = int(row[9])
-        except ValueError:
-            validated = False
-        return validated
+    def readRows(self):
+        #rows without quotes are split directly, other rows are passed to csv module which reads
+        #continuation lines of multi-line quoted fields from the same line iterator, amount of
+        #continuation lines before current row is kept in continuationLines for line numbers
+        with open(self.filePath, "rb") as csvFile:
+            lines = itertools.chain.from_iterable(self.readLineBlocks(csvFile))
+            pending = []
+            quotedRows = 0
+            def readCsvLines():
+                while True:
+                    while pending:
+                        yield pending.pop() + "\n"
+                    line = next(lines, None)
+                    if line == None:
+                        return
+                    yield line + "\n"
+            csvReader = csv.reader(readCsvLines(), delimiter=",", quoting=csv.QUOTE_ALL, quotechar="\"")
+            for line in lines:
+                if "\"" in line:
+                    pending.append(line)
+                    yield next(csvReader)
+                    quotedRows += 1
+                    self.continuationLines = csvReader.line_num - quotedRows
+                else:
+                    yield line.split(",") if line else []
+
+    def readLineBlocks(self, csvFile, blockSize=262144):
+        #file is read in blocks small enough to stay in CPU cache, lines of every block are returned
+        #without line ends, partial line at the end of block is joined with the next block
+        decoder = None
+        if str is not bytes:
+            decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        rest = ""
+        while True:
+            block = csvFile.read(blockSize)
+            last = len(block) == 0
+            if decoder != None:
+                block = decoder.decode(block, last)
+            text = rest + block
+            if "\r" in text:
+                text = text.replace("\r\n", "\n")
+            lines = text.split("\n")
+            rest = lines.pop()
+            if last:
+                if rest != "":
+                    lines.append(rest)
+                yield lines
+                return
+            yield lines
+
+    def getFirstAndLastTimestamp(self):
+        tsIndex = 0
+        firstTimestamp = None
+        lastTimestamp = None
+        with open(self.filePath, "r") as csvfile:
+            for row in csv.reader([csvfile.readline(), csvfile.readline()]):
+                if 'timeStamp' in row:
+                    tsIndex = row.index('timeStamp')
+                elif len(row) > tsIndex and row[tsIndex].isdigit():
+                    firstTimestamp = int(row[tsIndex])
+                    break
+        with open(self.filePath, "rb") as tailFile:
+            tailFile.seek(0, 2)
+            tailFile.seek(max(0, tailFile.tell() - 65536))
+            tail = tailFile.read()
+            if not isinstance(tail, str):
+                tail = tail.decode("utf-8", "replace")
+            for line in reversed(tail.splitlines()):
+                row = next(csv.reader([line]), [])
+                if len(row) > tsIndex and row[tsIndex].isdigit():
+                    lastTimestamp = int(row[tsIndex])
+                    break
+        return firstTimestamp, lastTimestamp
+
+    def getHeaderMapping(self, header):
+        columnMapping = [self.headerColumns.get(name) for name in header]
+        for key in ['ts', 't', 'lb', 'rc', 'rm', 'tn', 'dt', 's', 'by', 'lt']:
+            if key not in columnMapping:
+                raise JMeterLibException("Column %s is missing in csv header" % key)
+        return columnMapping
+
+    def createSampleFromHeaderRow(self, row, columnMapping):
+        values = {}
+        for key, value in zip(columnMapping, row):
+            if key != None:
+                values[key] = value
+        if 'ng' in values and 'na' in values:
+            return Sample2(**values)
+        return Sample(**values)
+
+    def validateCsvSampleAttributes(self, row, numberIndexes=(0, 1, 8, 9)):
+        for i in numberIndexes:
+            if not row[i].isdigit() and not (row[i][:1] == "-" and row[i][1:].isdigit()):
+                return False
+        return True
+
+    def getInvalidNumberReason(self, row, numberIndexes=(0, 1, 8, 9)):
+        for i in numberIndexes:
+            if not row[i].isdigit() and not (row[i][:1] == "-" and row[i][1:].isdigit()):
+                return "incorrect number in column %d: \"%s\"" % (i + 1, row[i])
+        return None
 
 class XmlLogAnalyser(LogAnalyser):
+    requiredAttributes = ['ts', 't', 'lb', 'rc', 'rm', 'tn', 'dt', 's', 'by', 'lt']
+    numberAttributes = ['ts', 't', 'lt', 'by']
+    timestampPattern = re.compile(r'<[A-Za-z][\w.]*\s[^<>]*\bts="(\d+)"')
+
     def getSamples(self):
         print("Extracting samples and assertions from " + self.filePath)
         self.samples = []
+        self.parsedSamples = 0
+        quarantine = JtlQuarantine(self.filePath)
         try:
-            xmlLog = xml.dom.minidom.parse(self.filePath)
+            if self.isFiltered() and self.sampleFilter.needsBounds():
+                self.sampleFilter.resolve(*self.getFirstAndLastTimestamp())
+            for sampleElements in self.readSampleElements(quarantine):
+                self.addSamples(sampleElements, quarantine)
         except IOError:
             print("ERROR, problems while reading " + str(self.filePath))
-        except xml.parsers.expat.ExpatError:
-            print("ERROR, problems while parsing xml")
-        else:
-            testResultNodes = xmlLog.getElementsByTagName("testResults")
-            if len(testResultNodes) > 0:
-                testResultNode = testResultNodes[0]
-                samplesNodes = testResultNode.childNodes
-                for s in samplesNodes:
-                    newSample = None
-                    if isinstance(s, xml.dom.minidom.Element):
-                        if self.validateXmlSampleAttributes(s):
-                            if s.hasAttribute('ng') and s.hasAttribute('na'):
-                                newSample = Sample2(ts=s.getAttribute('ts'), t=s.getAttribute('t'),
-                                               lb=s.getAttribute('lb'), rc=s.getAttribute('rc'),
-                                               rm=s.getAttribute('rm'), tn=s.getAttribute('tn'),
-                                               dt=s.getAttribute('dt'), s=s.getAttribute('s'),
-                                               by=s.getAttribute('by'), lt=s.getAttribute('lt'),
-                                               na=s.getAttribute('na'), ng=s.getAttribute('ng'))
-                            else:
-                                newSample = Sample(ts=s.getAttribute('ts'), t=s.getAttribute('t'),
-                                               lb=s.getAttribute('lb'), rc=s.getAttribute('rc'),
-                                               rm=s.getAttribute('rm'), tn=s.getAttribute('tn'),
-                                               dt=s.getAttribute('dt'), s=s.getAttribute('s'),
-                                               by=s.getAttribute('by'), lt=s.getAttribute('lt'))
-                            assertNodes = s.childNodes
-                            newSample.assertions = []
-                            for a in assertNodes:
-                                newAssertion = None
-                                if isinstance(a, xml.dom.minidom.Element):
-                                    nameTagString = self.getAssertionFields("name", a)
-                                    failureTagString = self.getAssertionFields("failure", a)
-                                    failureMessageTagString = self.getAssertionFields("failureMessage", a)
-                                    errorTagString = self.getAssertionFields("error", a)
-                                    newAssertion = Assertion(name=nameTagString, failure=failureTagString, failureMessage=failureMessageTagString, error=errorTagString)
-                                    newSample.addAssertion(newAssertion)
-                            if isinstance(newSample, Sample) or isinstance(newSample, Sample2):
-                                self.samples.append(newSample)
-        if len(self.samples) <= 0:
+        finally:
+            quarantine.close()
+        self.malformedRows = quarantine.count
+        if self.parsedSamples <= 0:
             raise JMeterLibException("No samples were found in a log file.")
 
-    def validateXmlSampleAttributes(self, element):
-        validated = True
-        attributes = ['ts','t','lb','rc','rm','tn','dt','s','by','lt']
-        for a in attributes:
-            if not element.hasAttribute(a):
-                validated = False
-                break
-        if validated:
-            try:
-                intValue = int(element.getAttribute('ts'))
-                intValue = int(element.getAttribute('t'))
-                intValue = int(element.getAttribute('lt'))
-                intValue = int(element.getAttribute('by'))
-            except ValueError:
-                validated = False
-        return validated
+    def getFirstAndLastTimestamp(self):
+        #the first and the last sample element with ts attribute are found in the beginning and the end
+        #of the file, the last one can be a sub-sample of the last sample (it doesn't start earlier)
+        with open(self.filePath, "rb") as xmlFile:
+            head = xmlFile.read(65536)
+            xmlFile.seek(0, 2)
+            xmlFile.seek(max(0, xmlFile.tell() - 65536))
+            tail = xmlFile.read()
+        if not isinstance(head, str):
+            head = head.decode("utf-8", "replace")
+            tail = tail.decode("utf-8", "replace")
+        firstMatch = self.timestampPattern.search(head)
+        lastMatches = self.timestampPattern.findall(tail)
+        firstTimestamp = None if firstMatch == None else int(firstMatch.group(1))
+        lastTimestamp = None if len(lastMatches) == 0 else int(lastMatches[-1])
+        return firstTimestamp, lastTimestamp
+
+    def readSampleElements(self, quarantine, chunkSize=1048576):
+        #samples (children of root element) are built one by one from expat events, so samples
+        #before damaged end of log file are kept; lists of (line, element) are returned per chunk
+        parser = xml.parsers.expat.ParserCreate()
+        parser.buffer_text = True
+        state = {'depth': 0, 'line': 0, 'builder': None}
+        completed = []
+        def startElement(tag, attributes):
+            state['depth'] += 1
+            if state['depth'] == 2:
+                state['line'] = parser.CurrentLineNumber
+                state['builder'] = xml.etree.ElementTree.TreeBuilder()
+            if state['depth'] >= 2:
+                state['builder'].start(tag, attributes)
+        def endElement(tag):
+            if state['depth'] >= 2:
+                element = state['builder'].end(tag)
+                if state['depth'] == 2:
+                    completed.append((state['line'], element))
+            state['depth'] -= 1
+        def characterData(data):
+            if state['depth'] >= 2:
+                state['builder'].data(data)
+        parser.StartElementHandler = startElement
+        parser.EndElementHandler = endElement
+        parser.CharacterDataHandler = characterData
+        with open(self.filePath, "rb") as xmlFile:
+            while True:
+                chunk = xmlFile.read(chunkSize)
+                try:
+                    parser.Parse(chunk, len(chunk) == 0)
+                except xml.parsers.expat.ExpatError as e:
+                    yield completed
+                    quarantine.add(e.lineno, "xml error: %s" % xml.parsers.expat.ErrorString(e.code), "")
+                    return
+                if len(completed) > 0:
+                    yield completed
+                    completed = []
+                if len(chunk) == 0:
+                    return
+
+    def addSamples(self, sampleElements, quarantine):
+        for line, s in sampleElements:
+            reason = self.getInvalidAttributeReason(s)
+            if reason != None:
+                quarantine.add(line, reason, self.toXml(s, False))
+                continue
+            if not self.acceptsTimestamp(s.get('ts')) or self.mapLabel(s.get('lb')) == None:
+                continue
+            values = {}
+            for key in ['ts', 't', 'lb', 'rc', 'rm', 'tn', 'dt', 's', 'by', 'lt', 'ct', 'sby', 'it']:
+                if key in s.attrib:
+                    values[key] = s.get(key)
+            values['lb'] = self.mapLabel(values['lb'])
+            if 'ng' in s.attrib and 'na' in s.attrib:
+                newSample = Sample2(na=s.get('na'), ng=s.get('ng'), **values)
+            else:
+                newSample = Sample(**values)
+            newSample.assertions = []
+            #only assertionResult children are assertions, responseData, headers and sub-samples are not
+            for a in s:
+                if a.tag == "java.net.URL":
+                    newSample.setUrl(self.getNodeText(a))
+                elif a.tag == "assertionResult":
+                    nameTagString = self.getAssertionFields("name", a)
+                    failureTagString = self.getAssertionFields("failure", a)
+                    failureMessageTagString = self.getAssertionFields("failureMessage", a)
+                    errorTagString = self.getAssertionFields("error", a)
+                    newAssertion = Assertion(name=nameTagString, failure=failureTagString, failureMessage=failureMessageTagString, error=errorTagString)
+                    newSample.addAssertion(newAssertion)
+            self.addSample(newSample)
+
+    def getInvalidAttributeReason(self, element):
+        for a in self.requiredAttributes:
+            if a not in element.attrib:
+                return "missing attribute %s" % a
+        for a in self.numberAttributes:
+            value = element.get(a)
+            if not value.isdigit() and not (value[:1] == "-" and value[1:].isdigit()):
+                return "incorrect number in attribute %s: \"%s\"" % (a, value)
+        return None
 
     def getAssertionFields(self, tag, elem):
         someTagString = ""
-        if len(elem.getElementsByTagName(tag)) >= 1:
-            someTag = elem.getElementsByTagName(tag)[0]
-            someTagString = someTag.toxml()
-            someTagString = someTagString.replace("<" + tag + ">", "")
-            someTagString = someTagString.replace("</" + tag + ">", "")
+        for someTag in elem.iter(tag):
+            if someTag is not elem:
+                someTagString = self.toXml(someTag)
+                someTagString = someTagString.replace("<" + tag + ">", "")
+                someTagString = someTagString.replace("</" + tag + ">", "")
+                break
         return someTagString
 
+    def toXml(self, element, withContent=True):
+        #the same output as toxml method of minidom elements (attributes are sorted in Python 2)
+        attributes = list(element.attrib.keys())
+        if sys.version_info[0] < 3:
+            attributes.sort()
+        xmlText = "<" + element.tag + "".join(" %s=\"%s\"" % (a, self.escapeXml(element.attrib[a])) for a in attributes)
+        if not withContent:
+            return xmlText + ">"
+        if not element.text and len(element) == 0:
+            return xmlText + "/>"
+        xmlText += ">" + self.escapeXml(element.text or "")
+        for child in element:
+            xmlText += self.toXml(child) + self.escapeXml(child.tail or "")
+        return xmlText + "</" + element.tag + ">"
+
+    def escapeXml(self, text):
+        return text.replace("&", "&amp;").replace("<", "&lt;").replace("\"", "&quot;").replace(">", "&gt;")
+
+    def getNodeText(self, elem):
+        return (elem.text or "") + "".join([child.tail or "" for child in elem])
+
+class IndexLogAnalyser(LogAnalyser):
+    def __init__(self, filePath):
+        super(IndexLogAnalyser, self).__init__(filePath)
+        self.index = JtlIndex(filePath)
+
+    def getSamples(self):
+        print("Extracting samples from " + self.index.idxPath)
+        self.samples = self.index.readSamples(self.sampleFilter if self.isFiltered() else None)
+        self.parsedSamples = len(self.samples)
+        if self.sampleConsumer != None:
+            for s in self.samples:
+                self.sampleConsumer(s)
+            self.samples = []
+        if self.parsedSamples <= 0:
+            raise JMeterLibException("No samples were found in a log file.")
+
+    def accumulate(self):
+        if not isinstance(self.samples, IndexSamples) or self.slaEvaluator != None:
+            #thresholds are checked after every sample, so they need sample by sample aggregation
+            return super(IndexLogAnalyser, self).accumulate()
+        print("Calculating statistical values")
+        self.profile.startStage("aggregate")
+        rows = self.samples.rows
+        labels = self.samples.labels
+        labelCodes = self.samples.columns['label']
+        rowsByLabel = collections.OrderedDict()
+        for i in rows:
+            label = labels[labelCodes[i]]
+            labelRows = rowsByLabel.get(label)
+            if labelRows == None:
+                labelRows = rowsByLabel[label] = []
+            labelRows.append(i)
+        self.aggrSamples = [self.aggregateRows(label, labelRows, aggrId) for aggrId, (label, labelRows) in enumerate(rowsByLabel.items())]
+        self.totalSamples = self.aggregateRows("TOTAL", rows)
+        self.aggrSummary = AggregatedSummary()
+        for name in ['samples', 'averageTime', 'minTime', 'maxTime', 'samplesSuccessRateNoAssert', 'samplesSuccessRateInclAssert']:
+            setattr(self.aggrSummary, name, getattr(self.totalSamples, name))
+        if ThreadBreakdown.enabled:
+            self.threadBreakdown = ThreadBreakdown()
+            columns = self.samples.columns
+            threadNames = self.samples.dictionaries['threadName']
+            for i in rows:
+                self.threadBreakdown.addValues(threadNames[columns['threadName'][i]], int(columns['startTime'][i]),
+                                               columns['sampleTime'][i], columns['status'][i] == 1)
+        self.aggrSummary.malformedRows = self.malformedRows
+        self.aggrSamples.append(self.totalSamples)
+        self.profile.endStage(self.totalSamples.getAmountOfSamples())
+
+    def aggregateRows(self, name, rows, aggrId=-1):
+        #the same counters as sample by sample aggregation of LogAnalyser.accumulate
+        columns = self.samples.columns
+        startTimes = columns['startTime']
+        sampleTimes = columns['sampleTime']
+        agg = AggregatedSamples(name, aggrId)
+        times = [sampleTimes[i] for i in rows]
+        agg.samples = len(times)
+        agg.timeTable = times
+        agg.timeSum = agg.averageTime = sum(times)
+        agg.minTime = min(times)
+        agg.maxTime = max(0, max(times))
+        agg.bytesSum = agg.averageBytes = agg.bytesPerSec = sum(int(columns['bytes'][i]) for i in rows)
+        successes = sum(columns['status'][i] for i in rows)
+        agg.samplesSuccessRateNoAssert = agg.samplesSuccessRateInclAssert = successes
+        agg.errorCount = agg.errorCountInclAssert = agg.samples - successes
+        #totalTime ends with the sample of the latest end, duration is truncated to seconds in Python 2
+        #like in setEndTime, which is called for samples ending at the same time in their order
+        truncated = sys.version_info[0] < 3
+        lastEnd = None
+        lastRows = []
+        for i in rows:
+            end = int(startTimes[i]) + (sampleTimes[i] // 1000 * 1000 if truncated else sampleTimes[i])
+            if lastEnd == None or end > lastEnd:
+                lastEnd = end
+                lastRows = [i]
+            elif end == lastEnd:
+                lastRows.append(i)
+        agg.setStartTime(int(startTimes[rows[0]]))
+        for i in [rows[0]] + lastRows:
+            agg.setEndTime(int(startTimes[i]), sampleTimes[i])
+        agg.endMs = max(int(startTimes[i]) + sampleTimes[i] for i in rows)
+        latencies = [columns['latency'][i] for i in rows]
+        agg.latencySum = sum(latencies)
+        for latency, count in collections.Counter(latencies).items():
+            agg.latencyHistogram.add(latency, count)
+        connects = [columns['connect'][i] for i in rows if columns['connect'][i] >= 0]
+        agg.connectSum = sum(connects)
+        for connect, count in collections.Counter(connects).items():
+            agg.connectHistogram.add(connect, count)
+        sentBytes = [int(columns['sentBytes'][i]) for i in rows if columns['sentBytes'][i] >= 0]
+        agg.sentBytesSum, agg.sentBytesCount = sum(sentBytes), len(sentBytes)
+        idleTimes = [columns['idleTime'][i] for i in rows if columns['idleTime'][i] >= 0]
+        agg.idleTimeSum, agg.idleTimeCount = sum(idleTimes), len(idleTimes)
+        activeThreads = [columns['na'][i] for i in rows if columns['ng'][i] >= 0]
+        if len(activeThreads) > 0:
+            agg.maxActiveThreads = max(activeThreads)
+        return agg
+
+    def getBytesRead(self):
+        try:
+            return os.path.getsize(self.index.idxPath)
+        except OSError:
+            return 0
+
+class JtlIndex(object):
+    enabled = False
+    magic = b"JTLIDX03"
+    numericColumns = [('startTime', 'd'), ('sampleTime', 'i'), ('latency', 'i'), ('bytes', 'd'),
+                      ('status', 'b'), ('ng', 'i'), ('na', 'i'), ('connect', 'i'),
+                      ('sentBytes', 'd'), ('idleTime', 'i')]
+    labelColumns = ['label', 'respCode', 'respMsg', 'threadName', 'dataType', 'url']
+
+    def __init__(self, jtlPath):
+        self.jtlPath = jtlPath
+        self.idxPath = jtlPath + ".idx"
+
+    def getSourceKey(self):
+        fileStat = os.stat(self.jtlPath)
+        return [fileStat.st_mtime, fileStat.st_size, sys.version_info[0], sys.byteorder]
+
+    def readHeader(self, idxFile):
+        if idxFile.read(len(self.magic)) != self.magic:
+            return None
+        headerLength = struct.unpack("<I", idxFile.read(4))[0]
+        header = json.loads(idxFile.read(headerLength).decode("utf-8"))
+        if sys.version_info[0] < 3:
+            #labels read from csv files are byte strings in Python 2
+            for name, values in header['dictionaries'].items():
+                header['dictionaries'][name] = [v.encode("utf-8") if isinstance(v, unicode) else v for v in values]
+        return header
+
+    def isValid(self):
+        if not os.path.isfile(self.idxPath):
+            return False
+        try:
+            with open(self.idxPath, "rb") as idxFile:
+                header = self.readHeader(idxFile)
+            return header != None and header['source'] == self.getSourceKey()
+        except Exception:
+            return False
+
+    def write(self, samples):
+        columns = collections.OrderedDict()
+        for name, typecode in self.numericColumns:
+            columns[name] = array.array(typecode)
+        dictionaries = {}
+        lookups = {}
+        for name in self.labelColumns:
+            columns[name] = array.array('i')
+            dictionaries[name] = []
+            lookups[name] = {}
+        try:
+            for s in samples:
+                if len(s.getAssertions()) > 0:
+                    print("Binary index not created, assertions are not stored in it")
+                    return
+                columns['startTime'].append(float(s.getStartTime()))
+                columns['sampleTime'].append(int(s.getSampleTime()))
+                columns['latency'].append(int(s.getLatency()))
+                columns['bytes'].append(float(s.getBytes()))
+                columns['status'].append(1 if s.getStatus() == "true" else 0)
+                columns['ng'].append(int(getattr(s, 'ng', -1)))
+                columns['na'].append(int(getattr(s, 'na', -1)))
+                for name in ['connect', 'sentBytes', 'idleTime']:
+                    value = getattr(s, name)
+                    columns[name].append(-1 if value == None else int(value))
+                for name in self.labelColumns:
+                    value = getattr(s, name)
+                    code = lookups[name].get(value)
+                    if code == None:
+                        code = len(dictionaries[name])
+                        lookups[name][value] = code
+                        dictionaries[name].append(value)
+                    columns[name].append(code)
+        except (ValueError, OverflowError):
+            print("Binary index not created, log file contains non numeric values")
+            return
+        columnsInfo = []
+        offset = 0
+        for name, values in columns.items():
+            length = len(values) * values.itemsize
+            columnsInfo.append((name, values.typecode, offset, length))
+            offset += length
+        startTimes = columns['startTime']
+        sortedByStartTime = all(startTimes[i] <= startTimes[i + 1] for i in range(len(startTimes) - 1))
+        try:
+            header = json.dumps({'source': self.getSourceKey(), 'rows': len(samples),
+                                 'columns': columnsInfo, 'dictionaries': dictionaries,
+                                 'sortedByStartTime': sortedByStartTime}).encode("utf-8")
+        except UnicodeDecodeError:
+            print("Binary index not created, log file contains text which is not utf-8 encoded")
+            return
+        print("Creating binary index " + self.idxPath)
+        temporaryPath = getTemporaryPath(self.idxPath)
+        try:
+            with open(temporaryPath, "wb") as idxFile:
+                idxFile.write(self.magic)
+                idxFile.write(struct.pack("<I", len(header)))
+                idxFile.write(header)
+                for values in columns.values():
+                    if hasattr(values, 'tobytes'):
+                        idxFile.write(values.tobytes())
+                    else:
+                        idxFile.write(values.tostring())
+            replaceFile(temporaryPath, self.idxPath)
+        except (IOError, OSError):
+            print("ERROR, problems while writing " + self.idxPath)
+
+    def readColumns(self):
+        #columns are read from the file straight into typed arrays
+        columns = {}
+        with open(self.idxPath, "rb") as idxFile:
+            header = self.readHeader(idxFile)
+            dataStart = idxFile.tell()
+            for name, typecode, offset, length in header['columns']:
+                values = array.array(str(typecode))
+                idxFile.seek(dataStart + offset)
+                values.fromfile(idxFile, length // values.itemsize)
+                columns[name] = values
+        return header, columns
+
+    def readSamples(self, sampleFilter=None):
+        try:
+            header, columns = self.readColumns()
+        except (IOError, ValueError, EOFError, TypeError):
+            raise JMeterLibException("File %s couldn't be opened" % self.idxPath)
+        labels = header['dictionaries']['label']
+        rows = range(header['rows'])
+        if sampleFilter != None and sampleFilter.hasLabelRules():
+            labels = [sampleFilter.getLabel(l) for l in labels]
+        if sampleFilter != None:
+            startTimes = columns['startTime']
+            if header['rows'] > 0:
+                sampleFilter.resolve(int(startTimes[0]), int(startTimes[-1]))
+            if header.get('sortedByStartTime', False):
+                first = 0
+                last = header['rows']
+                if sampleFilter.minTimestamp != None:
+                    first = bisect.bisect_left(startTimes, sampleFilter.minTimestamp)
+                if sampleFilter.maxTimestamp != None:
+                    last = bisect.bisect_right(startTimes, sampleFilter.maxTimestamp)
+                rows = range(first, last)
+            else:
+                rows = [i for i in rows if sampleFilter.acceptsTimestamp(startTimes[i])]
+            if sampleFilter.hasLabelRules():
+                labelCodes = columns['label']
+                rows = [i for i in rows if labels[labelCodes[i]] != None]
+        return IndexSamples(header['dictionaries'], columns, rows, labels)
+
+class IndexSamples(object):
+    #samples of binary index stay in typed columns, Sample objects are created only when
+    #rows of samples are read (converters, failure analysis), aggregation uses the columns
+    statusNames = ["false", "true"]
+
+    def __init__(self, dictionaries, columns, rows, labels):
+        self.dictionaries = dictionaries
+        self.columns = columns
+        self.rows = rows
+        self.labels = labels
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        for i in self.rows:
+            yield self.createSample(i)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self.createSample(i) for i in self.rows[position]]
+        return self.createSample(self.rows[position])
+
+    def getText(self, name, i):
+        return self.dictionaries[name][self.columns[name][i]]
+
+    def createSample(self, i):
+        columns = self.columns
+        values = {'ts': str(int(columns['startTime'][i])), 't': str(columns['sampleTime'][i]),
+                  'lb': self.labels[columns['label'][i]], 'rc': self.getText('respCode', i),
+                  'rm': self.getText('respMsg', i), 'tn': self.getText('threadName', i),
+                  'dt': self.getText('dataType', i), 's': self.statusNames[columns['status'][i]],
+                  'by': str(int(columns['bytes'][i])), 'lt': str(columns['latency'][i])}
+        for name, key in [('connect', 'ct'), ('sentBytes', 'sby'), ('idleTime', 'it')]:
+            if columns[name][i] >= 0:
+                values[key] = str(int(columns[name][i]))
+        url = self.getText('url', i)
+        if url != None:
+            values['url'] = url
+        if columns['ng'][i] >= 0:
+            return Sample2(ng=str(columns['ng'][i]), na=str(columns['na'][i]), **values)
+        return Sample(**values)
+
+class JtlQuarantine(object):
+    modes = ["lenient", "strict"]
+    mode = "lenient"
+    enabled = True
+
+    def __init__(self, logPath):
+        self.logPath = logPath
+        self.quarantinePath = logPath + ".quarantine"
+        self.quarantineFile = None
+        self.count = 0
+        if os.path.isfile(self.quarantinePath):
+            try:
+                os.remove(self.quarantinePath)
+            except OSError:
+                print("ERROR, old quarantine file " + self.quarantinePath + " couldn't be removed")
+
+    @classmethod
+    def getCacheKey(self):
+        return JtlQuarantine.mode
+
+    def add(self, line, reason, content):
+        if JtlQuarantine.mode == "strict":
+            raise JMeterLibException("Malformed line %s of %s: %s" % (line, self.logPath, reason))
+        self.count += 1
+        if not JtlQuarantine.enabled:
+            return
+        if self.quarantineFile == None:
+            self.quarantineFile = open(self.quarantinePath, "wb")
+            self.quarantineFile.write(b"line\treason\tcontent\n")
+        entry = "%s\t%s\t%s\n" % (line, reason, content.replace("\r", " ").replace("\n", " "))
+        if isinstance(entry, unicode):
+            entry = entry.encode("utf-8")
+        self.quarantineFile.write(entry)
+
+    def addRow(self, line, reason, row):
+        self.add(line, reason, ",".join("\"" + v.replace("\"", "\"\"") + "\"" if "," in v or "\"" in v else v for v in row))
+
+    def close(self):
+        if self.quarantineFile != None:
+            self.quarantineFile.close()
+            self.quarantineFile = None
+        if self.count > 0:
+            destination = self.quarantinePath if JtlQuarantine.enabled else "quarantine file is disabled"
+            print("ERROR, %d malformed rows of %s were skipped (%s)" % (self.count, self.logPath, destination))
+
 class Sample(object):
     def __init__(self, **values):
         self.assertions = []
+        self.connect = None
+        self.sentBytes = None
+        self.idleTime = None
+        self.url = None
         if 'ts' in values:
             self.setStartTime(values['ts'])
         if 't' in values:
@@ -561,6 +2480,14 @@ class Sample(object):
             self.setBytes(values['by'])
         if 'lt' in values:
             self.setLatency(values['lt'])
+        if 'ct' in values and values['ct'] != "":
+            self.setConnect(values['ct'])
+        if 'sby' in values and values['sby'] != "":
+            self.setSentBytes(values['sby'])
+        if 'it' in values and values['it'] != "":
+            self.setIdleTime(values['it'])
+        if 'url' in values:
+            self.setUrl(values['url'])
 
     def setStartTime(self, ts):
         self.startTime = ts
@@ -622,6 +2549,36 @@ class Sample(object):
     def getLatency(self):
         return self.latency
 
+    def setConnect(self, ct):
+        self.connect = ct
+
+    def getConnect(self):
+        return self.connect
+
+    def setSentBytes(self, sby):
+        self.sentBytes = sby
+
+    def getSentBytes(self):
+        return self.sentBytes
+
+    def setIdleTime(self, it):
+        self.idleTime = it
+
+    def getIdleTime(self):
+        return self.idleTime
+
+    def setUrl(self, url):
+        self.url = url
+
+    def getUrl(self):
+        return self.url
+
+    def getNg(self):
+        return None
+
+    def getNa(self):
+        return None
+
     def addAssertion(self, a):
         self.assertions.append(a)
 
@@ -639,9 +2596,15 @@ class Sample2(Sample):
     def setNg(self, Ng):
         self.ng = Ng
 
+    def getNg(self):
+        return self.ng
+
     def setNa(self, Na):
         self.na = Na
 
+    def getNa(self):
+        return self.na
+
 class Assertion(object):
     def __init__(self, **values):
         if 'name' in values:
@@ -696,6 +2659,7 @@ class AggregatedSummary(object):
         self.averageTime = 0
         self.minTime = None
         self.maxTime = 0
+        self.malformedRows = 0
 
     def convertToDictionary(self):
         aggrSumDict = {}
@@ -707,6 +2671,7 @@ class AggregatedSummary(object):
         aggrSumDict['averageTime'] = self.averageTime
         aggrSumDict['minTime'] = self.minTime
         aggrSumDict['maxTime'] = self.maxTime
+        aggrSumDict['malformedRows'] = self.malformedRows
         return aggrSumDict
 
     def addSample(self):
@@ -791,6 +2756,19 @@ class AggregatedSummary(object):
     def getMaxTime(self):
         return self.maxTime
 
+    def mergeFrom(self, other):
+        #both objects contain accumulated counters, statistics are calculated after merging
+        self.samples += other.samples
+        self.assertions += other.assertions
+        self.samplesSuccessRateNoAssert += other.samplesSuccessRateNoAssert
+        self.samplesSuccessRateInclAssert += other.samplesSuccessRateInclAssert
+        self.assertionPassRate += other.assertionPassRate
+        self.averageTime += other.averageTime
+        if other.minTime != None:
+            self.addMinTime(other.minTime)
+        self.addMaxTime(other.maxTime)
+        self.malformedRows += other.malformedRows
+
 class AggregatedSamples(AggregatedSummary):
     def __init__(self, name, Id=-1):
         super(AggregatedSamples,self).__init__()
@@ -801,6 +2779,8 @@ class AggregatedSamples(AggregatedSummary):
         self.startTime = None
         self.endTime = None
         self.totalTime = None
+        self.startMs = None
+        self.endMs = None
         self.throughput = 0
         self.averageBytes = 0
         self.bytesPerSec = 0
@@ -808,7 +2788,29 @@ class AggregatedSamples(AggregatedSummary):
         self.median = 0
         self.stddev = 0
         self.percentil90 = 0
+        self.percentiles = collections.OrderedDict()
         self.timeTable = []
+        self.timeCounts = None
+        self.timeSum = 0
+        self.bytesSum = 0
+        self.exactPercentiles = None
+        self.errorCount = 0
+        self.errorCountInclAssert = 0
+        self.latencyHistogram = LatencyHistogram()
+        self.latencySum = 0
+        self.connectHistogram = LatencyHistogram()
+        self.connectSum = 0
+        self.sentBytesSum = 0
+        self.sentBytesCount = 0
+        self.idleTimeSum = 0
+        self.idleTimeCount = 0
+        self.averageLatency = 0
+        self.latencyPercentil90 = 0
+        self.averageConnect = None
+        self.connectPercentil90 = None
+        self.sentKBytesPerSec = None
+        self.averageIdleTime = None
+        self.maxActiveThreads = None
 
     def convertToDictionary(self):
         aggrSamplDict = {}
@@ -827,7 +2829,20 @@ class AggregatedSamples(AggregatedSummary):
         aggrSamplDict['median'] = self.median
         aggrSamplDict['stddev'] = self.stddev
         aggrSamplDict['percentil90'] = self.percentil90
-        aggrSamplDict['timeTable'] = self.timeTable
+        aggrSamplDict['percentiles'] = dict(self.percentiles)
+        if self.timeCounts == None:
+            aggrSamplDict['timeTable'] = self.timeTable
+        else:
+            aggrSamplDict['timeTable'] = sorted(self.timeCounts.elements())
+        aggrSamplDict['errorCount'] = self.errorCount
+        aggrSamplDict['errorCountInclAssert'] = self.errorCountInclAssert
+        aggrSamplDict['averageLatency'] = self.averageLatency
+        aggrSamplDict['latencyPercentil90'] = self.latencyPercentil90
+        aggrSamplDict['averageConnect'] = self.averageConnect
+        aggrSamplDict['connectPercentil90'] = self.connectPercentil90
+        aggrSamplDict['sentKBytesPerSec'] = self.sentKBytesPerSec
+        aggrSamplDict['averageIdleTime'] = self.averageIdleTime
+        aggrSamplDict['maxActiveThreads'] = self.maxActiveThreads
         return aggrSamplDict
 
     def makeLink(self, which):
@@ -847,6 +2862,18 @@ class AggregatedSamples(AggregatedSummary):
     def getSampleErrorNoAssert(self):
         return self.samplesErrorNoAssert
 
+    def addError(self):
+        self.errorCount += 1
+
+    def getErrorCount(self):
+        return self.errorCount
+
+    def addErrorInclAssert(self):
+        self.errorCountInclAssert += 1
+
+    def getErrorCountInclAssert(self):
+        return self.errorCountInclAssert
+
     def calculateSampleSuccessRateInclAssert(self):
         if self.samples > 0:
             self.samplesSuccessRateInclAssert = self.samplesSuccessRateInclAssert*100 / self.samples
@@ -859,6 +2886,7 @@ class AggregatedSamples(AggregatedSummary):
         return self.samplesErrorInclAssert
 
     def setStartTime(self, t):
+        self.startMs = int(t)
         self.startTime = datetime.datetime.fromtimestamp(int(t) / 1e3)
 
     def getStartTime(self):
@@ -867,6 +2895,8 @@ class AggregatedSamples(AggregatedSummary):
     def setEndTime(self, t, p):
         start = int(t)
         duration = int(p)
+        if self.endMs == None or start + duration > self.endMs:
+            self.endMs = start + duration
         if self.endTime == None:
             self.endTime = datetime.datetime.fromtimestamp(start / 1e3)
             timeDiff = self.endTime - self.startTime
@@ -887,10 +2917,17 @@ class AggregatedSamples(AggregatedSummary):
     def getThroughput(self):
         return self.throughput
 
+    def getDurationSeconds(self):
+        #totalTime of summary is truncated to whole seconds of the last sample in Python 2
+        if self.startMs == None or self.endMs == None:
+            return 0.0
+        return (self.endMs - self.startMs) / 1000.0
+
     def addAverageBytes(self, b):
         if isinstance(b, str) or isinstance(b, unicode):
             b = int(b)
         self.averageBytes = self.averageBytes + b
+        self.bytesSum += b
         self.addBytesPerSec(b)
 
     def calculateAverageBytes(self):
@@ -915,44 +2952,84 @@ class AggregatedSamples(AggregatedSummary):
     def getKBytesPerSec(self):
         return self.kBytesPerSec
 
+    def addExtendedFields(self, s):
+        latency = int(s.getLatency())
+        self.latencySum += latency
+        self.latencyHistogram.add(latency)
+        if s.getConnect() != None:
+            connect = int(s.getConnect())
+            self.connectSum += connect
+            self.connectHistogram.add(connect)
+        if s.getSentBytes() != None:
+            self.sentBytesSum += int(s.getSentBytes())
+            self.sentBytesCount += 1
+        if s.getIdleTime() != None:
+            self.idleTimeSum += int(s.getIdleTime())
+            self.idleTimeCount += 1
+        if s.getNa() != None:
+            activeThreads = int(s.getNa())
+            if self.maxActiveThreads == None or activeThreads > self.maxActiveThreads:
+                self.maxActiveThreads = activeThreads
+
+    def calculateExtendedFields(self):
+        if self.latencyHistogram.count > 0:
+            self.averageLatency = "%.2f" % (float(self.latencySum) / self.latencyHistogram.count)
+            self.latencyPercentil90 = self.latencyHistogram.getPercentile(90)
+        if self.connectHistogram.count > 0:
+            self.averageConnect = "%.2f" % (float(self.connectSum) / self.connectHistogram.count)
+            self.connectPercentil90 = self.connectHistogram.getPercentile(90)
+        if self.sentBytesCount > 0 and self.totalTime > 0:
+            self.sentKBytesPerSec = "%.1f" % (self.sentBytesSum / self.totalTime / 1000)
+        if self.idleTimeCount > 0:
+            self.averageIdleTime = "%.2f" % (float(self.idleTimeSum) / self.idleTimeCount)
+
+    def getAverageLatency(self):
+        return self.averageLatency
+
+    def getLatencyPerc90(self):
+        return self.latencyPercentil90
+
+    def getAverageConnect(self):
+        return self.averageConnect
+
+    def getConnectPerc90(self):
+        return self.connectPercentil90
+
+    def getSentKBytesPerSec(self):
+        return self.sentKBytesPerSec
+
+    def getAverageIdleTime(self):
+        return self.averageIdleTime
+
+    def getMaxActiveThreads(self):
+        return self.maxActiveThreads
+
+    def getExactPercentiles(self, mode=None):
+        if self.timeCounts != None:
+            if self.exactPercentiles == None:
+                self.exactPercentiles = ExactPercentiles(self.timeCounts)
+        elif self.exactPercentiles == None or self.exactPercentiles.count != len(self.timeTable):
+            self.exactPercentiles = ExactPercentiles(self.timeTable)
+        if mode == "dashboard" and self.exactPercentiles.count > ExactPercentiles.dashboardWindow:
+            #JMeter HTML dashboard keeps only sliding window of the last samples
+            return ExactPercentiles(self.timeTable[-ExactPercentiles.dashboardWindow:])
+        return self.exactPercentiles
+
     def calculatePercentils(self):
-        medianSample = 0
-        perc90Sample = 0
-        sortedSamples = sorted(self.timeTable)
-        if self.samples%2 == 0:
-            medianSample = self.samples / 2
-            medianSample = int(medianSample)
-            if len(sortedSamples) > medianSample and (medianSample-1) >= 0:
-                self.median = (sortedSamples[medianSample] + sortedSamples[medianSample-1]) / 2
-                self.median = int(self.median)
+        exact = self.getExactPercentiles(ExactPercentiles.mode)
+        if ExactPercentiles.mode == "legacy":
+            self.median = exact.getLegacyMedian()
+            self.percentil90 = exact.getLegacyPerc90()
         else:
-            if self.samples > 1:
-                medianSample = (self.samples // 2)
-                medianSample = int(medianSample)
-            elif self.samples == 1:
-                medianSample = 0
-            if len(sortedSamples) > medianSample:
-                self.median = sortedSamples[medianSample]
-                self.median = int(self.median)
-                self.median = sortedSamples[medianSample]
-        perc90Sample = round((0.9*self.samples) + 0.5)
-        perc90Sample = int(perc90Sample)
-        if len(sortedSamples) == perc90Sample:
-            perc90Sample = perc90Sample - 1
-        if len(sortedSamples) > perc90Sample:
-            self.percentil90 = sortedSamples[perc90Sample]
+            self.median, self.percentil90 = exact.getPercentiles([50, 90], ExactPercentiles.mode).values()
+        self.percentiles = exact.getPercentiles(ExactPercentiles.percents, ExactPercentiles.mode)
 
     def getMedian(self):
         return self.median
 
     def calculateStdDev(self):
-        squares = 0
-        sortedSamples = sorted(self.timeTable)
-        for s in sortedSamples:
-            squares = squares + ((s-float(self.averageTime)) ** 2)
-        self.stddev = math.sqrt(squares / self.samples)
-        if type(self.stddev) == float:
-            self.stddev = "%.1f" % self.stddev
+        if self.samples > 0:
+            self.stddev = "%.1f" % self.getExactPercentiles().getStdDev(float(self.averageTime))
 
     def getStdDev(self):
         return self.stddev
@@ -960,16 +3037,817 @@ class AggregatedSamples(AggregatedSummary):
     def getPerc90(self):
         return self.percentil90
 
+    def getPercentiles(self, percents=None, mode=None):
+        if percents == None and mode == None:
+            return self.percentiles
+        percents = ExactPercentiles.percents if percents == None else percents
+        mode = ExactPercentiles.mode if mode == None else mode
+        return self.getExactPercentiles(mode).getPercentiles(percents, mode)
+
+    def getPercentile(self, percent):
+        if ExactPercentiles.mode == "dashboard":
+            return self.getExactPercentiles("dashboard").getDashboardPercentile(percent)
+        return self.getExactPercentiles().getPercentPoint(percent)
+
     def addTime(self, t):
-        self.timeTable.append(int(t))
+        t = int(t)
+        self.timeTable.append(t)
+        self.timeSum += t
+
+    def countTimes(self):
+        #results of worker processes are pickled, response times are sent as counts of values,
+        #only the last samples are kept in timeTable for percentiles of dashboard mode
+        self.timeCounts = collections.Counter(self.timeTable)
+        self.timeTable = self.timeTable[-ExactPercentiles.dashboardWindow:]
+        self.exactPercentiles = None
+
+    def getTimeCounts(self):
+        if self.timeCounts == None:
+            return collections.Counter(self.timeTable)
+        return self.timeCounts
+
+    def mergeFrom(self, other):
+        super(AggregatedSamples, self).mergeFrom(other)
+        if other.startTime != None:
+            otherEnd = other.startTime + datetime.timedelta(seconds=other.totalTime)
+            if self.startTime == None:
+                self.startTime, self.endTime, self.totalTime = other.startTime, other.endTime, other.totalTime
+            else:
+                end = self.startTime + datetime.timedelta(seconds=self.totalTime)
+                if otherEnd > end:
+                    end = otherEnd
+                    self.endTime = other.endTime
+                self.startTime = min(self.startTime, other.startTime)
+                self.totalTime = (end - self.startTime).total_seconds()
+            self.startMs = other.startMs if self.startMs == None else min(self.startMs, other.startMs)
+            self.endMs = other.endMs if self.endMs == None else max(self.endMs, other.endMs)
+        self.averageBytes += other.averageBytes
+        self.bytesPerSec += other.bytesPerSec
+        if self.timeCounts == None and other.timeCounts == None:
+            self.timeTable.extend(other.timeTable)
+        else:
+            self.timeCounts = self.getTimeCounts()
+            self.timeCounts.update(other.getTimeCounts())
+            self.timeTable = (self.timeTable + other.timeTable)[-ExactPercentiles.dashboardWindow:]
+            self.exactPercentiles = None
+        self.timeSum += other.timeSum
+        self.bytesSum += other.bytesSum
+        self.errorCount += other.errorCount
+        self.errorCountInclAssert += other.errorCountInclAssert
+        self.latencyHistogram.merge(other.latencyHistogram)
+        self.latencySum += other.latencySum
+        self.connectHistogram.merge(other.connectHistogram)
+        self.connectSum += other.connectSum
+        self.sentBytesSum += other.sentBytesSum
+        self.sentBytesCount += other.sentBytesCount
+        self.idleTimeSum += other.idleTimeSum
+        self.idleTimeCount += other.idleTimeCount
+        if other.maxActiveThreads != None and (self.maxActiveThreads == None or other.maxActiveThreads > self.maxActiveThreads):
+            self.maxActiveThreads = other.maxActiveThreads
+
+class AggregatedBreakdown(object):
+    def __init__(self, name, threadGroup=None):
+        self.name = name
+        self.threadGroup = threadGroup
+        self.samples = 0
+        self.errors = 0
+        self.timeSum = 0
+        self.minTime = None
+        self.maxTime = None
+        self.firstStart = None
+        self.lastEnd = None
+        self.histogram = LatencyHistogram()
+        self.threads = set()
+        self.result = None
+
+    def addSample(self, threadName, start, sampleTime, success):
+        self.samples += 1
+        self.timeSum += sampleTime
+        self.histogram.add(sampleTime)
+        if self.minTime == None or sampleTime < self.minTime:
+            self.minTime = sampleTime
+        if self.maxTime == None or sampleTime > self.maxTime:
+            self.maxTime = sampleTime
+        if self.firstStart == None or start < self.firstStart:
+            self.firstStart = start
+        if self.lastEnd == None or start + sampleTime > self.lastEnd:
+            self.lastEnd = start + sampleTime
+        if not success:
+            self.errors += 1
+        if self.threadGroup == None:
+            self.threads.add(threadName)
+
+    def mergeFrom(self, other):
+        self.samples += other.samples
+        self.errors += other.errors
+        self.timeSum += other.timeSum
+        self.histogram.merge(other.histogram)
+        self.threads.update(other.threads)
+        for attribute, better in [('minTime', min), ('maxTime', max), ('firstStart', min), ('lastEnd', max)]:
+            value = getattr(other, attribute)
+            if value != None:
+                setattr(self, attribute, value if getattr(self, attribute) == None else better(getattr(self, attribute), value))
+
+    def calculate(self):
+        self.result = {'name': self.name, 'samples': self.samples, 'errors': self.errors,
+                       'errorRate': "%.2f" % (self.errors * 100.0 / self.samples),
+                       'averageTime': "%.2f" % (float(self.timeSum) / self.samples),
+                       'minTime': self.minTime, 'maxTime': self.maxTime,
+                       'median': self.histogram.getPercentile(50),
+                       'percentil90': self.histogram.getPercentile(90), 'throughput': 0}
+        if self.lastEnd > self.firstStart:
+            self.result['throughput'] = "%.2f" % (self.samples * 1000.0 / (self.lastEnd - self.firstStart))
+        if self.threadGroup == None:
+            self.result['threads'] = len(self.threads)
+        else:
+            self.result['threadGroup'] = self.threadGroup
+
+    def convertToDictionary(self):
+        return self.result
+
+class ThreadBreakdown(object):
+    enabled = False
+    threadNumberPattern = re.compile(r"^(.+)-\d+$")
+
+    def __init__(self):
+        self.threadGroups = collections.OrderedDict()
+        self.threads = collections.OrderedDict()
+        self.groupNames = {}
+
+    def getThreadGroupName(self, threadName):
+        groupName = self.groupNames.get(threadName)
+        if groupName == None:
+            match = self.threadNumberPattern.match(threadName)
+            if match != None:
+                groupName = match.group(1)
+            else:
+                groupName = threadName
+            self.groupNames[threadName] = groupName
+        return groupName
+
+    def addSample(self, s):
+        self.addValues(s.getThreadName(), int(s.getStartTime()), int(s.getSampleTime()), s.getStatus() == "true")
+
+    def addValues(self, threadName, start, sampleTime, success):
+        groupName = self.getThreadGroupName(threadName)
+        group = self.threadGroups.get(groupName)
+        if group == None:
+            group = self.threadGroups[groupName] = AggregatedBreakdown(groupName)
+        thread = self.threads.get(threadName)
+        if thread == None:
+            thread = self.threads[threadName] = AggregatedBreakdown(threadName, groupName)
+        group.addSample(threadName, start, sampleTime, success)
+        thread.addSample(threadName, start, sampleTime, success)
+
+    def mergeFrom(self, other):
+        for name, agg in other.threadGroups.items():
+            if name not in self.threadGroups:
+                self.threadGroups[name] = AggregatedBreakdown(name)
+            self.threadGroups[name].mergeFrom(agg)
+        for name, agg in other.threads.items():
+            if name not in self.threads:
+                self.threads[name] = AggregatedBreakdown(name, agg.threadGroup)
+            self.threads[name].mergeFrom(agg)
+
+    def calculate(self):
+        for agg in list(self.threadGroups.values()) + list(self.threads.values()):
+            agg.calculate()
+
+    def convertToDictionary(self):
+        return {'threadGroups': [agg.convertToDictionary() for agg in self.threadGroups.values()],
+                'threads': [agg.convertToDictionary() for agg in self.threads.values()]}
+
+class SpaceSavingCounter(object):
+    def __init__(self, capacity=100):
+        self.capacity = max(1, capacity)
+        self.counts = {}
+        self.errors = {}
+        self.buckets = {}
+        self.minCount = 0
+
+    def add(self, key):
+        count = self.counts.get(key)
+        if count != None:
+            self.moveToBucket(key, count, count + 1)
+            return
+        if len(self.counts) < self.capacity:
+            self.errors[key] = 0
+            self.moveToBucket(key, None, 1)
+            self.minCount = 1
+            return
+        evicted = self.buckets[self.minCount].pop()
+        if len(self.buckets[self.minCount]) == 0:
+            del self.buckets[self.minCount]
+        del self.counts[evicted]
+        del self.errors[evicted]
+        self.errors[key] = self.minCount
+        self.moveToBucket(key, None, self.minCount + 1)
+        if self.minCount not in self.buckets:
+            self.minCount += 1
+
+    def moveToBucket(self, key, oldCount, newCount):
+        if oldCount != None:
+            bucket = self.buckets[oldCount]
+            bucket.discard(key)
+            if len(bucket) == 0:
+                del self.buckets[oldCount]
+                if oldCount == self.minCount:
+                    self.minCount = newCount
+        self.buckets.setdefault(newCount, set()).add(key)
+        self.counts[key] = newCount
+
+    def getTop(self, n):
+        top = sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))[:n]
+        return [(key, count, self.errors[key]) for key, count in top]
+
+class FailureAnalyser(object):
+    def __init__(self, topN=10, capacity=100):
+        self.topN = max(1, topN)
+        self.capacity = max(self.topN, capacity)
+        self.labels = collections.OrderedDict()
+        self.total = self.createLabelCounters()
+
+    def analyse(self, samples):
+        for s in samples:
+            self.addSample(s)
+        return self.getResults()
+
+    def addSample(self, s):
+        #samples can be added one by one while log file is parsed (sampleConsumer of LogAnalyser)
+        counters = self.labels.get(s.getLabel())
+        if counters == None:
+            counters = self.labels[s.getLabel()] = self.createLabelCounters()
+        failed = s.getStatus() != "true"
+        for c in [counters, self.total]:
+            c['samples'] += 1
+            c['responseCodes'][s.getRespCode()] = c['responseCodes'].get(s.getRespCode(), 0) + 1
+            if failed:
+                c['failures'] += 1
+                c['messages'].add((s.getRespCode(), s.getRespMsg()))
+        for a in s.getAssertions():
+            if a.getFailure() == "True" or a.getError() == "True":
+                counters['assertions'].add((a.getName(), a.getFailureMsg()))
+                self.total['assertions'].add((a.getName(), a.getFailureMsg()))
+
+    def getResults(self):
+        results = [self.convertToDictionary(label, c) for label, c in self.labels.items()]
+        results.append(self.convertToDictionary("TOTAL", self.total))
+        return results
+
+    def createLabelCounters(self):
+        return {'samples': 0, 'failures': 0, 'responseCodes': {},
+                'messages': SpaceSavingCounter(self.capacity), 'assertions': SpaceSavingCounter(self.capacity)}
+
+    def convertToDictionary(self, label, counters):
+        responseCodes = []
+        for code, count in sorted(counters['responseCodes'].items(), key=lambda item: (-item[1], item[0])):
+            responseCodes.append({'responseCode': code, 'count': count,
+                                  'percent': "%.2f" % (count * 100.0 / counters['samples'])})
+        topFailureMessages = []
+        for (code, message), count, error in counters['messages'].getTop(self.topN):
+            topFailureMessages.append({'responseCode': code, 'message': message, 'count': count,
+                                       'maxOverestimate': error})
+        topAssertionFailures = []
+        for (name, message), count, error in counters['assertions'].getTop(self.topN):
+            topAssertionFailures.append({'assertion': name, 'message': message, 'count': count,
+                                         'maxOverestimate': error})
+        return {'label': label, 'samples': counters['samples'], 'failures': counters['failures'],
+                'responseCodes': responseCodes, 'topFailureMessages': topFailureMessages,
+                'topAssertionFailures': topAssertionFailures}
+
+class SlaThreshold(object):
+    metrics = ['samples', 'average', 'min', 'max', 'median', 'percentil90', 'stddev', 'errorRate',
+               'errorRateInclAssert', 'errors', 'errorsInclAssert', 'throughput', 'kbPerSec']
+    operators = {'<': lambda a, b: a < b, '<=': lambda a, b: a <= b, '>': lambda a, b: a > b,
+                 '>=': lambda a, b: a >= b, '==': lambda a, b: a == b}
+    #values of summary are formatted for reports (and truncated by integer division in Python 2),
+    #so metrics are calculated from counters of aggregated samples in float arithmetic
+    getters = {'samples': lambda agg: agg.samples,
+               'average': lambda agg: float(agg.timeSum) / agg.samples,
+               'min': lambda agg: agg.minTime,
+               'max': lambda agg: agg.maxTime,
+               'median': lambda agg: agg.getMedian(),
+               'percentil90': lambda agg: agg.getPerc90(),
+               'stddev': lambda agg: agg.getExactPercentiles().getStdDev(float(agg.timeSum) / agg.samples),
+               'errorRate': lambda agg: agg.errorCount * 100.0 / agg.samples,
+               'errorRateInclAssert': lambda agg: agg.errorCountInclAssert * 100.0 / agg.samples,
+               'errors': lambda agg: agg.errorCount,
+               'errorsInclAssert': lambda agg: agg.errorCountInclAssert,
+               'throughput': lambda agg: agg.samples / agg.getDurationSeconds() if agg.getDurationSeconds() > 0 else 0.0,
+               'kbPerSec': lambda agg: agg.bytesSum / agg.getDurationSeconds() / 1000.0 if agg.getDurationSeconds() > 0 else 0.0}
+
+    def __init__(self, spec):
+        self.spec = spec.strip()
+        match = re.match(r"^(.+?)\s+(\w+(?:\.\d+)?)\s*(<=|>=|==|<|>)\s*(-?[\d.]+)\s*(ms|%|/s|/sec)?$", self.spec)
+        if match == None:
+            raise JMeterLibException("Incorrect threshold \"%s\", expected format: <label> <metric> <operator> <value>" % self.spec)
+        self.label, self.metric, self.operator, limit = match.group(1, 2, 3, 4)
+        self.limit = float(limit)
+        if self.metric not in self.metrics and re.match(r"^p\d+(\.\d+)?$", self.metric) == None:
+            raise JMeterLibException("Unknown metric %s in threshold \"%s\"" % (self.metric, self.spec))
+        #getter is resolved once, getValue is called for every sample when failFast is used
+        if self.metric in self.metrics:
+            self.getter = self.getters[self.metric]
+        else:
+            percent = float(self.metric[1:])
+            self.getter = lambda agg: agg.getPercentile(percent)
+
+    def matchesLabel(self, label):
+        if self.label == "*":
+            return label != "TOTAL"
+        return self.label == label
+
+    def getValue(self, agg):
+        return float(self.getter(agg))
+
+    def check(self, value):
+        return self.operators[self.operator](value, self.limit)
+
+    def canFailEarly(self):
+        if self.metric in ['samples', 'max', 'errors', 'errorsInclAssert']:
+            return self.operator in ['<', '<=']
+        if self.metric == 'min':
+            return self.operator in ['>', '>=']
+        return False
+
+class SlaEvaluator(object):
+    def __init__(self, thresholds):
+        if isinstance(thresholds, str) or isinstance(thresholds, unicode):
+            thresholds = thresholds.split(";")
+        self.thresholds = [SlaThreshold(t) for t in thresholds if t.strip() != ""]
+        self.earlyThresholds = [t for t in self.thresholds if t.canFailEarly()]
+        self.failedEarly = None
+
+    def isCertainFailure(self, labelAgg, totalAgg):
+        for t in self.earlyThresholds:
+            for agg in [labelAgg, totalAgg]:
+                if t.matchesLabel(agg.sampleName) and agg.getAmountOfSamples() > 0 and not t.check(t.getValue(agg)):
+                    self.failedEarly = t.spec
+                    return True
+        return False
+
+    def evaluate(self, aggrSamples, aborted=False):
+        results = []
+        for t in self.thresholds:
+            matched = False
+            for agg in aggrSamples:
+                if t.matchesLabel(agg.sampleName):
+                    matched = True
+                    value = t.getValue(agg)
+                    results.append({'threshold': t.spec, 'label': agg.sampleName, 'metric': t.metric,
+                                    'operator': t.operator, 'limit': t.limit, 'value': value,
+                                    'passed': t.check(value)})
+            if not matched:
+                results.append({'threshold': t.spec, 'label': t.label, 'metric': t.metric,
+                                'operator': t.operator, 'limit': t.limit, 'value': None, 'passed': False})
+        passed = not aborted and all(r['passed'] for r in results)
+        return {'passed': passed, 'aborted': aborted, 'failedEarly': self.failedEarly, 'results': results}
+
+class LatencyHistogram(object):
+    exactLimit = 1000
+    growthFactor = 1.005
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+
+    @classmethod
+    def fromValues(cls, values):
+        histogram = cls()
+        for v in values:
+            histogram.add(v)
+        return histogram
+
+    def getBucket(self, value):
+        if value <= self.exactLimit:
+            return int(value)
+        return self.exactLimit + 1 + int(math.log(float(value) / self.exactLimit) / math.log(self.growthFactor))
+
+    def getBucketValue(self, bucket):
+        if bucket <= self.exactLimit:
+            return bucket
+        return int(round(self.exactLimit * (self.growthFactor ** (bucket - self.exactLimit - 0.5))))
+
+    def add(self, value, count=1):
+        bucket = self.getBucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += count
+
+    def merge(self, other):
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+
+    def getPercentile(self, percent):
+        if self.count == 0:
+            return 0
+        buckets = sorted(self.counts.keys())
+        if percent >= 100:
+            return self.getBucketValue(buckets[-1])
+        target = int(math.floor(self.count * percent / 100.0 + 0.5))
+        for bucket in buckets:
+            target -= self.counts[bucket]
+            if target <= 0:
+                return self.getBucketValue(bucket)
+        return self.getBucketValue(buckets[-1])
+
+    def mannWhitney(self, other):
+        if self.count == 0 or other.count == 0:
+            return None, 1.0
+        u = 0.0
+        otherBelow = 0
+        ties = 0.0
+        for bucket in sorted(set(self.counts.keys()) | set(other.counts.keys())):
+            selfCount = self.counts.get(bucket, 0)
+            otherCount = other.counts.get(bucket, 0)
+            u += selfCount * (otherBelow + 0.5 * otherCount)
+            otherBelow += otherCount
+            tied = selfCount + otherCount
+            ties += tied ** 3 - tied
+        n = float(self.count + other.count)
+        mean = self.count * other.count / 2.0
+        variance = self.count * other.count / 12.0 * ((n + 1) - ties / (n * (n - 1))) if n > 1 else 0
+        if variance <= 0:
+            return u, 1.0
+        z = (abs(u - mean) - 0.5) / math.sqrt(variance)
+        return u, min(1.0, math.erfc(max(z, 0) / math.sqrt(2)))
+
+class ExactPercentiles(object):
+    modes = ["legacy", "jmeter", "dashboard"]
+    mode = "legacy"
+    percents = [50, 75, 90, 95, 99, 99.9]
+    dashboardWindow = 20000
+
+    def __init__(self, values):
+        #counting sort, response times are integer milliseconds with many repeated values,
+        #values may be already counted in a Counter
+        self.counts = collections.Counter(values)
+        self.values = sorted(self.counts.keys())
+        self.cumulative = []
+        self.count = 0
+        for v in self.values:
+            self.count += self.counts[v]
+            self.cumulative.append(self.count)
+
+    @classmethod
+    def getCacheKey(self):
+        return (ExactPercentiles.mode, tuple(ExactPercentiles.percents))
+
+    @classmethod
+    def getPercentName(self, percent):
+        return "p" + ("%g" % percent)
+
+    @classmethod
+    def parsePercents(self, percents):
+        if not isinstance(percents, list):
+            percents = [p for p in str(percents).replace(";", ",").split(",") if p.strip() != ""]
+        try:
+            percents = [float(p) for p in percents]
+        except ValueError:
+            raise JMeterLibException("Incorrect list of percents %s" % str(percents))
+        for p in percents:
+            if p <= 0 or p > 100:
+                raise JMeterLibException("Percent %s is out of range (0, 100>" % p)
+        return [int(p) if p == int(p) else p for p in percents]
+
+    @classmethod
+    def parseMode(self, mode):
+        mode = str(mode).lower()
+        if mode not in ExactPercentiles.modes:
+            raise JMeterLibException("Unknown percentile mode %s, use one of %s" % (mode, ", ".join(ExactPercentiles.modes)))
+        return mode
+
+    def getValueAtRank(self, rank):
+        #rank is index in sorted list of values
+        return self.values[bisect.bisect_right(self.cumulative, rank)]
+
+    def getPercentPoint(self, percent):
+        #the same definition as StatCalculator.getPercentPoint of JMeter Aggregate Report
+        if self.count == 0:
+            return 0
+        if percent >= 100:
+            return self.values[-1]
+        target = int(math.floor(self.count * (percent / 100.0) + 0.5))
+        return self.getValueAtRank(max(0, target - 1))
+
+    def getDashboardPercentile(self, percent):
+        #the same definition as commons-math Percentile (LEGACY estimation) of JMeter HTML dashboard
+        if self.count == 0:
+            return 0
+        position = percent * (self.count + 1) / 100.0
+        if position < 1:
+            return self.values[0]
+        if position >= self.count:
+            return self.values[-1]
+        lower = self.getValueAtRank(int(position) - 1)
+        upper = self.getValueAtRank(int(position))
+        return round(lower + (position - int(position)) * (upper - lower), 2)
+
+    def getPercentiles(self, percents, mode):
+        if mode == "dashboard":
+            getter = self.getDashboardPercentile
+        else:
+            getter = self.getPercentPoint
+        return collections.OrderedDict((self.getPercentName(p), getter(p)) for p in percents)
+
+    def getLegacyMedian(self):
+        if self.count == 0:
+            return 0
+        if self.count % 2 == 0:
+            return int((self.getValueAtRank(self.count // 2) + self.getValueAtRank(self.count // 2 - 1)) / 2)
+        return self.getValueAtRank(self.count // 2)
+
+    def getLegacyPerc90(self):
+        perc90Sample = int(round((0.9 * self.count) + 0.5))
+        if self.count == perc90Sample:
+            perc90Sample = perc90Sample - 1
+        if self.count > perc90Sample:
+            return self.getValueAtRank(perc90Sample)
+        return 0
+
+    def getStdDev(self, mean):
+        squares = 0.0
+        for v in self.values:
+            squares += self.counts[v] * ((v - mean) ** 2)
+        return math.sqrt(squares / self.count)
+
+class RunComparator(object):
+    percentiles = [50, 90, 95, 99]
+
+    def __init__(self, alpha=0.05, minDegradation=5.0):
+        self.alpha = alpha
+        self.minDegradation = minDegradation
+
+    def getRunStatistics(self, run, dbPath=None):
+        if dbPath != None and dbPath != "":
+            return self.getDbRunStatistics(dbPath, int(run))
+        if not isinstance(run, LogAnalysisInitiator):
+            if str(run).endswith(".sql"):
+                return self.getDbRunStatistics(run, None)
+            return self.getLogRunStatistics(run)
+        statistics = {}
+        for agg in run.aggrSamples:
+            statistics[agg.sampleName] = {'histogram': LatencyHistogram.fromValues(agg.timeTable),
+                                          'throughput': float(agg.getThroughput())}
+        return statistics
+
+    def getLogRunStatistics(self, logPath):
+        #samples are added to histograms while log file is parsed, so they are not kept in memory,
+        #AggregatedSamples objects only count samples and time span for throughput
+        analyser = LogAnalysisInitiator.createAnalyserObject(logPath)
+        runs = collections.OrderedDict()
+        total = (AggregatedSamples("TOTAL"), LatencyHistogram())
+        def addSample(s):
+            label = s.getLabel()
+            if label not in runs:
+                runs[label] = (AggregatedSamples(label), LatencyHistogram())
+                runs[label][0].setStartTime(s.getStartTime())
+            if total[0].getStartTime() == None:
+                total[0].setStartTime(s.getStartTime())
+            for agg, histogram in [runs[label], total]:
+                agg.addSample()
+                agg.setEndTime(s.getStartTime(), s.getSampleTime())
+                histogram.add(int(s.getSampleTime()))
+        analyser.sampleConsumer = addSample
+        analyser.getSamples()
+        runs["TOTAL"] = total
+        statistics = {}
+        for label, (agg, histogram) in runs.items():
+            agg.calculateThroughput()
+            statistics[label] = {'histogram': histogram, 'throughput': float(agg.getThroughput())}
+        return statistics
+
+    def getDbRunStatistics(self, dbPath, testId):
+        if not os.path.isfile(dbPath):
+            raise JMeterLibException("File %s couldn't be opened" % dbPath)
+        db = sqlite3.connect(dbPath)
+        try:
+            dbCursor = db.cursor()
+            if testId == None:
+                dbCursor.execute("SELECT MAX(testId) FROM Testrun")
+                testId = dbCursor.fetchone()[0]
+            statistics = {'TOTAL': {'histogram': LatencyHistogram(), 'throughput': None}}
+            dbCursor.execute("SELECT aggId, label, throughput, samples FROM Aggregated WHERE testId=?", (testId,))
+            labels = {}
+            expectedSamples = {}
+            for aggId, label, throughput, samples in dbCursor.fetchall():
+                labels[aggId] = label
+                expectedSamples[label] = samples
+                statistics[label] = {'histogram': LatencyHistogram(), 'throughput': throughput}
+            if len(labels) == 0:
+                raise JMeterLibException("Testrun %s not found in %s" % (testId, dbPath))
+            dbCursor.execute("SELECT Sample.aggId, Sample.sampleTime FROM Sample JOIN Aggregated "
+                             "ON Sample.aggId=Aggregated.aggId WHERE Aggregated.testId=?", (testId,))
+            for aggId, sampleTime in dbCursor:
+                statistics[labels[aggId]]['histogram'].add(sampleTime)
+                statistics['TOTAL']['histogram'].add(sampleTime)
+        finally:
+            db.close()
+        for label, samples in expectedSamples.items():
+            #runs stored with sample retention policy other than "all" contain only part of samples
+            if statistics[label]['histogram'].count != samples:
+                raise JMeterLibException("Testrun %s in %s contains %d of %d samples of label %s (see Set Sample "
+                                         "Retention), it can't be compared" % (testId, dbPath, statistics[label]['histogram'].count,
+                                                                               samples, label))
+        return statistics
+
+    def compare(self, baselineStatistics, currentStatistics):
+        results = []
+        for label in sorted(set(baselineStatistics.keys()) & set(currentStatistics.keys())):
+            baseline = baselineStatistics[label]
+            current = currentStatistics[label]
+            result = {'label': label, 'baselineSamples': baseline['histogram'].count,
+                      'currentSamples': current['histogram'].count}
+            for p in self.percentiles:
+                baselineValue = baseline['histogram'].getPercentile(p)
+                currentValue = current['histogram'].getPercentile(p)
+                result['baselineP' + str(p)] = baselineValue
+                result['currentP' + str(p)] = currentValue
+                result['deltaP' + str(p)] = self.getDelta(baselineValue, currentValue)
+            result['baselineThroughput'] = baseline['throughput']
+            result['currentThroughput'] = current['throughput']
+            result['deltaThroughput'] = self.getDelta(baseline['throughput'], current['throughput'])
+            u, pValue = current['histogram'].mannWhitney(baseline['histogram'])
+            result['pValue'] = round(pValue, 6)
+            slower = u != None and u > current['histogram'].count * baseline['histogram'].count / 2.0
+            significant = pValue < self.alpha
+            degradation = max(result['deltaP50'], result['deltaP90']) if slower else min(result['deltaP50'], result['deltaP90'])
+            result['regression'] = significant and slower and degradation >= self.minDegradation
+            result['improvement'] = significant and not slower and degradation <= -self.minDegradation
+            #p-value is calculated for response times, so it isn't used for throughput
+            throughputDrop = result['deltaThroughput']
+            if throughputDrop != None and throughputDrop <= -self.minDegradation:
+                result['regression'] = True
+            results.append(result)
+        onlyInOneRun = sorted(set(baselineStatistics.keys()) ^ set(currentStatistics.keys()))
+        return {'regression': any(r['regression'] for r in results), 'labels': results,
+                'unmatchedLabels': onlyInOneRun}
+
+    def getDelta(self, baselineValue, currentValue):
+        if baselineValue == None or currentValue == None or float(baselineValue) == 0:
+            return None
+        return round((float(currentValue) - float(baselineValue)) * 100.0 / float(baselineValue), 2)
+
+class ScalabilityAnalyser(object):
+    percentiles = [50, 90, 95, 99]
+
+    def __init__(self, threadsColumn="allThreads", minSamples=1):
+        if threadsColumn not in ["allThreads", "grpThreads"]:
+            raise JMeterLibException("Unknown threads column %s, use allThreads or grpThreads" % threadsColumn)
+        self.threadsColumn = threadsColumn
+        self.minSamples = max(1, minSamples)
+
+    def analyse(self, samples):
+        levels = {}
+        for s in samples:
+            if self.threadsColumn == "allThreads":
+                threads = s.getNa()
+            else:
+                threads = s.getNg()
+            if threads == None:
+                continue
+            threads = int(threads)
+            if threads not in levels:
+                levels[threads] = {'histogram': LatencyHistogram(), 'timeSum': 0, 'errors': 0, 'seconds': set()}
+            level = levels[threads]
+            sampleTime = int(s.getSampleTime())
+            level['histogram'].add(sampleTime)
+            level['timeSum'] += sampleTime
+            level['seconds'].add(int(s.getStartTime()) // 1000)
+            if s.getStatus() != "true":
+                level['errors'] += 1
+        if len(levels) == 0:
+            raise JMeterLibException("Log file doesn't contain active threads (grpThreads/allThreads) of samples.")
+        results = []
+        for threads in sorted(levels.keys()):
+            level = levels[threads]
+            count = level['histogram'].count
+            if count < self.minSamples:
+                continue
+            result = {'threads': threads, 'samples': count, 'seconds': len(level['seconds']),
+                      'throughput': round(float(count) / len(level['seconds']), 2),
+                      'errorRate': round(level['errors'] * 100.0 / count, 2),
+                      'average': round(float(level['timeSum']) / count, 2)}
+            for p in self.percentiles:
+                result['p' + str(p)] = level['histogram'].getPercentile(p)
+            results.append(result)
+        return {'threadsColumn': self.threadsColumn, 'levels': results, 'usl': self.fitUsl(results)}
+
+    def fitUsl(self, levels):
+        if len(levels) < 3:
+            return None
+        first = levels[0]
+        lambd = first['throughput'] / first['threads']
+        if lambd <= 0:
+            return None
+        sumAA = sumAB = sumBB = sumAY = sumBY = 0.0
+        for level in levels:
+            n = float(level['threads'])
+            if level['throughput'] <= 0:
+                continue
+            y = n * lambd / level['throughput'] - 1
+            a = n - 1
+            b = n * (n - 1)
+            sumAA += a * a
+            sumAB += a * b
+            sumBB += b * b
+            sumAY += a * y
+            sumBY += b * y
+        determinant = sumAA * sumBB - sumAB * sumAB
+        if determinant == 0:
+            return None
+        sigma = (sumAY * sumBB - sumBY * sumAB) / determinant
+        kappa = (sumBY * sumAA - sumAY * sumAB) / determinant
+        if sigma < 0:
+            sigma = 0.0
+            kappa = sumBY / sumBB
+        if kappa < 0:
+            kappa = 0.0
+            sigma = max(0.0, sumAY / sumAA)
+        peakThreads = None
+        peakThroughput = None
+        if kappa > 0 and sigma < 1:
+            peakThreads = math.sqrt((1 - sigma) / kappa)
+            peakThroughput = round(self.getUslThroughput(peakThreads, lambd, sigma, kappa), 2)
+            peakThreads = round(peakThreads, 1)
+        meanThroughput = sum(l['throughput'] for l in levels) / len(levels)
+        totalSquares = sum((l['throughput'] - meanThroughput) ** 2 for l in levels)
+        residualSquares = sum((l['throughput'] - self.getUslThroughput(l['threads'], lambd, sigma, kappa)) ** 2 for l in levels)
+        rSquared = None
+        if totalSquares > 0:
+            rSquared = round(1 - residualSquares / totalSquares, 4)
+        return {'lambda': round(lambd, 4), 'sigma': round(sigma, 6), 'kappa': round(kappa, 8),
+                'peakThreads': peakThreads, 'peakThroughput': peakThroughput, 'rSquared': rSquared}
+
+    def getUslThroughput(self, threads, lambd, sigma, kappa):
+        return lambd * threads / (1 + sigma * (threads - 1) + kappa * threads * (threads - 1))
+
+class SampleRetention(object):
+    policies = ["all", "aggregates", "failures", "nth"]
+    policy = "all"
+    size = 10000
+
+    def getCacheKey(self):
+        return (SampleRetention.policy, SampleRetention.size)
+
+    def getDisabledReports(self):
+        #aggregated samples and all samples parts of html report are left out if no sample is kept
+        if SampleRetention.policy == "aggregates":
+            return 0b00001010
+        return 0
+
+    def isFailure(self, sample):
+        if sample.getStatus() != "true":
+            return True
+        for a in sample.assertions:
+            if a.getFailure() != "False" or a.getError() != "False":
+                return True
+        return False
+
+    def getRetainedIndexes(self, samples):
+        policy = SampleRetention.policy
+        size = SampleRetention.size
+        if policy == "all":
+            return None
+        if policy == "aggregates":
+            return []
+        if policy == "nth":
+            return list(range(0, len(samples), size))
+        #all failures and reservoir sample (algorithm R) of successful samples, seeded to keep outputs repeatable
+        randomGenerator = random.Random(len(samples))
+        failures = []
+        reservoir = []
+        successes = 0
+        for i, s in enumerate(samples):
+            if self.isFailure(s):
+                failures.append(i)
+                continue
+            successes += 1
+            if len(reservoir) < size:
+                reservoir.append(i)
+            else:
+                j = randomGenerator.randrange(successes)
+                if j < size:
+                    reservoir[j] = i
+        return sorted(failures + reservoir)
+
+    def getRetainedSamples(self, samples):
+        indexes = self.getRetainedIndexes(samples)
+        if indexes == None:
+            return samples
+        return [samples[i] for i in indexes]
 
 class LogConverterSql(object):
-    def __init__(self, parentHandler):
+    def __init__(self, parentHandler, historyDbPath=None):
         dbReady = False
         self.loganalyser = parentHandler
         self.dbStatus = True
-        self.dbName = self.loganalyser.jtlPath + ".sql"
-        self.checkIfDbFileExists()
+        if historyDbPath != None and historyDbPath != "":
+            self.dbName = historyDbPath
+            dbReady = os.path.isfile(self.dbName)
+        else:
+            self.dbName = self.loganalyser.jtlPath + ".sql"
+            self.checkIfDbFileExists()
         self.readDbInTheEnd = False
         try:
             if dbReady:
@@ -983,8 +3861,8 @@ class LogConverterSql(object):
             else:
                 print("ERROR while creating " + self.dbName)
             self.dbStatus = False
-        if not dbReady:
-            self.createStructure2()
+        #schema creates only missing tables and indexes, so history file of older version is upgraded too
+        self.createStructure2()
 
     def checkIfDbFileExists(self):
         while os.path.isfile(self.dbName):
@@ -994,6 +3872,8 @@ class LogConverterSql(object):
         if self.dbStatus:
             testRunId = self.insertTestrun()
             idNameDict = self.insertAggregations(testRunId)
+            self.insertLabelTrend(testRunId)
+            self.insertThreadBreakdown(testRunId)
             self.insertSamples(idNameDict)
             self.testDb()
             self.closeDb()
@@ -1027,17 +3907,29 @@ class LogConverterSql(object):
                 try:
                    dbCursor = self.db.cursor()
                    dbCursor.executescript(sqlSchema)
+                   self.upgradeStructure(dbCursor)
                 except sqlite3.Error:
                    print("ERROR while creating db schema")
                    self.dbStatus = False
 
+    def upgradeStructure(self, dbCursor):
+        dbCursor.execute("PRAGMA table_info(Sample)")
+        if "startTime" not in [column[1] for column in dbCursor.fetchall()]:
+            dbCursor.execute("ALTER TABLE Sample ADD COLUMN startTime INTEGER")
+
     @classmethod
     def getSqlSchema(self):
         sqlSchema = '''
-CREATE TABLE Testrun(testId INTEGER PRIMARY KEY autoincrement, logFile TEXT, runTime TEXT, samples INTEGER, assertions INTEGER, samplesSuccessRate REAL, samplesSuccessRateInclAssertions REAL, assertionPassRate REAL, averageTime REAL, minTime INTEGER, maxTime INTEGER);
-CREATE TABLE Aggregated(aggId INTEGER PRIMARY KEY autoincrement, testId INTEGER, label TEXT, samples INTEGER, averageTime REAL, minTime INTEGER, maxTime INTEGER, stDev REAL, error REAL, errorInclAssert REAL, throughput REAL, kbPerSec REAL, avgBytes REAL, median REAL, line90 INTEGER, FOREIGN KEY(testId) REFERENCES Testrun(testId));
-CREATE TABLE Sample(sampleId INTEGER PRIMARY KEY autoincrement, aggId INTEGER, sampleTime INTEGER, respCode INTEGER, respMsg TEXT, threadName TEXT, dataType TEXT, status TEXT, bytes INTEGER, latency INTEGER, FOREIGN KEY(aggId) REFERENCES Aggregated(aggId));
-CREATE TABLE Assert(assertId INTEGER PRIMARY KEY autoincrement, sampleId INTEGER, name TEXT, failure TEXT, failureMsg TEXT, error TEXT, FOREIGN KEY(sampleId) REFERENCES Sample(sampleId));
+CREATE TABLE IF NOT EXISTS Testrun(testId INTEGER PRIMARY KEY autoincrement, logFile TEXT, runTime TEXT, samples INTEGER, assertions INTEGER, samplesSuccessRate REAL, samplesSuccessRateInclAssertions REAL, assertionPassRate REAL, averageTime REAL, minTime INTEGER, maxTime INTEGER);
+CREATE TABLE IF NOT EXISTS Aggregated(aggId INTEGER PRIMARY KEY autoincrement, testId INTEGER, label TEXT, samples INTEGER, averageTime REAL, minTime INTEGER, maxTime INTEGER, stDev REAL, error REAL, errorInclAssert REAL, throughput REAL, kbPerSec REAL, avgBytes REAL, median REAL, line90 INTEGER, avgLatency REAL, latency90 INTEGER, avgConnect REAL, connect90 INTEGER, sentKbPerSec REAL, FOREIGN KEY(testId) REFERENCES Testrun(testId));
+CREATE TABLE IF NOT EXISTS Sample(sampleId INTEGER PRIMARY KEY autoincrement, aggId INTEGER, startTime INTEGER, sampleTime INTEGER, respCode INTEGER, respMsg TEXT, threadName TEXT, dataType TEXT, status TEXT, bytes INTEGER, latency INTEGER, connect INTEGER, sentBytes INTEGER, idleTime INTEGER, grpThreads INTEGER, allThreads INTEGER, url TEXT, FOREIGN KEY(aggId) REFERENCES Aggregated(aggId));
+CREATE TABLE IF NOT EXISTS Assert(assertId INTEGER PRIMARY KEY autoincrement, sampleId INTEGER, name TEXT, failure TEXT, failureMsg TEXT, error TEXT, FOREIGN KEY(sampleId) REFERENCES Sample(sampleId));
+CREATE TABLE IF NOT EXISTS ThreadBreakdown(breakdownId INTEGER PRIMARY KEY autoincrement, testId INTEGER, threadGroup TEXT, threadName TEXT, samples INTEGER, averageTime REAL, minTime INTEGER, maxTime INTEGER, median INTEGER, line90 INTEGER, error REAL, throughput REAL, threads INTEGER, FOREIGN KEY(testId) REFERENCES Testrun(testId));
+CREATE TABLE IF NOT EXISTS LabelTrend(testId INTEGER, runTime TEXT, logFile TEXT, label TEXT, samples INTEGER, median REAL, line90 INTEGER, throughput REAL, error REAL, PRIMARY KEY(testId, label), FOREIGN KEY(testId) REFERENCES Testrun(testId));
+CREATE TABLE IF NOT EXISTS SampleRollup(aggId INTEGER, second INTEGER, samples INTEGER, errors INTEGER, sumTime INTEGER, minTime INTEGER, maxTime INTEGER, sumLatency INTEGER, PRIMARY KEY(aggId, second), FOREIGN KEY(aggId) REFERENCES Aggregated(aggId));
+CREATE INDEX IF NOT EXISTS TestrunRunTimeIdx ON Testrun(runTime, testId);
+CREATE INDEX IF NOT EXISTS AggregatedTestIdx ON Aggregated(testId, label);
+CREATE INDEX IF NOT EXISTS LabelTrendRunTimeIdx ON LabelTrend(runTime, testId);
         '''
         return sqlSchema
 
@@ -1067,7 +3959,7 @@ CREATE TABLE Assert(assertId INTEGER PRIMARY KEY autoincrement, sampleId INTEGER
                     self.dbStatus = False
             sqlSelect = "SELECT testId FROM Testrun WHERE runTime=\'" + self.loganalyser.timeStamp
             #sqlSelect += "\' AND logFile=\'" + self.loganalyser.filePath + "\';"
-            sqlSelect += "\' AND logFile=\'" + self.loganalyser.jtlPath + "\';"
+            sqlSelect += "\' AND logFile=\'" + self.loganalyser.jtlPath + "\' ORDER BY testId DESC;"
             testRunId = self.getIdFromSelect(sqlSelect,"ERROR while executing \"SELECT ... FROM Testrun\" command")
         return testRunId
 
@@ -1085,6 +3977,16 @@ CREATE TABLE Assert(assertId INTEGER PRIMARY KEY autoincrement, sampleId INTEGER
                 self.dbStatus = False
         return foundId
 
+    def toSqlNumber(self, value):
+        if value == None or value == "":
+            return "NULL"
+        return str(value)
+
+    def toSqlText(self, value):
+        if value == None:
+            return "NULL"
+        return "\'" + value.replace("\'", "\'\'") + "\'"
+
     def insertAggregations(self, testrunKey):
         idNameDict = {}
         if type(testrunKey)==int and testrunKey>0 and self.dbStatus:
@@ -1092,7 +3994,8 @@ CREATE TABLE Assert(assertId INTEGER PRIMARY KEY autoincrement, sampleId INTEGER
                 sqlCommand = ""
                 sqlCommand += "INSERT INTO Aggregated (testId, label,"
                 sqlCommand += "samples, averageTime, minTime, maxTime,stDev, error, errorInclAssert, "
-                sqlCommand += "throughput, kbPerSec, avgBytes, median, line90)"
+                sqlCommand += "throughput, kbPerSec, avgBytes, median, line90, "
+                sqlCommand += "avgLatency, latency90, avgConnect, connect90, sentKbPerSec)"
                 sqlCommand += " VALUES (" + str(testrunKey) + ",\'" + agg.sampleName + "\',"
                 sqlCommand += str(agg.getAmountOfSamples()) + ","
                 sqlCommand += str(agg.getAverageTime()) + ","
@@ -1105,7 +4008,12 @@ CREATE TABLE Assert(assertId INTEGER PRIMARY KEY autoincrement, sampleId INTEGER
                 sqlCommand += str(agg.getKBytesPerSec()) + ","
                 sqlCommand += str(agg.getAverageBytes()) + ","
                 sqlCommand += str(agg.getMedian()) + ","
-                sqlCommand += str(agg.getPerc90()) + ");"
+                sqlCommand += str(agg.getPerc90()) + ","
+                sqlCommand += self.toSqlNumber(agg.getAverageLatency()) + ","
+                sqlCommand += self.toSqlNumber(agg.getLatencyPerc90()) + ","
+                sqlCommand += self.toSqlNumber(agg.getAverageConnect()) + ","
+                sqlCommand += self.toSqlNumber(agg.getConnectPerc90()) + ","
+                sqlCommand += self.toSqlNumber(agg.getSentKBytesPerSec()) + ");"
                 if sqlCommand!="" and agg.sampleName!="TOTAL":
                     try:
                         dbCursor = self.db.cursor()
@@ -1120,52 +4028,112 @@ CREATE TABLE Assert(assertId INTEGER PRIMARY KEY autoincrement, sampleId INTEGER
                         idNameDict[agg.sampleName] = aggrId
         return idNameDict
 
+    def insertLabelTrend(self, testrunKey):
+        if not self.dbStatus or testrunKey <= 0:
+            return
+        rows = []
+        for agg in self.loganalyser.aggrSamples:
+            rows.append((testrunKey, self.loganalyser.timeStamp, self.loganalyser.jtlPath, agg.sampleName,
+                         agg.getAmountOfSamples(), agg.getMedian(), agg.getPerc90(), agg.getThroughput(),
+                         agg.getSampleErrorNoAssert()))
+        try:
+            dbCursor = self.db.cursor()
+            dbCursor.executemany("INSERT INTO LabelTrend (testId, runTime, logFile, label, samples, median, line90, "
+                                 "throughput, error) VALUES (?,?,?,?,?,?,?,?,?)", rows)
+            self.db.commit()
+        except sqlite3.Error:
+            print("ERROR while executing \"INSERT INTO LabelTrend\" command")
+            self.dbStatus = False
+
+    def insertThreadBreakdown(self, testrunKey):
+        threadBreakdown = getattr(self.loganalyser, 'threadBreakdown', None)
+        if threadBreakdown == None or not self.dbStatus or testrunKey <= 0:
+            return
+        rows = []
+        for agg in threadBreakdown.threadGroups.values():
+            d = agg.convertToDictionary()
+            rows.append((testrunKey, d['name'], None, d['samples'], d['averageTime'], d['minTime'], d['maxTime'],
+                         d['median'], d['percentil90'], d['errorRate'], d['throughput'], d['threads']))
+        for agg in threadBreakdown.threads.values():
+            d = agg.convertToDictionary()
+            rows.append((testrunKey, d['threadGroup'], d['name'], d['samples'], d['averageTime'], d['minTime'],
+                         d['maxTime'], d['median'], d['percentil90'], d['errorRate'], d['throughput'], 1))
+        try:
+            dbCursor = self.db.cursor()
+            dbCursor.executemany("INSERT INTO ThreadBreakdown (testId, threadGroup, threadName, samples, averageTime, "
+                                 "minTime, maxTime, median, line90, error, throughput, threads) "
+                                 "VALUES (?,?,?,?,?,?,?,?,?,?,?,?)", rows)
+            self.db.commit()
+        except sqlite3.Error:
+            print("ERROR while executing \"INSERT INTO ThreadBreakdown\" command")
+            self.dbStatus = False
+
     def insertSamples(self, idNameDict):
-        if self.dbStatus:
-            for s in self.loganalyser.samples:
-                fk = -1
-                for k in idNameDict.keys():
-                    if k == s.getLabel():
-                        fk = idNameDict[k]
-                if fk>0 and type(fk) == int :
-                    sqlCommand = "INSERT INTO Sample (aggId, sampleTime, respCode, respMsg, threadName, dataType, status, bytes, latency)"
-                    sqlCommand += " VALUES (" + str(fk) + ","
-                    sqlCommand += s.getSampleTime() + ","
-                    sqlCommand += "\'" + s.getRespCode() + "\',"
-                    sqlCommand += "\'" + s.getRespMsg() + "\',"
-                    sqlCommand += "\'" + s.getThreadName() + "\',"
-                    sqlCommand += "\'" + s.getDataType() + "\',"
-                    sqlCommand += "\'" + s.getStatus() + "\',"
-                    sqlCommand += s.getBytes() + ","
-                    sqlCommand += s.getLatency() + ");"
-                    if sqlCommand != "":
-                        try:
-                            dbCursor = self.db.cursor()
-                            dbCursor.executescript(sqlCommand)
-                        except sqlite3.Error:
-                            print("ERROR while executing \"INSERT INTO Sample\" command")
-                            self.dbStatus = False
-                        sqlSelect = "SELECT sampleId FROM Sample ORDER BY sampleId DESC"
-                        sampleId = self.getIdFromSelect(sqlSelect,"Error while executing \"SELECT ... FROM Sample\" command")
-                    self.insertAssertion(sampleId,s.assertions)
-
-    def insertAssertion(self, sampleKey, assertionList):
-        if self.dbStatus:
-            if isinstance(sampleKey,int) and sampleKey > 0:
-                for a in assertionList:
-                    sqlCommand = "INSERT INTO Assert (sampleId, name, failure, failureMsg, error) "
-                    sqlCommand += " VALUES (" + str(sampleKey) + ","
-                    sqlCommand += "\'" + a.getName() + "\',"
-                    sqlCommand += "\'" + a.getFailure() + "\',"
-                    sqlCommand += "\'" + a.getFailureMsg() + "\',"
-                    sqlCommand += "\'" + a.getError() + "\')"
-                    if sqlCommand!="":
-                        try:
-                            dbCursor = self.db.cursor()
-                            dbCursor.executescript(sqlCommand)
-                        except sqlite3.Error:
-                            print("ERROR while executing \"INSERT INTO Assert\" command")
-                            self.dbStatus = False
+        if not self.dbStatus:
+            return
+        sampleRows = []
+        assertionRows = []
+        rollup = {}
+        #rollup is calculated from all samples, retention policy limits only stored raw samples
+        retained = SampleRetention().getRetainedIndexes(self.loganalyser.samples)
+        if retained != None:
+            retained = set(retained)
+        try:
+            dbCursor = self.db.cursor()
+            #ids of samples are assigned here, so samples and their assertions are inserted in bulk
+            dbCursor.execute("BEGIN IMMEDIATE")
+            dbCursor.execute("SELECT MAX(COALESCE((SELECT MAX(sampleId) FROM Sample), 0), "
+                             "COALESCE((SELECT seq FROM sqlite_sequence WHERE name='Sample'), 0))")
+            sampleId = dbCursor.fetchone()[0]
+            for i, s in enumerate(self.loganalyser.samples):
+                aggId = idNameDict.get(s.getLabel(), -1)
+                if aggId <= 0:
+                    continue
+                startTime = int(s.getStartTime())
+                sampleTime = int(s.getSampleTime())
+                latency = int(s.getLatency())
+                error = 0 if s.getStatus() == "true" else 1
+                if retained == None or i in retained:
+                    sampleId += 1
+                    sampleRows.append((sampleId, aggId, startTime, sampleTime, s.getRespCode(), s.getRespMsg(),
+                                       s.getThreadName(), s.getDataType(), s.getStatus(), s.getBytes(), latency,
+                                       self.toSqlValue(s.getConnect()), self.toSqlValue(s.getSentBytes()),
+                                       self.toSqlValue(s.getIdleTime()), self.toSqlValue(s.getNg()),
+                                       self.toSqlValue(s.getNa()), s.getUrl()))
+                    for a in s.assertions:
+                        assertionRows.append((sampleId, a.getName(), a.getFailure(), a.getFailureMsg(), a.getError()))
+                key = (aggId, startTime // 1000)
+                second = rollup.get(key)
+                if second == None:
+                    rollup[key] = [1, error, sampleTime, sampleTime, sampleTime, latency]
+                else:
+                    second[0] += 1
+                    second[1] += error
+                    second[2] += sampleTime
+                    second[3] = min(second[3], sampleTime)
+                    second[4] = max(second[4], sampleTime)
+                    second[5] += latency
+            dbCursor.executemany("INSERT INTO Sample (sampleId, aggId, startTime, sampleTime, respCode, respMsg, "
+                                 "threadName, dataType, status, bytes, latency, connect, sentBytes, idleTime, "
+                                 "grpThreads, allThreads, url) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)", sampleRows)
+            dbCursor.executemany("INSERT INTO Assert (sampleId, name, failure, failureMsg, error) VALUES (?,?,?,?,?)",
+                                 assertionRows)
+            dbCursor.executemany("INSERT INTO SampleRollup (aggId, second, samples, errors, sumTime, minTime, maxTime, "
+                                 "sumLatency) VALUES (?,?,?,?,?,?,?,?)",
+                                 [key + tuple(values) for key, values in sorted(rollup.items())])
+            self.db.commit()
+            if retained != None:
+                print("Sample retention policy " + SampleRetention.policy + ": " + str(len(sampleRows)) + " of " +
+                      str(len(self.loganalyser.samples)) + " samples stored")
+        except sqlite3.Error:
+            print("ERROR while executing \"INSERT INTO Sample\" command")
+            self.db.rollback()
+            self.dbStatus = False
+
+    def toSqlValue(self, value):
+        if value == "":
+            return None
+        return value
 
     def testDb(self):
         filePath = self.dbName + ".txt"
@@ -1175,6 +4143,7 @@ CREATE TABLE Assert(assertId INTEGER PRIMARY KEY autoincrement, sampleId INTEGER
             sqlLog += self.selectFrom("Aggregated")
             sqlLog += self.selectFrom("Sample")
             sqlLog += self.selectFrom("Assert")
+            sqlLog += self.selectFrom("SampleRollup")
             if filePath!=None:
                 try:
                     dbLogFile = open(filePath, 'w')
@@ -1198,13 +4167,429 @@ CREATE TABLE Assert(assertId INTEGER PRIMARY KEY autoincrement, sampleId INTEGER
             print("ERROR while executing command " + sqlCommand)
         return sqlData
 
+class TrendDashboard(object):
+    rollupColumns = "testId, runTime, logFile, label, samples, median, line90, throughput, error"
+
+    def __init__(self, dbPaths, labels=None, lastRuns=None):
+        if isinstance(dbPaths, (str, unicode)):
+            if re.search("[*?[]", dbPaths):
+                dbPaths = sorted(glob.glob(dbPaths))
+            else:
+                dbPaths = [dbPaths]
+        self.dbPaths = list(dbPaths)
+        if len(self.dbPaths) == 0:
+            raise JMeterLibException("No SQLite files with test runs were found.")
+        self.labels = SampleFilter().toPattern(labels)
+        self.lastRuns = None if lastRuns in [None, ""] else int(lastRuns)
+
+    def getRollupSource(self, db):
+        #SQLite files are only read, runs stored by older versions (without LabelTrend rows) are
+        #read from Aggregated table together with LabelTrend rows of newer runs
+        rollupSelect = "SELECT a.testId, t.runTime, t.logFile, a.label, a.samples, a.median, a.line90, a.throughput, a.error "
+        rollupSelect += "FROM Aggregated a JOIN Testrun t ON a.testId = t.testId"
+        hasLabelTrend = db.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name='LabelTrend'").fetchone()[0]
+        if hasLabelTrend == 0:
+            return "(" + rollupSelect + ")"
+        return ("(SELECT " + self.rollupColumns + " FROM LabelTrend UNION ALL " + rollupSelect +
+                " WHERE NOT EXISTS (SELECT 1 FROM LabelTrend l WHERE l.testId = a.testId))")
+
+    def readHistory(self):
+        rows = []
+        for dbIndex, dbPath in enumerate(self.dbPaths):
+            if not os.path.isfile(dbPath):
+                raise JMeterLibException("File %s couldn't be opened" % dbPath)
+            db = sqlite3.connect(dbPath)
+            try:
+                sqlSelect = "SELECT " + self.rollupColumns + " FROM " + self.getRollupSource(db)
+                params = ()
+                if self.lastRuns != None:
+                    sqlSelect += " WHERE testId IN (SELECT testId FROM Testrun ORDER BY runTime DESC, testId DESC LIMIT ?)"
+                    params = (self.lastRuns,)
+                for row in db.execute(sqlSelect, params):
+                    rows.append((row[1], dbIndex) + tuple(row))
+            except sqlite3.Error:
+                raise JMeterLibException("Test runs couldn't be read from %s" % dbPath)
+            finally:
+                db.close()
+        rows.sort(key=lambda r: (r[0], r[1], r[2]))
+        runs = collections.OrderedDict()
+        for row in rows:
+            runs.setdefault((row[1], row[2]), (row[3], row[4]))
+        if self.lastRuns != None:
+            runs = collections.OrderedDict(list(runs.items())[-self.lastRuns:])
+        runIndexes = dict((key, i) for i, key in enumerate(runs.keys()))
+        trends = {}
+        for row in rows:
+            runIndex = runIndexes.get((row[1], row[2]))
+            label = row[5]
+            if runIndex == None or (self.labels != None and self.labels.search(label) == None):
+                continue
+            if label not in trends:
+                trends[label] = dict((m, [None] * len(runs)) for m in ['samples', 'median', 'line90', 'throughput', 'error'])
+            for m, value in zip(['samples', 'median', 'line90', 'throughput', 'error'], row[6:]):
+                trends[label][m][runIndex] = value
+        labels = sorted([l for l in trends.keys() if l != "TOTAL"])
+        if "TOTAL" in trends:
+            labels.append("TOTAL")
+        return list(runs.values()), [(l, trends[l]) for l in labels]
+
+    def getLastValues(self, trend, metric):
+        values = [v for v in trend[metric] if v != None]
+        last = values[-1] if len(values) > 0 else None
+        previous = values[-2] if len(values) > 1 else None
+        return last, previous
+
+    def createHtml(self, htmlPath=None):
+        if htmlPath == None or htmlPath == "":
+            htmlPath = self.dbPaths[0] + ".trend.html"
+        runs, trends = self.readHistory()
+        print("Creating trend dashboard " + htmlPath + " from " + str(len(runs)) + " test runs")
+        html = self.htmlParts['start'].replace("%css%", LogConverterHtml.readCss())
+        html += "<p id=\"navifont\">Trend of " + str(len(runs)) + " test runs</p><p>"
+        if len(runs) > 0:
+            html += LogConverterHtml.escapeHtml(runs[0][0]) + " - " + LogConverterHtml.escapeHtml(runs[-1][0])
+        html += "</p>" + self.htmlParts['labelsTableStartAndHeader']
+        for i, (label, trend) in enumerate(trends):
+            html += "<tr><td><a href=\"#trend" + str(i) + "\">" + LogConverterHtml.escapeHtml(label) + "</a></td>"
+            html += "<td>" + str(len([v for v in trend['samples'] if v != None])) + "</td>"
+            for metric, unit in [('median', " ms"), ('line90', " ms"), ('throughput', "/sec"), ('error', " %")]:
+                last, previous = self.getLastValues(trend, metric)
+                html += "<td>" + ("-" if last == None else str(last) + unit) + "</td>"
+            last, previous = self.getLastValues(trend, 'line90')
+            change = "-"
+            if last != None and previous != None and previous > 0:
+                change = "%+.1f %%" % (100.0 * (last - previous) / previous)
+            html += "<td>" + change + "</td></tr>"
+        html += "</table><br>"
+        for i, (label, trend) in enumerate(trends):
+            html += "<a id=\"trend" + str(i) + "\"><p id=\"navifont\">" + LogConverterHtml.escapeHtml(label) + " </p></a>"
+            for chart in ["Time", "Throughput", "Error"]:
+                html += "<canvas id=\"trend" + str(i) + chart + "\" width=\"600\" height=\"300\">"
+                html += "Your browser does not support the HTML5 canvas tag.</canvas>\n"
+            html += "<br>"
+        trendData = {'runs': [r[0] for r in runs], 'logFiles': [r[1] for r in runs],
+                     'labels': [dict([('label', l)] + list(t.items())) for l, t in trends]}
+        html += "\n<script>\n" + self.htmlParts['js'] + "\nvar trendData = " + LogConverterHtml.toJson(trendData)
+        html += ";\ndrawTrends(trendData);\n</script>\n</body></html>"
+        try:
+            htmlHndl = open(htmlPath, "w")
+            htmlHndl.write(html)
+            htmlHndl.close()
+        except IOError:
+            raise JMeterLibException("File %s couldn't be written" % htmlPath)
+        return htmlPath
+
+    htmlParts = {'start':'''<!DOCTYPE html>
+<html>\n<head>\n<title>JMeter trend dashboard</title>
+<style>\n%css%\n</style>\n</head>\n<body>\n''',
+                 'labelsTableStartAndHeader':'''
+<table id="samples">
+<tr><th>Label</th><th>#Runs</th><th>Median</th><th>90% Line</th><th>Throughput</th>
+<th>Error %</th><th>90% Line change</th></tr>''',
+                 'js':'''
+function TrendChart(canvasID, title, runs) {
+    this.canvas = document.getElementById(canvasID);
+    this.context = this.canvas.getContext("2d");
+    this.title = title;
+    this.runs = runs;
+    this.series = [];
+}
+
+TrendChart.prototype.addSeries = function(name, color, values) {
+    this.series.push({name: name, color: color, values: values});
+}
+
+TrendChart.prototype.draw = function() {
+    var ctx = this.context, left = 60, top = 30, right = this.canvas.width - 10, bottom = this.canvas.height - 40;
+    var minData = null, maxData = null;
+    for (var s = 0; s < this.series.length; s++) {
+        for (var i = 0; i < this.series[s].values.length; i++) {
+            var v = this.series[s].values[i];
+            if (v === null) continue;
+            if (minData === null || v < minData) minData = v;
+            if (maxData === null || v > maxData) maxData = v;
+        }
+    }
+    ctx.strokeStyle = "#000000";
+    ctx.fillStyle = "#000000";
+    ctx.lineWidth = 1;
+    ctx.strokeRect(left, top, right - left, bottom - top);
+    ctx.font = "15px Arial";
+    ctx.fillText(this.title, left, top - 10);
+    if (minData === null) return;
+    if (maxData == minData) maxData = minData + 1;
+    ctx.font = "11px Arial";
+    ctx.fillText(String(maxData), 2, top + 10);
+    ctx.fillText(String(minData), 2, bottom);
+    ctx.fillText(this.runs[0], left, bottom + 15);
+    ctx.fillText(this.runs[this.runs.length - 1], right - 110, bottom + 15);
+    var stepX = this.runs.length > 1 ? (right - left) / (this.runs.length - 1) : 0;
+    for (var s = 0; s < this.series.length; s++) {
+        var values = this.series[s].values, drawing = false;
+        ctx.strokeStyle = this.series[s].color;
+        ctx.lineWidth = 2;
+        ctx.beginPath();
+        for (var i = 0; i < values.length; i++) {
+            if (values[i] === null) {
+                drawing = false;
+                continue;
+            }
+            var x = left + i * stepX, y = bottom - (values[i] - minData) * (bottom - top) / (maxData - minData);
+            if (drawing) ctx.lineTo(x, y); else ctx.moveTo(x, y);
+            drawing = true;
+        }
+        ctx.stroke();
+        ctx.fillStyle = this.series[s].color;
+        ctx.fillRect(left + 200 + s * 110, bottom + 28, 10, 10);
+        ctx.fillStyle = "#000000";
+        ctx.fillText(this.series[s].name, left + 215 + s * 110, bottom + 37);
+    }
+}
+
+function drawTrends(data) {
+    for (var i = 0; i < data.labels.length; i++) {
+        var t = data.labels[i];
+        var chart = new TrendChart("trend" + i + "Time", "Response time [ms]", data.runs);
+        chart.addSeries("Median", "#00A3CC", t.median);
+        chart.addSeries("90% Line", "#CC0052", t.line90);
+        chart.draw();
+        chart = new TrendChart("trend" + i + "Throughput", "Throughput [/sec]", data.runs);
+        chart.addSeries("Throughput", "#00A3CC", t.throughput);
+        chart.draw();
+        chart = new TrendChart("trend" + i + "Error", "Error %", data.runs);
+        chart.addSeries("Error %", "#CC0052", t.error);
+        chart.draw();
+    }
+}
+'''}
+
+class LogConverterParquet(object):
+    def __init__(self, parentHandler, fileFormat="parquet", batchSize=65536):
+        if pyarrow == None:
+            raise JMeterLibException("Parquet and Arrow export requires pyarrow package (pip install pyarrow)")
+        if fileFormat not in ["parquet", "arrow"]:
+            raise JMeterLibException("Unknown export format %s, use parquet or arrow" % fileFormat)
+        self.loganalyser = parentHandler
+        self.fileFormat = fileFormat
+        self.batchSize = max(1, batchSize)
+        self.createNewPaths()
+        labels = [agg.sampleName for agg in self.loganalyser.aggrSamples if agg.sampleName != "TOTAL"]
+        self.labelDictionary = pyarrow.array(labels, type=pyarrow.string())
+        self.labelCodes = dict((l, i) for i, l in enumerate(labels))
+
+    def createNewPaths(self):
+        basePath = self.loganalyser.jtlPath
+        extension = "." + self.fileFormat
+        while os.path.isfile(basePath + ".samples" + extension):
+            basePath = self.loganalyser.jtlPath + strftime("%Y%m%d%H%M%S", gmtime())
+        self.samplesPath = basePath + ".samples" + extension
+        self.assertionsPath = basePath + ".assertions" + extension
+        self.aggregatedPath = basePath + ".aggregated" + extension
+
+    def getSamplesSchema(self):
+        return pyarrow.schema([('sampleId', pyarrow.int64()),
+                               ('startTime', pyarrow.timestamp('ms')),
+                               ('label', pyarrow.dictionary(pyarrow.int32(), pyarrow.string())),
+                               ('sampleTime', pyarrow.int64()),
+                               ('latency', pyarrow.int64()),
+                               ('bytes', pyarrow.int64()),
+                               ('status', pyarrow.bool_()),
+                               ('respCode', pyarrow.string()),
+                               ('respMsg', pyarrow.string()),
+                               ('threadName', pyarrow.string()),
+                               ('dataType', pyarrow.string()),
+                               ('connect', pyarrow.int64()),
+                               ('sentBytes', pyarrow.int64()),
+                               ('idleTime', pyarrow.int64()),
+                               ('grpThreads', pyarrow.int64()),
+                               ('allThreads', pyarrow.int64()),
+                               ('url', pyarrow.string())])
+
+    def getAssertionsSchema(self):
+        return pyarrow.schema([('sampleId', pyarrow.int64()),
+                               ('name', pyarrow.string()),
+                               ('failure', pyarrow.bool_()),
+                               ('failureMsg', pyarrow.string()),
+                               ('error', pyarrow.bool_())])
+
+    def getAggregatedSchema(self):
+        return pyarrow.schema([('label', pyarrow.string()),
+                               ('samples', pyarrow.int64()),
+                               ('averageTime', pyarrow.float64()),
+                               ('minTime', pyarrow.int64()),
+                               ('maxTime', pyarrow.int64()),
+                               ('stDev', pyarrow.float64()),
+                               ('error', pyarrow.float64()),
+                               ('errorInclAssert', pyarrow.float64()),
+                               ('throughput', pyarrow.float64()),
+                               ('kbPerSec', pyarrow.float64()),
+                               ('avgBytes', pyarrow.float64()),
+                               ('median', pyarrow.float64()),
+                               ('line90', pyarrow.int64()),
+                               ('avgLatency', pyarrow.float64()),
+                               ('latency90', pyarrow.int64()),
+                               ('avgConnect', pyarrow.float64()),
+                               ('connect90', pyarrow.int64()),
+                               ('sentKbPerSec', pyarrow.float64())])
+
+    def openWriter(self, path, schema):
+        if self.fileFormat == "parquet":
+            return pyarrow.parquet.ParquetWriter(path, schema, use_dictionary=True)
+        return pyarrow.ipc.new_file(path, schema)
+
+    def writeBatch(self, writer, schema, columns):
+        batch = pyarrow.RecordBatch.from_arrays(columns, schema=schema)
+        if self.fileFormat == "parquet":
+            writer.write_table(pyarrow.Table.from_batches([batch]), row_group_size=self.batchSize)
+        else:
+            writer.write_batch(batch)
+
+    def createFiles(self):
+        print("Creating " + self.fileFormat + " files " + self.samplesPath + ", " + self.assertionsPath + ", " + self.aggregatedPath)
+        self.writeSamplesAndAssertions()
+        self.writeAggregated()
+
+    def writeSamplesAndAssertions(self):
+        samplesSchema = self.getSamplesSchema()
+        assertionsSchema = self.getAssertionsSchema()
+        samplesWriter = self.openWriter(self.samplesPath, samplesSchema)
+        assertionsWriter = self.openWriter(self.assertionsPath, assertionsSchema)
+        try:
+            samples = self.loganalyser.samples
+            for batchStart in range(0, len(samples), self.batchSize):
+                sampleRows = []
+                assertionRows = []
+                for sampleId, s in enumerate(samples[batchStart:batchStart + self.batchSize], batchStart + 1):
+                    sampleRows.append((sampleId, int(s.getStartTime()), self.labelCodes[s.getLabel()],
+                                       int(s.getSampleTime()), int(s.getLatency()), int(s.getBytes()),
+                                       s.getStatus() == "true", s.getRespCode(), s.getRespMsg(),
+                                       s.getThreadName(), s.getDataType(), self.toOptionalInt(s.getConnect()),
+                                       self.toOptionalInt(s.getSentBytes()), self.toOptionalInt(s.getIdleTime()),
+                                       self.toOptionalInt(s.getNg()), self.toOptionalInt(s.getNa()), s.getUrl()))
+                    for a in s.getAssertions():
+                        assertionRows.append((sampleId, a.getName(), a.getFailure() == "True",
+                                              a.getFailureMsg(), a.getError() == "True"))
+                self.writeBatch(samplesWriter, samplesSchema, self.rowsToArrays(sampleRows, samplesSchema))
+                if len(assertionRows) > 0:
+                    self.writeBatch(assertionsWriter, assertionsSchema, self.rowsToArrays(assertionRows, assertionsSchema))
+        finally:
+            samplesWriter.close()
+            assertionsWriter.close()
+
+    def rowsToArrays(self, rows, schema):
+        arrays = []
+        for i, values in enumerate(zip(*rows)):
+            fieldType = schema.field(i).type
+            if pyarrow.types.is_dictionary(fieldType):
+                indices = pyarrow.array(values, type=fieldType.index_type)
+                arrays.append(pyarrow.DictionaryArray.from_arrays(indices, self.labelDictionary))
+            else:
+                arrays.append(pyarrow.array(values, type=fieldType))
+        return arrays
+
+    def toOptionalInt(self, value):
+        if value == None:
+            return None
+        return int(value)
+
+    def toOptionalFloat(self, value):
+        if value == None:
+            return None
+        return float(value)
+
+    def writeAggregated(self):
+        aggregatedSchema = self.getAggregatedSchema()
+        aggregatedRows = []
+        for agg in self.loganalyser.aggrSamples:
+            aggregatedRows.append((agg.sampleName, agg.getAmountOfSamples(), float(agg.getAverageTime()),
+                                   int(agg.getMinTime()), int(agg.getMaxTime()), float(agg.getStdDev()),
+                                   float(agg.getSampleErrorNoAssert()), float(agg.getSampleErrorInclAssert()),
+                                   float(agg.getThroughput()), float(agg.getKBytesPerSec()),
+                                   float(agg.getAverageBytes()), float(agg.getMedian()), int(agg.getPerc90()),
+                                   float(agg.getAverageLatency()), int(agg.getLatencyPerc90()),
+                                   self.toOptionalFloat(agg.getAverageConnect()), self.toOptionalInt(agg.getConnectPerc90()),
+                                   self.toOptionalFloat(agg.getSentKBytesPerSec())))
+        aggregatedWriter = self.openWriter(self.aggregatedPath, aggregatedSchema)
+        try:
+            self.writeBatch(aggregatedWriter, aggregatedSchema, self.rowsToArrays(aggregatedRows, aggregatedSchema))
+        finally:
+            aggregatedWriter.close()
+
+class HtmlFragmentCache(object):
+    def __init__(self, maxMegabytes=0, externalAssets=False):
+        self.fragments = collections.OrderedDict()
+        self.lock = threading.RLock()
+        self.configure(maxMegabytes, externalAssets)
+
+    def configure(self, maxMegabytes, externalAssets=False):
+        self.maxChars = maxMegabytes * 1024 * 1024
+        self.externalAssets = externalAssets
+        self.evict()
+
+    def clear(self):
+        with self.lock:
+            self.fragments.clear()
+            self.cachedChars = 0
+
+    def isEnabled(self):
+        return self.maxChars > 0
+
+    def makeKey(self, section, inputs):
+        data = repr(inputs)
+        if not isinstance(data, bytes):
+            data = data.encode("utf-8")
+        return (section, hashlib.sha1(data).hexdigest())
+
+    def getSize(self, fragment):
+        if isinstance(fragment, tuple):
+            return len(fragment[0])
+        return len(fragment)
+
+    def get(self, section, inputs, render, validate=None):
+        if inputs == None or self.maxChars <= 0:
+            return render()
+        key = self.makeKey(section, inputs)
+        with self.lock:
+            fragment = self.fragments.pop(key, None)
+            if fragment != None:
+                self.fragments[key] = fragment
+        if fragment != None and (validate == None or validate(fragment)):
+            return fragment
+        fragment = render()
+        if self.getSize(fragment) <= self.maxChars:
+            with self.lock:
+                self.fragments.pop(key, None)
+                self.fragments[key] = fragment
+                self.evict()
+        return fragment
+
+    def evict(self):
+        with self.lock:
+            self.cachedChars = 0
+            for fragment in self.fragments.values():
+                self.cachedChars += self.getSize(fragment)
+            while len(self.fragments) > 0 and self.cachedChars > self.maxChars:
+                oldestKey, oldestFragment = self.fragments.popitem(last=False)
+                self.cachedChars -= self.getSize(oldestFragment)
+
+htmlFragmentCache = HtmlFragmentCache()
+
 class LogConverterHtml(object):
-    def __init__(self, parentHandler, disableReports=None):
+    staticAssets = None
+    counterMarker = "\x00"
+
+    def __init__(self, parentHandler, disableReports=None, maxInlineSamples=None):
         self.loganalyser = parentHandler
         self.logPath = parentHandler.jtlPath
         self.predefineHtml()
         self.customizeNaviBar(disableReports)
         self.printDetails = False
+        self.maxInlineSamples = None
+        if maxInlineSamples != None and maxInlineSamples != "":
+            self.maxInlineSamples = int(maxInlineSamples)
+        self.sampleChunkSize = 50000
+        self.samplesTableCounter = 0
+        self.failuresTopN = 10
 
     def createNewHtmlPath(self):
         self.htmlLogPath = self.logPath + ".html"
@@ -1226,6 +4611,7 @@ class LogConverterHtml(object):
             disableReports = int(disableReports)
         if not isinstance(disableReports, int):
             disableReports = 0
+        disableReports |= SampleRetention().getDisabledReports()
         print("Creating html " + self.htmlLogPath)
         newHtml = self.createHtmlBeginning()
         newHtml += self.createHtmlNaviPanel()
@@ -1233,6 +4619,12 @@ class LogConverterHtml(object):
         newHtml += self.createHtmlSummaryReport()
         if disableReports & 0b00000001 == 0:
             newHtml += self.createHtmlAggrRepAndGraph()
+        if getattr(self.loganalyser, 'threadBreakdown', None) != None:
+            newHtml += self.createHtmlThreadBreakdown()
+        if disableReports & 0b00010000 == 0:
+            newHtml += self.createHtmlFailures()
+        if disableReports & 0b00001010 != 0b00001010:
+            newHtml += self.createHtmlSamplesData()
         if disableReports & 0b00000010 == 0:
             newHtml += self.createHtmlAggrSamples()
         if disableReports & 0b00000100 == 0:
@@ -1249,7 +4641,51 @@ class LogConverterHtml(object):
         return assertNum
 
     def createHtmlBeginning(self):
-        return self.htmlParts['start']
+        if not htmlFragmentCache.externalAssets:
+            return self.htmlParts['start']
+        cssContents, jsContents = self.getStaticAssets()
+        cssName = self.writeAssetFile("css", cssContents)
+        jsName = self.writeAssetFile("js", jsContents.strip()[len("<script>"):-len("</script>")])
+        beginning = self.htmlParts['head'] + "\n<link rel=\"stylesheet\" href=\"" + cssName + "\">\n</head>\n<body>\n"
+        return beginning + "<script src=\"" + jsName + "\"></script>\n"
+
+    def getStaticAssets(self):
+        if LogConverterHtml.staticAssets == None:
+            LogConverterHtml.staticAssets = (self.readCss(), self.readJs())
+        return LogConverterHtml.staticAssets
+
+    def writeAssetFile(self, extension, contents):
+        if isinstance(contents, unicode):
+            contents = contents.encode("utf-8")
+        assetName = "jmeterlib-" + hashlib.sha1(contents).hexdigest()[:12] + "." + extension
+        assetPath = os.path.join(os.path.dirname(os.path.abspath(self.htmlLogPath)), assetName)
+        if not os.path.isfile(assetPath):
+            tempPath = getTemporaryPath(assetPath)
+            try:
+                with open(tempPath, "wb") as assetHndl:
+                    assetHndl.write(contents)
+                replaceFile(tempPath, assetPath)
+            except (IOError, OSError):
+                print("ERROR, problems while writing " + assetPath)
+        return assetName
+
+    def getSourceKey(self):
+        if not htmlFragmentCache.isEnabled() or not hasattr(self.loganalyser, 'getSourceKey'):
+            return None
+        return self.loganalyser.getSourceKey()
+
+    def getLabelKey(self, agg):
+        #response times of a label tell apart labels of the same name produced by different label filters
+        sourceKey = self.getSourceKey()
+        if sourceKey == None:
+            return None
+        return (sourceKey, agg.sampleName, agg.timeTable)
+
+    def getSamplesKey(self):
+        sourceKey = self.getSourceKey()
+        if sourceKey == None:
+            return None
+        return (sourceKey, [(agg.sampleName, agg.timeTable) for agg in self.loganalyser.aggrSamples[:-1]])
 
     def createHtmlNaviPanel(self):
         return self.htmlParts['navi']
@@ -1305,6 +4741,10 @@ class LogConverterHtml(object):
             aggHtml += "<td>" + str(agg.getSampleErrorInclAssert()) + " %</td>"
             aggHtml += "<td>" + str(agg.getThroughput()) + "/sec</td>"
             aggHtml += "<td>" + str(agg.getKBytesPerSec()) + "KB/sec </td>"
+            aggHtml += "<td>" + str(agg.getAverageLatency()) + " ms</td>"
+            aggHtml += "<td>" + self.optionalValue(agg.getAverageConnect(), " ms") + "</td>"
+            aggHtml += "<td>" + self.optionalValue(agg.getSentKBytesPerSec(), "KB/sec") + "</td>"
+            aggHtml += "<td>" + self.optionalValue(agg.getMaxActiveThreads(), "") + "</td>"
             aggHtml += "</tr>"
         aggHtml += "</table><br>"
         aggCounter = 0
@@ -1320,6 +4760,72 @@ class LogConverterHtml(object):
                                                                                  agg.getMaxTime()])
         return aggHtml
 
+    def createHtmlThreadBreakdown(self):
+        threadBreakdown = self.loganalyser.threadBreakdown
+        breakdownHtml = "<a id=\"threadgr\"><p id=\"navifont\">Thread groups and threads </p></a>"
+        breakdownHtml += "\n<table id=\"samples\">\n<tr><th>Thread group</th>"
+        breakdownHtml += self.htmlParts['ThreadBreakdownTableHeader'] + "<th>Threads</th></tr>"
+        for agg in threadBreakdown.threadGroups.values():
+            breakdownHtml += self.breakdownRowToHtml(agg.convertToDictionary(), agg.name, "")
+        breakdownHtml += "</table><br>"
+        breakdownHtml += "\n<table id=\"samples\">\n<tr><th>Thread</th>"
+        breakdownHtml += self.htmlParts['ThreadBreakdownTableHeader'] + "<th>Thread group</th></tr>"
+        for agg in threadBreakdown.threads.values():
+            breakdownHtml += self.breakdownRowToHtml(agg.convertToDictionary(), agg.name, agg.threadGroup)
+        breakdownHtml += "</table><br>"
+        return breakdownHtml
+
+    def createHtmlFailures(self):
+        samplesKey = self.getSamplesKey()
+        inputs = None if samplesKey == None else (samplesKey, self.failuresTopN)
+        return htmlFragmentCache.get("failures", inputs, self.renderHtmlFailures)
+
+    def renderHtmlFailures(self):
+        failuresHtml = "<a id=\"failures\"><p id=\"navifont\">Response codes and failures </p></a>"
+        failuresHtml += self.htmlParts['ResponseCodesTableStartAndHeader']
+        failures = FailureAnalyser(self.failuresTopN).analyse(self.loganalyser.samples)
+        for f in failures:
+            for rc in f['responseCodes']:
+                failuresHtml += "<tr><td>" + self.escapeHtml(f['label']) + "</td><td>" + self.escapeHtml(rc['responseCode'])
+                failuresHtml += "</td><td>" + str(rc['count']) + "</td><td>" + rc['percent'] + " %</td></tr>"
+        failuresHtml += "</table><br>"
+        failuresHtml += self.htmlParts['FailuresTableStartAndHeader']
+        for f in failures:
+            for m in f['topFailureMessages']:
+                failuresHtml += "<tr><td>" + self.escapeHtml(f['label']) + "</td><td>" + self.escapeHtml(m['responseCode'])
+                failuresHtml += "</td><td>" + self.escapeHtml(m['message']) + "</td><td>" + str(m['count']) + "</td></tr>"
+            for m in f['topAssertionFailures']:
+                failuresHtml += "<tr><td>" + self.escapeHtml(f['label']) + "</td><td>Assertion: " + self.escapeHtml(self.unescapeXml(m['assertion']))
+                failuresHtml += "</td><td>" + self.escapeHtml(self.unescapeXml(m['message'])) + "</td><td>" + str(m['count']) + "</td></tr>"
+        failuresHtml += "</table><br>"
+        return failuresHtml
+
+    @classmethod
+    def escapeHtml(self, text):
+        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+    @classmethod
+    def unescapeXml(self, text):
+        #assertion fields are kept as xml text of log file (see XmlLogAnalyser.toXml)
+        return text.replace("&quot;", "\"").replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&")
+
+    def breakdownRowToHtml(self, d, name, threadGroup):
+        rowHtml = "<tr><td>" + name + "</td><td>" + str(d['samples']) + "</td>"
+        rowHtml += "<td>" + str(d['averageTime']) + " ms</td>"
+        rowHtml += "<td>" + str(d['median']) + " ms</td>"
+        rowHtml += "<td>" + str(d['percentil90']) + " ms</td>"
+        rowHtml += "<td>" + str(d['minTime']) + " ms</td>"
+        rowHtml += "<td>" + str(d['maxTime']) + " ms</td>"
+        rowHtml += "<td>" + str(d['errorRate']) + " %</td>"
+        rowHtml += "<td>" + str(d['throughput']) + "/sec</td>"
+        rowHtml += "<td>" + str(d.get('threads', threadGroup)) + "</td></tr>"
+        return rowHtml
+
+    def optionalValue(self, value, unit):
+        if value == None:
+            return "-"
+        return str(value) + unit
+
     def addAggrRepJs(self, canvId, num, label, dt):
         barVar = "bc" + str(num)
         aggRespJs = "\n<script>\n"
@@ -1343,11 +4849,13 @@ class LogConverterHtml(object):
         for agg in self.loganalyser.aggrSamples:
             if agg.link != "samples_" and agg.sampleName != "TOTAL":
                 aggHtml += "<a id=\"" + agg.link + "\"><p id=\"navifont\">"+ self.htmlParts['nbspx10'] + agg.sampleName + " </p></a><br>"
-                oneTypeTable = []
-                for o in self.loganalyser.samples:
-                    if agg.sampleName==o.getLabel():
-                        oneTypeTable.append(o)
-                aggHtml += self.samplesToHtml(oneTypeTable) + "</table>"
+                #labels are encoded only for samples kept by sample retention policy
+                labelCode = self.sampleDictionaries['lb'].get(agg.sampleName)
+                if labelCode == None:
+                    aggHtml += "<p id=\"justsmallfont\">No samples of this label were kept by sample retention policy " + SampleRetention.policy + ".</p><br>"
+                    continue
+                aggHtml += " <button onclick=\"st" + str(self.samplesTableCounter + 1) + ".show()\">SHOW SAMPLES for " + agg.sampleName + "</button><br><br>"
+                aggHtml += self.createSamplesTable(labelCode, True)
         return aggHtml
 
     def createHtmlRespTimeGraph(self):
@@ -1357,11 +4865,18 @@ class LogConverterHtml(object):
         for agg in self.loganalyser.aggrSamples:
             if agg.getAmountOfSamples() > 1:
                 aggCounter += 1
-                canvasId = "respTime" + str(aggCounter)
-                respHtml +=" <button onclick=\"lc" + str(aggCounter) + ".drawChartData()\">DRAW CHART for " + agg.sampleName + "</button><br><br>"
-                respHtml += "<canvas id=\"" + canvasId + "\" width=\"800\" height=\"600\" >"
-                respHtml += "Your browser does not support the HTML5 canvas tag. </canvas><br><br><br>"
-                respHtml += self.addRespTimeJs(canvasId,"#00A3CC",agg.sampleName,aggCounter,agg.timeTable)
+                #graph of a label is cached without its number, so it's reused when other labels are filtered out
+                graphHtml = htmlFragmentCache.get("respTimeGraph", self.getLabelKey(agg),
+                                                  lambda: self.renderRespTimeGraph(agg, self.counterMarker))
+                respHtml += graphHtml.replace(self.counterMarker, str(aggCounter))
+        return respHtml
+
+    def renderRespTimeGraph(self, agg, aggCounter):
+        canvasId = "respTime" + str(aggCounter)
+        respHtml =" <button onclick=\"lc" + str(aggCounter) + ".drawChartData()\">DRAW CHART for " + agg.sampleName + "</button><br><br>"
+        respHtml += "<canvas id=\"" + canvasId + "\" width=\"800\" height=\"600\" >"
+        respHtml += "Your browser does not support the HTML5 canvas tag. </canvas><br><br><br>"
+        respHtml += self.addRespTimeJs(canvasId,"#00A3CC",agg.sampleName,aggCounter,agg.timeTable)
         return respHtml
 
     def addRespTimeJs(self, canvId, color, label, counter, data):
@@ -1374,64 +4889,105 @@ class LogConverterHtml(object):
         return respJs
 
     def createHtmlAllSamples(self):
-        return "<br><a id=\"samples_\"><p id=\"navifont\">All samples </p></a>" + self.samplesToHtml(self.loganalyser.samples)
+        allHtml = "<br><a id=\"samples_\"><p id=\"navifont\">All samples </p></a>"
+        if SampleRetention.policy != "all":
+            allHtml += "<p id=\"justsmallfont\">Only samples kept by sample retention policy " + SampleRetention.policy + " are shown.</p>"
+        return allHtml + self.createSamplesTable(-1, False)
 
     def createTbdList(self):
         tbdHtml = ""
         tbdHtml = tbdHtml + "</p>"
         return tbdHtml
 
-    def samplesToHtml(self, tableOfSamples):
-        samplesHtml = self.htmlParts['sampleTableStart'] + self.htmlParts['sampleTableHeader']
-        sampleNumber = 0
-        whichRow = 0
+    def createSamplesTable(self, labelCode, hidden):
+        self.samplesTableCounter += 1
+        tableId = "samplesTable" + str(self.samplesTableCounter)
+        tableHtml = "<div id=\"" + tableId + "\"><p id=\"justsmallfont\"></p>"
+        tableHtml += self.htmlParts['sampleTableStart'] + self.htmlParts['sampleTableHeader']
+        tableHtml += "<tbody></tbody></table><p id=\"justsmallfont\"><span></span></p></div>"
+        tableHtml += "\n<script>\nvar st" + str(self.samplesTableCounter) + " = new SamplesTable(\"" + tableId + "\", jmeterSampleData, "
+        tableHtml += str(labelCode) + ", " + str(hidden).lower() + ");\n</script>\n"
+        return tableHtml
+
+    def createHtmlSamplesData(self):
+        samplesKey = self.getSamplesKey()
+        if samplesKey == None:
+            dataJs, self.sampleDictionaries, chunkPaths = self.renderHtmlSamplesData(self.htmlLogPath + ".samples")
+            return dataJs
+        #chunk files of the same samples are shared by all reports of the log file
+        inputs = (samplesKey, SampleRetention().getCacheKey(), self.maxInlineSamples, self.sampleChunkSize)
+        chunkPrefix = self.logPath + ".samples-" + htmlFragmentCache.makeKey("samplesData", inputs)[1][:12] + "-"
+        dataJs, self.sampleDictionaries, chunkPaths = htmlFragmentCache.get(
+            "samplesData", inputs, lambda: self.renderHtmlSamplesData(chunkPrefix),
+            lambda fragment: all([os.path.isfile(p) for p in fragment[2]]))
+        return dataJs
+
+    def renderHtmlSamplesData(self, chunkPrefix):
+        samples = SampleRetention().getRetainedSamples(self.loganalyser.samples)
+        inlineCount = len(samples)
+        if self.maxInlineSamples != None:
+            inlineCount = min(inlineCount, max(0, self.maxInlineSamples))
+        self.sampleDictionaries = collections.OrderedDict()
+        for d in ['lb', 'rc', 'rm', 'tn', 'dt', 's']:
+            self.sampleDictionaries[d] = collections.OrderedDict()
+        chunkPaths = []
+        for chunkStart in range(inlineCount, len(samples), self.sampleChunkSize):
+            chunkPath = chunkPrefix + str(len(chunkPaths)) + ".js"
+            chunkJs = "jmeterSampleData.addChunk(" + str(len(chunkPaths)) + ","
+            chunkJs += self.samplesToJs(samples[chunkStart:chunkStart + self.sampleChunkSize]) + ");\n"
+            try:
+                chunkHndl = open(chunkPath, "w")
+                chunkHndl.write(chunkJs)
+                chunkHndl.close()
+            except IOError:
+                print("ERROR, problems while writing " + chunkPath)
+            chunkPaths.append(chunkPath)
+        chunkFiles = [os.path.basename(p) for p in chunkPaths]
+        inlineJs = self.samplesToJs(samples[:inlineCount])
+        dictionaries = {}
+        for d, values in self.sampleDictionaries.items():
+            dictionaries[d] = list(values.keys())
+        dataJs = "\n<script>\nvar jmeterSampleData = new SampleData(" + self.toJson(dictionaries) + ", "
+        dataJs += str(len(samples)) + ", " + str(inlineCount) + ", " + str(self.sampleChunkSize) + ", "
+        dataJs += self.toJson(chunkFiles) + ");\njmeterSampleData.addRows(0, " + inlineJs + ");\n</script>\n"
+        return dataJs, self.sampleDictionaries, chunkPaths
+
+    def samplesToJs(self, tableOfSamples):
+        rows = []
         for s in tableOfSamples:
-            sampleNumber += 1
-            if self.printDetails:
-                print("     Writing sample number " + str(sampleNumber) + " into " + self.htmlLogPath)
-            samplesHtml += "<tr"
-            if whichRow == 1:
-                samplesHtml += " class=\"even\" "
-            samplesHtml += "><td>"
-            newTime = datetime.datetime.fromtimestamp(int(s.getStartTime()) / 1e3)
-            samplesHtml += str(newTime) + "</td><td>"
-            samplesHtml += s.getSampleTime() + "</td><td>"
-            samplesHtml += s.getLabel() + "</td><td>"
-            samplesHtml += s.getRespCode() + "</td><td>"
-            samplesHtml += s.getRespMsg() + "</td><td>"
-            samplesHtml += s.getThreadName() + "</td><td>"
-            samplesHtml += s.getDataType() + "</td><td>"
-            samplesHtml += s.getStatus() + "</td><td>"
-            samplesHtml += s.getBytes() + "</td><td>"
-            samplesHtml += s.getLatency() + "</td></tr>\n"
+            row = [int(s.getStartTime()), int(s.getSampleTime()), self.encodeSampleValue('lb', s.getLabel()),
+                   self.encodeSampleValue('rc', s.getRespCode()), self.encodeSampleValue('rm', s.getRespMsg()),
+                   self.encodeSampleValue('tn', s.getThreadName()), self.encodeSampleValue('dt', s.getDataType()),
+                   self.encodeSampleValue('s', s.getStatus()), int(s.getBytes()), int(s.getLatency()),
+                   self.toOptionalInt(s.getConnect()), self.toOptionalInt(s.getSentBytes()),
+                   self.toOptionalInt(s.getNa())]
             sampleAssertList = s.getAssertions()
             if len(sampleAssertList) > 0:
-                samplesHtml += "<tr"
-                if whichRow == 1:
-                   samplesHtml += " class=\"even\" "
-                samplesHtml += "><td></td><td>Assertions:</td><td colspan=8>"
-                saCounter = 0
-                for sa in sampleAssertList:
-                    if saCounter==0:
-                        samplesHtml += self.htmlParts['assertTableStart']
-                        samplesHtml += self.htmlParts['assertTableHeader']
-                    samplesHtml += "<tr"
-                    samplesHtml += "><td>"
-                    samplesHtml += sa.getName() + "</td><td>"
-                    samplesHtml += sa.getFailure() + "</td><td>"
-                    samplesHtml += sa.getFailureMsg() + "</td><td>"
-                    samplesHtml += sa.getError() + "</td></tr>\n"
-                    saCounter += 1
-                samplesHtml += "</td></table>"
-            if whichRow == 1:
-                whichRow = 0
-            elif whichRow == 0:
-                whichRow = 1
-        return samplesHtml
+                row.append([[sa.getName(), sa.getFailure(), sa.getFailureMsg(), sa.getError()] for sa in sampleAssertList])
+            rows.append(row)
+        return self.toJson(rows)
+
+    def toOptionalInt(self, value):
+        if value == None:
+            return None
+        return int(value)
+
+    def encodeSampleValue(self, dictName, value):
+        values = self.sampleDictionaries[dictName]
+        code = values.get(value)
+        if code == None:
+            code = len(values)
+            values[value] = code
+        return code
+
+    @classmethod
+    def toJson(self, data):
+        return json.dumps(data, separators=(',', ':')).replace("</", "<\\/")
 
     def createHtmlEnd(self):
         return self.htmlParts['end']
 
+    @classmethod
     def readCss(self):
         cssContents = '''
 #samples
@@ -1826,19 +5382,268 @@ LineChart.prototype.createChart = function() {
     this.addYScale();
     this.drawChartArea();
 }
+
+function SampleData(dictionaries, total, inlineCount, chunkSize, chunkFiles) {
+    this.dictionaries = dictionaries;
+    this.total = total;
+    this.inlineCount = inlineCount;
+    this.chunkSize = chunkSize;
+    this.chunkFiles = chunkFiles;
+    this.rows = new Array(total);
+    this.chunkState = new Array(chunkFiles.length);
+    this.chunkCallbacks = new Array(chunkFiles.length);
+}
+
+SampleData.prototype.addRows = function(start, rows) {
+    for (var i=0;i<rows.length;i++)
+    {
+        this.rows[start+i] = rows[i];
+    }
+}
+
+SampleData.prototype.addChunk = function(num, rows) {
+    this.addRows(this.inlineCount+(num*this.chunkSize), rows);
+    this.chunkState[num] = "loaded";
+    var callbacks = this.chunkCallbacks[num] || [];
+    this.chunkCallbacks[num] = [];
+    for (var i=0;i<callbacks.length;i++)
+    {
+        callbacks[i]();
+    }
+}
+
+SampleData.prototype.loadChunk = function(num, callback) {
+    if (this.chunkState[num] == "loaded")
+    {
+        callback();
+        return;
+    }
+    if (!this.chunkCallbacks[num])
+    {
+        this.chunkCallbacks[num] = [];
+    }
+    this.chunkCallbacks[num].push(callback);
+    if (this.chunkState[num] != "loading")
+    {
+        this.chunkState[num] = "loading";
+        var script = document.createElement("script");
+        script.src = this.chunkFiles[num];
+        document.body.appendChild(script);
+    }
+}
+
+SampleData.prototype.loadRange = function(first, last, callback) {
+    var pending = [];
+    if (last > this.inlineCount && this.chunkFiles.length > 0)
+    {
+        var firstChunk = Math.max(0, Math.floor((first-this.inlineCount)/this.chunkSize));
+        var lastChunk = Math.min(this.chunkFiles.length-1, Math.floor((last-1-this.inlineCount)/this.chunkSize));
+        for (var c=firstChunk;c<=lastChunk;c++)
+        {
+            if (this.chunkState[c] != "loaded")
+            {
+                pending.push(c);
+            }
+        }
+    }
+    var remaining = pending.length;
+    if (remaining == 0)
+    {
+        callback();
+        return;
+    }
+    for (var i=0;i<pending.length;i++)
+    {
+        this.loadChunk(pending[i], function() {
+            remaining--;
+            if (remaining == 0)
+            {
+                callback();
+            }
+        });
+    }
+}
+
+function SamplesTable(containerId, sampleData, labelCode, hidden) {
+    this.data = sampleData;
+    this.container = document.getElementById(containerId);
+    this.controls = this.container.getElementsByTagName("p")[0];
+    this.body = this.container.getElementsByTagName("tbody")[0];
+    this.pager = this.container.getElementsByTagName("span")[0];
+    this.pageSize = 100;
+    this.page = 0;
+    this.matching = null;
+    this.filters = {2: labelCode, 7: -1, 3: -1};
+    if (labelCode < 0)
+    {
+        this.addFilter(2, "Label", "lb");
+    }
+    this.addFilter(7, "Status", "s");
+    this.addFilter(3, "Response code", "rc");
+    this.addPageButton("Previous page", -1);
+    this.addPageButton("Next page", 1);
+    if (hidden)
+    {
+        this.container.style.display = "none";
+    }
+    else
+    {
+        this.applyFilters();
+    }
+}
+
+SamplesTable.prototype.show = function() {
+    this.container.style.display = "";
+    this.applyFilters();
+}
+
+SamplesTable.prototype.addFilter = function(column, name, dictName) {
+    var table = this;
+    var select = document.createElement("select");
+    var values = this.data.dictionaries[dictName];
+    select.options.add(new Option(name + ": all", -1));
+    for (var i=0;i<values.length;i++)
+    {
+        select.options.add(new Option(values[i], i));
+    }
+    select.onchange = function() {
+        table.filters[column] = parseInt(select.value);
+        table.applyFilters();
+    };
+    this.controls.appendChild(select);
+}
+
+SamplesTable.prototype.addPageButton = function(name, step) {
+    var table = this;
+    var button = document.createElement("button");
+    button.innerHTML = name;
+    button.onclick = function() {
+        table.page += step;
+        table.render();
+    };
+    this.controls.appendChild(button);
+}
+
+SamplesTable.prototype.applyFilters = function() {
+    var table = this;
+    var active = [];
+    for (var column in this.filters)
+    {
+        if (this.filters[column] >= 0)
+        {
+            active.push(parseInt(column));
+        }
+    }
+    this.page = 0;
+    if (active.length == 0)
+    {
+        this.matching = null;
+        this.render();
+        return;
+    }
+    this.pager.innerHTML = "Loading samples...";
+    this.data.loadRange(0, this.data.total, function() {
+        var matching = [];
+        var rows = table.data.rows;
+        for (var i=0;i<table.data.total;i++)
+        {
+            var accepted = true;
+            for (var f=0;f<active.length;f++)
+            {
+                if (rows[i][active[f]] != table.filters[active[f]])
+                {
+                    accepted = false;
+                    break;
+                }
+            }
+            if (accepted)
+            {
+                matching.push(i);
+            }
+        }
+        table.matching = matching;
+        table.render();
+    });
+}
+
+SamplesTable.prototype.render = function() {
+    var table = this;
+    var count = (this.matching == null) ? this.data.total : this.matching.length;
+    var pages = Math.max(1, Math.ceil(count/this.pageSize));
+    this.page = Math.max(0, Math.min(this.page, pages-1));
+    var indices = [];
+    for (var i=this.page*this.pageSize;i<Math.min(count, (this.page+1)*this.pageSize);i++)
+    {
+        indices.push((this.matching == null) ? i : this.matching[i]);
+    }
+    var first = (indices.length > 0) ? indices[0] : 0;
+    var last = (indices.length > 0) ? indices[indices.length-1]+1 : 0;
+    this.data.loadRange(first, last, function() {
+        var rowsHtml = "";
+        for (var i=0;i<indices.length;i++)
+        {
+            rowsHtml += table.rowToHtml(table.data.rows[indices[i]], i%2 == 1);
+        }
+        table.body.innerHTML = rowsHtml;
+        table.pager.innerHTML = "Page " + (table.page+1) + " of " + pages + " (" + count + " samples)";
+    });
+}
+
+SamplesTable.prototype.rowToHtml = function(row, even) {
+    var d = this.data.dictionaries;
+    var rowStart = even ? "<tr class=\\"even\\">" : "<tr>";
+    var rowHtml = rowStart + "<td>" + this.formatTime(row[0]) + "</td><td>" + row[1] + "</td><td>";
+    rowHtml += d.lb[row[2]] + "</td><td>" + d.rc[row[3]] + "</td><td>" + d.rm[row[4]] + "</td><td>";
+    rowHtml += d.tn[row[5]] + "</td><td>" + d.dt[row[6]] + "</td><td>" + d.s[row[7]] + "</td><td>";
+    rowHtml += row[8] + "</td><td>" + row[9] + "</td><td>" + this.optional(row[10]) + "</td><td>";
+    rowHtml += this.optional(row[11]) + "</td><td>" + this.optional(row[12]) + "</td></tr>\\n";
+    if (row.length > 13)
+    {
+        rowHtml += rowStart + "<td></td><td>Assertions:</td><td colspan=11><table id=\\"assertions\\">";
+        rowHtml += "<tr><th>Name</th><th>Failure</th><th>Failure msg</th><th>Error</th></tr>";
+        for (var i=0;i<row[13].length;i++)
+        {
+            var a = row[13][i];
+            rowHtml += "<tr><td>" + a[0] + "</td><td>" + a[1] + "</td><td>" + a[2] + "</td><td>" + a[3] + "</td></tr>\\n";
+        }
+        rowHtml += "</table></td></tr>";
+    }
+    return rowHtml;
+}
+
+SamplesTable.prototype.optional = function(value) {
+    return (value == null) ? "-" : value;
+}
+
+SamplesTable.prototype.formatTime = function(ts) {
+    var t = new Date(ts);
+    var pad = function(n, width) {
+        var s = String(n);
+        while (s.length < width)
+        {
+            s = "0" + s;
+        }
+        return s;
+    };
+    var dateStr = t.getFullYear() + "-" + pad(t.getMonth()+1, 2) + "-" + pad(t.getDate(), 2);
+    var timeStr = pad(t.getHours(), 2) + ":" + pad(t.getMinutes(), 2) + ":" + pad(t.getSeconds(), 2);
+    return dateStr + " " + timeStr + "." + pad(t.getMilliseconds(), 3);
+}
 </script>
         '''
         return jsContents
 
     def predefineHtml(self):
-        self.htmlParts = {'start':'''
+        cssContents, jsContents = self.getStaticAssets()
+        htmlHead = '''
 <!DOCTYPE html>
 <!--
 Log file parsed and converted by Robot Framework JMeter lib released under LGPL license.
 Website: http://sourceforge.net/projects/rf-jmeter-py/
 -->
-<html>\n<head>\n<title>jmeterTestDifferentSamplers_xml.jtl.html</title>
-<style>\n''' + self.readCss() + "\n</style>\n</head>\n<body>\n" + self.readJs(),
+<html>\n<head>\n<title>jmeterTestDifferentSamplers_xml.jtl.html</title>'''
+        self.htmlParts = {'head':htmlHead,
+                          'start':htmlHead + "\n<style>\n" + cssContents + "\n</style>\n</head>\n<body>\n" + jsContents,
                           'navi':'''
 <div id="menu"><table id="samples"><tr class="even">
 <td><a href="#info">Info</a></td>
@@ -1868,14 +5673,27 @@ Website: http://sourceforge.net/projects/rf-jmeter-py/
 <table id="samples">
 <tr><th>Label</th><th>#Samples</th><th>Average</th><th>Median</th><th>90% Line</th>
 <th>Min</th><th>Max</th><th>Error %</th><th>Error % incl. assert.</th><th>Throughput</th>
-<th>KB/sec</th></tr>'''
+<th>KB/sec</th><th>Avg. Latency</th><th>Avg. Connect</th><th>Sent KB/sec</th>
+<th>Max active threads</th></tr>'''
+                             ,
+                          'ResponseCodesTableStartAndHeader':'''
+<table id="samples">
+<tr><th>Label</th><th>Response code</th><th>Count</th><th>% of samples</th></tr>'''
+                             ,
+                          'FailuresTableStartAndHeader':'''
+<table id="samples">
+<tr><th>Label</th><th>Response code / assertion</th><th>Failure message</th><th>Count</th></tr>'''
+                             ,
+                          'ThreadBreakdownTableHeader':'''<th>#Samples</th><th>Average</th><th>Median</th>
+<th>90% Line</th><th>Min</th><th>Max</th><th>Error %</th><th>Throughput</th>'''
                              ,
                           'sampleTableStart':'<table id="samples">\n',
                           'sampleTableHeader':'''
 <tr><th>Start time</th><th>Sample time (ms)</th><th>Label</th>
 <th>Response code</th><th>Response message</th>
 <th>Thread name</th><th>Data type</th>
-<th>Status</th><th>Bytes</th><th>Latency</th></tr>'''
+<th>Status</th><th>Bytes</th><th>Latency</th>
+<th>Connect</th><th>Sent bytes</th><th>Active threads</th></tr>'''
                               ,
                           'assertTableStart':'<table id=\"assertions\">\n',
                           'assertTableHeader':'''
@@ -1891,6 +5709,7 @@ Website: http://sourceforge.net/projects/rf-jmeter-py/
             reportOptions = int(reportOptions)
         if not isinstance(reportOptions, int):
             reportOptions = 0
+        reportOptions |= SampleRetention().getDisabledReports()
         self.htmlParts['navi'] = '''
 <div id="menu"><table id="samples"><tr class="even">
 <td><a href="#info">Info</a></td>
@@ -1931,5 +5750,16 @@ Website: http://sourceforge.net/projects/rf-jmeter-py/
                 self.htmlParts['navi'] += "&nbsp;"
         self.htmlParts['navi'] += '''
 </td>
-<td></tr></table></div>
+<td>
+        '''
+        if reportOptions & 0b00010000 == 0:
+            self.htmlParts['navi'] += "<a href=\"#failures\">Failures</a>"
+        self.htmlParts['navi'] += '''
+</td>
+<td>
+        '''
+        if getattr(self.loganalyser, 'threadBreakdown', None) != None:
+            self.htmlParts['navi'] += "<a href=\"#threadgr\">Thread groups</a>"
+        self.htmlParts['navi'] += '''
+</td></tr></table></div>
         '''
\ No newline at end of file
@@ -17,8 +17,12 @@
 #   python -m robot.libdoc JMeterLib JMeterLib.html
 
 import JMeterClasses
+try:
+    from JMeterAsync import JMeterAsyncKeywords
+except (ImportError, SyntaxError):
+    JMeterAsyncKeywords = object
 
-class JMeterLib(JMeterClasses.JMeterKeywords):
+class JMeterLib(JMeterClasses.JMeterKeywords, JMeterAsyncKeywords):
     """
 This library provides simple way to integrate Robot Framework and JMeter. JTL output
 files can be analysed and converted to HTML, Python dictionary or SQLite format.
@@ -47,6 +51,22 @@ Installation:
 OR
 - download, unzip and run command: python setup.py install
 
+Optional dependencies:
+- pyarrow - needed only for Parquet/Arrow export (pip install pyarrow)
+- Python 3 - needed only for asynchronous keywords (names ending with "Async"), they are
+  not available in Python 2
+
+Settings:
+- keywords Set Percentiles, Set Jtl Index, Set Jtl Parsing, Set Thread Breakdown, Set Sample
+  Retention, Set Analysis Profiling, Set Analysis Cache and Set Html Report Cache change
+  settings of the whole Python process, library scope is therefore GLOBAL. Reset Jtl Settings
+  restores their default values
+
+XML log files:
+- only assertionResult children of a sample are counted as assertions, other children
+  (java.net.URL, responseData, requestHeader, sub-samples and others) are not assertions,
+  java.net.URL sets URL of the sample
+
 Example for running JMeter and parsing results in single keyword:
  | run jmeter analyse jtl convert | D:/apache-jmeter-2.12/bin/jmeter.bat | D:/Tests/Test1Thread1Loop.jmx | D:/Tests/output1.jtl |
 
@@ -55,12 +75,22 @@ Example for running JMeter and parsing results in separate keyword:
 | run jmeter | D:/apache-jmeter-2.12/bin/jmeter.bat | D:/Tests/Test1Thread1Loop.jmx | ${logPath} |
 | analyse jtl convert | ${logPath} |  |  |
 
+Example for parsing log file once and converting results many times:
+| ${handle}= | parse jtl | ${logPath} |
+| convert handle to html | ${handle} |  |
+| convert handle to db | ${handle} |  |
+| ${result}= | get handle summary | ${handle} |
+
+Example for running two tests concurrently (Robot Framework 6.1 or newer, Python 3):
+| ${results}= | run jmeter analyse jtl convert concurrently | D:/apache-jmeter-2.12/bin/jmeter.bat | ${testPlans} | ${logPaths} |
+
 Example for reading parsed contents:
 | ${result} | analyse jtl convert | ${logPath} |  |
 | log | ${result} |  |  |
 | : FOR | ${ELEMENT} | IN |	@{result} |
 |  | log dictionary	| ${ELEMENT} |  |
 """
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
 
     def __init__(self):
         pass
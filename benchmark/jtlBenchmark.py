@@ -0,0 +1,200 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Benchmark of JTL analysis pipeline. Every stage (parse, index, calculate, sql, html)
+runs in a separate process. Peak RSS is the peak of the whole process including input
+of the stage (parsed samples), peak RSS delta is growth of the peak during the stage.
+Index file is written in its own process before the index stage, which measures reading
+and aggregation of the index.
+Baseline is compared only if it was measured with the same Python version.
+Examples:
+    python jtlBenchmark.py
+    python jtlBenchmark.py --samples 200000 --labels 50 --error-rate 0.05
+    python jtlBenchmark.py --save-baseline
+    python jtlBenchmark.py --compare
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import JMeterClasses
+from jtlGenerator import JtlGenerator, LAYOUTS
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+STAGES = ['parse', 'index', 'calculate', 'sql', 'html']
+
+def getPeakRssMb():
+    if resource == None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / (1024.0 * 1024.0)
+    return peak / 1024.0
+
+def getPythonVersion():
+    return "%d.%d" % sys.version_info[:2]
+
+def getAnalyser(jtlPath, layout):
+    if layout == 'xml':
+        return JMeterClasses.XmlLogAnalyser(jtlPath)
+    return JMeterClasses.CsvLogAnalyser(jtlPath)
+
+def runStage(stage, jtlPath, layout, resultQueue):
+    JMeterClasses.analysisCache.configure(0, 0)
+    JMeterClasses.JtlIndex.enabled = False
+    devNull = open(os.devnull, "w")
+    sys.stdout = devNull
+    try:
+        startTime = None
+        setupRss = None
+        if stage == 'parse':
+            analyser = getAnalyser(jtlPath, layout)
+            setupRss, startTime = getPeakRssMb(), time.time()
+            analyser.getSamples()
+        elif stage == 'index write':
+            analyser = getAnalyser(jtlPath, layout)
+            analyser.getSamples()
+            setupRss, startTime = getPeakRssMb(), time.time()
+            JMeterClasses.JtlIndex(jtlPath).write(analyser.samples)
+        elif stage == 'index':
+            #samples of index are created lazily, so the stage measures complete analysis from index
+            analyser = JMeterClasses.IndexLogAnalyser(jtlPath)
+            setupRss, startTime = getPeakRssMb(), time.time()
+            analyser.getSamples()
+            analyser.calculate()
+        elif stage == 'calculate':
+            analyser = getAnalyser(jtlPath, layout)
+            analyser.getSamples()
+            setupRss, startTime = getPeakRssMb(), time.time()
+            analyser.calculate()
+        else:
+            lai = JMeterClasses.LogAnalysisInitiator(jtlPath)
+            setupRss, startTime = getPeakRssMb(), time.time()
+            if stage == 'sql':
+                lai.convertLogToSql()
+            else:
+                lai.convertLogToHtml()
+        duration = time.time() - startTime
+    finally:
+        sys.stdout = sys.__stdout__
+        devNull.close()
+    resultQueue.put((duration, setupRss, getPeakRssMb()))
+
+def runStageProcess(stage, jtlPath, layout):
+    resultQueue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=runStage, args=(stage, jtlPath, layout, resultQueue))
+    process.start()
+    result = resultQueue.get()
+    process.join()
+    return result
+
+def measureStage(stage, jtlPath, layout, samples, repeat=1):
+    #the fastest of repeated runs is reported, short stages are noisy
+    if stage == 'index':
+        runStageProcess('index write', jtlPath, layout)
+    duration, setupRss, peakRss = min([runStageProcess(stage, jtlPath, layout) for i in range(max(1, repeat))])
+    return {'seconds': round(duration, 4),
+            'samplesPerSec': round(samples / max(duration, 1e-9), 1),
+            'peakRssMb': None if peakRss == None else round(peakRss, 1),
+            'peakRssDeltaMb': None if peakRss == None else round(peakRss - setupRss, 1)}
+
+def runBenchmark(samples, labels, errorRate, layouts, stages, repeat=1):
+    results = {}
+    workDir = tempfile.mkdtemp(prefix="jtlbench")
+    try:
+        for layout in layouts:
+            jtlPath = os.path.join(workDir, "bench_" + layout.replace("-", "_") + ".jtl")
+            JtlGenerator(layout, samples, labels, errorRate).write(jtlPath)
+            results[layout] = {}
+            for stage in stages:
+                if stage == 'index' and layout == 'xml':
+                    continue
+                results[layout][stage] = measureStage(stage, jtlPath, layout, samples, repeat)
+                print("%-10s %-9s %10.1f samples/s %8s MB peak RSS %8s MB peak RSS delta" % (layout, stage,
+                      results[layout][stage]['samplesPerSec'], results[layout][stage]['peakRssMb'],
+                      results[layout][stage]['peakRssDeltaMb']))
+    finally:
+        shutil.rmtree(workDir, ignore_errors=True)
+    return results
+
+def isComparable(baseline):
+    #throughput of Python 2 and Python 3 differs too much to be compared
+    version = str(baseline.get('python', ""))
+    if ".".join(version.split(".")[:2]) != getPythonVersion():
+        print("WARNING, baseline was measured with Python %s, not with Python %s, comparison is skipped"
+              % (version if version != "" else "of unknown version", getPythonVersion()))
+        return False
+    return True
+
+def compareWithBaseline(results, baseline, tolerance):
+    regressions = []
+    for layout, stages in results.items():
+        for stage, measured in stages.items():
+            expected = baseline.get('results', {}).get(layout, {}).get(stage)
+            if expected == None:
+                continue
+            ratio = measured['samplesPerSec'] / expected['samplesPerSec']
+            if ratio < 1.0 - tolerance:
+                regressions.append("%s/%s: %.1f samples/s, baseline %.1f samples/s (%.0f%%)"
+                                   % (layout, stage, measured['samplesPerSec'], expected['samplesPerSec'], ratio * 100))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of JTL analysis pipeline")
+    parser.add_argument("--samples", type=int, default=20000, help="number of samples in generated log files")
+    parser.add_argument("--labels", type=int, default=10, help="number of distinct labels")
+    parser.add_argument("--error-rate", type=float, default=0.01, help="fraction of failed samples")
+    parser.add_argument("--layouts", default=",".join(LAYOUTS), help="comma separated log layouts")
+    parser.add_argument("--stages", default=",".join(STAGES), help="comma separated pipeline stages")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of every stage, the fastest one is reported")
+    parser.add_argument("--save-baseline", action="store_true", help="store results as baseline")
+    parser.add_argument("--compare", action="store_true", help="compare results with stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed throughput drop against baseline")
+    args = parser.parse_args()
+    results = runBenchmark(args.samples, args.labels, args.error_rate, args.layouts.split(","), args.stages.split(","), args.repeat)
+    report = {'samples': args.samples, 'labels': args.labels, 'errorRate': args.error_rate,
+              'python': sys.version.split()[0], 'results': results}
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w") as baselineFile:
+            json.dump(report, baselineFile, indent=2, sort_keys=True, separators=(",", ": "))
+        print("Baseline saved to " + BASELINE_PATH)
+    if args.compare:
+        with open(BASELINE_PATH, "r") as baselineFile:
+            baseline = json.load(baselineFile)
+        if not isComparable(baseline):
+            return
+        if baseline.get('samples') != args.samples:
+            print("WARNING, baseline was measured for %s samples" % baseline.get('samples'))
+        regressions = compareWithBaseline(results, baseline, args.tolerance)
+        if len(regressions) > 0:
+            print("Performance regressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("No performance regressions against baseline")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Deterministic generator of synthetic JMeter log files used by jtlBenchmark.py.
+Example (100000 samples, 20 labels, 2% errors, csv with header):
+    python jtlGenerator.py output.jtl csv-header 100000 20 0.02
+"""
+
+import random
+import sys
+
+LAYOUTS = ['csv-header', 'csv10', 'csv12', 'xml']
+CSV_HEADER = "timeStamp,elapsed,label,responseCode,responseMessage,threadName,dataType," \
+             "success,failureMessage,bytes,sentBytes,grpThreads,allThreads,Latency,IdleTime,Connect\n"
+
+class JtlGenerator(object):
+    def __init__(self, layout, samples, labels=10, errorRate=0.01, threads=10, seed=1):
+        if layout not in LAYOUTS:
+            raise ValueError("Unknown layout %s, use one of %s" % (layout, ", ".join(LAYOUTS)))
+        self.layout = layout
+        self.samples = samples
+        self.labels = ["Request %03d" % i for i in range(labels)]
+        self.errorRate = errorRate
+        self.threads = threads
+        self.seed = seed
+        self.startTime = 1514500000000
+
+    def iterSamples(self):
+        rnd = random.Random(self.seed)
+        timeStamp = self.startTime
+        for i in range(self.samples):
+            timeStamp += rnd.randint(0, 5)
+            thread = i % self.threads + 1
+            elapsed = int(rnd.lognormvariate(4.5, 0.6))
+            latency = max(0, elapsed - rnd.randint(0, elapsed))
+            success = rnd.random() >= self.errorRate
+            yield {'ts': timeStamp, 't': elapsed, 'lt': latency, 'lb': rnd.choice(self.labels),
+                   'tn': "Thread Group 1-%d" % thread, 's': success, 'by': rnd.randint(200, 20000),
+                   'ct': rnd.randint(0, 30), 'ng': self.threads, 'na': self.threads}
+
+    def write(self, path):
+        with open(path, "w") as logFile:
+            if self.layout == 'xml':
+                self.writeXml(logFile)
+            else:
+                self.writeCsv(logFile)
+        return path
+
+    def writeCsv(self, logFile):
+        if self.layout == 'csv-header':
+            logFile.write(CSV_HEADER)
+        for s in self.iterSamples():
+            code, message = ("200", "OK") if s['s'] else ("500", "Internal Server Error")
+            row = [str(s['ts']), str(s['t']), s['lb'], code, message, s['tn'], "text", str(s['s']).lower()]
+            if self.layout == 'csv-header':
+                row += ["" if s['s'] else "Test failed", str(s['by']), "150", str(s['ng']), str(s['na']),
+                        str(s['lt']), "0", str(s['ct'])]
+            else:
+                row += [str(s['by']), str(s['lt'])]
+                if self.layout == 'csv12':
+                    row += [str(s['ng']), str(s['na'])]
+            logFile.write(",".join(row) + "\n")
+
+    def writeXml(self, logFile):
+        logFile.write('<?xml version="1.0" encoding="UTF-8"?>\n<testResults version="1.2">\n')
+        for s in self.iterSamples():
+            code, message = ("200", "OK") if s['s'] else ("500", "Internal Server Error")
+            logFile.write('<httpSample t="%d" lt="%d" ts="%d" s="%s" lb="%s" rc="%s" rm="%s" tn="%s" dt="text" by="%d" ng="%d" na="%d">\n'
+                          % (s['t'], s['lt'], s['ts'], str(s['s']).lower(), s['lb'], code, message, s['tn'], s['by'], s['ng'], s['na']))
+            logFile.write('  <assertionResult>\n    <name>Response Assertion</name>\n')
+            logFile.write('    <failure>%s</failure>\n    <error>false</error>\n' % str(not s['s']).lower())
+            if not s['s']:
+                logFile.write('    <failureMessage>Test failed: text expected to contain /OK/</failureMessage>\n')
+            logFile.write('  </assertionResult>\n</httpSample>\n')
+        logFile.write('</testResults>\n')
+
+if __name__ == '__main__':
+    if len(sys.argv) < 4:
+        print(__doc__)
+        sys.exit(1)
+    labels = int(sys.argv[4]) if len(sys.argv) > 4 else 10
+    errorRate = float(sys.argv[5]) if len(sys.argv) > 5 else 0.01
+    JtlGenerator(sys.argv[2], int(sys.argv[3]), labels, errorRate).write(sys.argv[1])
@@ -26,7 +26,7 @@ setup(name='robotframework-jmeterlibrary',
       author_email='mkov80@gmail.com',
       license='LGPLv3',
       url='https://github.com/kowalpy/Robot-Framework-JMeter-Library',
-      py_modules=['JMeterLib', 'JMeterClasses'],
+      py_modules=['JMeterLib', 'JMeterClasses', 'JMeterAsync'],
       data_files=[('Scripts', ['jmeterLibExample.txt']),
                   ('Doc', ['JMeterLib.html'])]
       )
\ No newline at end of file
@@ -0,0 +1,69 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+#small log files and settings shared by tests, tests are run with:
+#   python -m unittest discover -s tests
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import JMeterClasses
+
+csvHeader = "timeStamp,elapsed,label,responseCode,responseMessage,threadName,dataType,success,bytes,Latency"
+firstTimestamp = 1500000000000
+
+
+def createCsvRows(samples, interval=1000):
+    #samples are tuples (label, elapsed, success), one sample is started every interval milliseconds
+    rows = []
+    for i, (label, elapsed, success) in enumerate(samples):
+        rows.append("%d,%d,%s,%s,%s,Thread Group 1-1,text,%s,100,%d"
+                    % (firstTimestamp + i * interval, elapsed, label, "200" if success else "500",
+                       "OK" if success else "Internal Server Error", "true" if success else "false", elapsed // 2))
+    return rows
+
+
+def writeLines(path, lines):
+    with open(path, "w") as logFile:
+        logFile.write("\n".join(lines) + "\n")
+    return path
+
+
+def writeCsvLog(path, samples, interval=1000):
+    return writeLines(path, [csvHeader] + createCsvRows(samples, interval))
+
+
+class JtlTestCase(unittest.TestCase):
+    #every test gets its own directory and default settings of keywords
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="jmeterlib")
+        self.keywords = JMeterClasses.JMeterKeywords()
+        self.resetSettings()
+
+    def tearDown(self):
+        self.resetSettings()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def resetSettings(self):
+        self.keywords.resetJtlSettings()
+
+    def getPath(self, name):
+        return os.path.join(self.directory, name)
@@ -0,0 +1,67 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import unittest
+
+from jtlTestFiles import JtlTestCase, writeCsvLog
+
+
+class AnalysisCacheTest(JtlTestCase):
+
+    def setUp(self):
+        super(AnalysisCacheTest, self).setUp()
+        self.logPath = writeCsvLog(self.getPath("cache.jtl"), [("AB"[i % 2], 10 + i, i != 7) for i in range(40)])
+
+    def isCached(self, **filters):
+        #analyser object is created only if results are not taken from cache
+        return self.keywords.parseJtl(self.logPath, **filters).analyserObject == None
+
+    def test_cache_is_disabled_by_default(self):
+        self.keywords.parseJtl(self.logPath)
+        self.assertFalse(self.isCached())
+
+    def test_results_are_taken_from_memory(self):
+        self.keywords.setAnalysisCache(4)
+        fromLog = self.keywords.analyseJtl(self.logPath)
+        self.assertTrue(self.isCached())
+        self.assertEqual(self.keywords.analyseJtl(self.logPath), fromLog)
+
+    def test_results_are_taken_from_disk(self):
+        cacheDir = self.getPath("cache")
+        self.keywords.setAnalysisCache(0, cacheDir=cacheDir)
+        fromLog = self.keywords.analyseJtl(self.logPath)
+        self.assertEqual(len(os.listdir(cacheDir)), 1)
+        self.assertTrue(self.isCached())
+        self.assertEqual(self.keywords.analyseJtl(self.logPath), fromLog)
+
+    def test_changed_log_file_and_other_filter_are_not_cached(self):
+        self.keywords.setAnalysisCache(4)
+        self.keywords.parseJtl(self.logPath)
+        self.assertFalse(self.isCached(excludeLabels="B"))
+        self.assertTrue(self.isCached(excludeLabels="B"))
+        writeCsvLog(self.logPath, [("A", 10, True)] * 3)
+        self.assertFalse(self.isCached())
+        self.assertEqual(self.keywords.analyseJtl(self.logPath)[0]['samples'], 3)
+
+    def test_cleared_cache_is_empty(self):
+        self.keywords.setAnalysisCache(4, cacheDir=self.getPath("cache"))
+        self.keywords.parseJtl(self.logPath)
+        self.keywords.clearAnalysisCache()
+        self.assertFalse(self.isCached())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import sqlite3
+import unittest
+
+from jtlTestFiles import JtlTestCase, writeCsvLog
+import JMeterClasses
+
+
+class AnalysisHandleTest(JtlTestCase):
+
+    def setUp(self):
+        super(AnalysisHandleTest, self).setUp()
+        self.logPath = writeCsvLog(self.getPath("handle.jtl"), [("AB"[i % 2], 10 + i, i != 3) for i in range(20)])
+
+    def test_summary_of_handle_is_the_same_as_of_analysis(self):
+        handle = self.keywords.parseJtl(self.logPath)
+        self.assertEqual(self.keywords.getHandleSummary(handle), self.keywords.analyseJtl(self.logPath))
+
+    def test_handle_is_converted_without_reading_log_file_again(self):
+        handle = self.keywords.parseJtl(self.logPath)
+        os.remove(self.logPath)
+        htmlPath = self.keywords.convertHandleToHtml(handle)
+        self.assertTrue(os.path.isfile(htmlPath))
+        self.assertTrue(os.path.isfile(self.keywords.convertHandleToHtml(handle)))
+        dbPath = self.keywords.convertHandleToDb(handle, self.getPath("history.sql"))
+        connection = sqlite3.connect(dbPath)
+        try:
+            self.assertEqual(connection.execute("SELECT COUNT(*) FROM Sample").fetchone()[0], 20)
+        finally:
+            connection.close()
+
+    def test_label_statistics_of_handle(self):
+        handle = self.keywords.parseJtl(self.logPath)
+        statistics = self.keywords.getHandleLabelStatistics(handle, "A")
+        self.assertEqual(statistics['sampleName'], "A")
+        self.assertEqual(statistics['errorCount'], 0)
+        self.assertEqual(self.keywords.getHandleLabelStatistics(handle, "TOTAL")['errorCount'], 1)
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.getHandleLabelStatistics, handle, "C")
+
+    def test_incorrect_handle_is_rejected(self):
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.getHandleSummary, self.logPath)
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.convertHandleToHtml, None)
+
+
+if __name__ == '__main__':
+    unittest.main()
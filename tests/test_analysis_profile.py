@@ -0,0 +1,65 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import pstats
+import unittest
+
+from jtlTestFiles import JtlTestCase, writeCsvLog
+import JMeterClasses
+
+
+class AnalysisProfileTest(JtlTestCase):
+
+    def setUp(self):
+        super(AnalysisProfileTest, self).setUp()
+        self.logPath = writeCsvLog(self.getPath("profile.jtl"), [("AB"[i % 2], 10 + i, True) for i in range(30)])
+
+    def test_stages_of_analysis_and_conversion_are_profiled(self):
+        handle = self.keywords.parseJtl(self.logPath)
+        self.keywords.convertHandleToHtml(handle)
+        profile = self.keywords.getAnalysisProfile(handle)
+        self.assertEqual([s['stage'] for s in profile], ["cache lookup", "parse", "aggregate", "percentiles", "html"])
+        parse = profile[1]
+        self.assertEqual(parse['rows'], 30)
+        self.assertEqual(parse['bytesRead'], os.path.getsize(self.logPath))
+        self.assertTrue(parse['wallTime'] >= 0 and parse['cpuTime'] >= 0)
+        self.assertEqual(self.keywords.getAnalysisProfile(), profile)
+
+    @unittest.skipIf(JMeterClasses.resource == None, "resource module is not available")
+    def test_growth_of_process_peak_is_assigned_to_stage(self):
+        profile = JMeterClasses.AnalysisProfile()
+        profile.startStage("allocation")
+        data = b"x" * (100 * 1024 * 1024)
+        profile.endStage()
+        stage = profile.convertToList()[0]
+        self.assertTrue(stage['peakRssDeltaMb'] >= 90, stage)
+        self.assertTrue(stage['processPeakRssMb'] >= stage['peakRssDeltaMb'])
+        profile.startStage("no allocation")
+        profile.endStage()
+        self.assertEqual(profile.convertToList()[1]['peakRssDeltaMb'], 0)
+        del data
+
+    def test_cprofile_dump_contains_whole_analysis(self):
+        dumpPath = self.getPath("analysis.pstats")
+        self.keywords.setAnalysisProfiling(dumpPath)
+        self.keywords.analyseJtlConvertToHtml(self.logPath)
+        functions = [f[2] for f in pstats.Stats(dumpPath).stats.keys()]
+        self.assertIn("getSamples", functions)
+        self.assertIn("createHtml", functions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import stat
+import sys
+import unittest
+
+from jtlTestFiles import JtlTestCase, createCsvRows, csvHeader, writeCsvLog, writeLines
+import JMeterClasses
+try:
+    import asyncio
+    from JMeterAsync import JMeterAsyncKeywords
+except (ImportError, SyntaxError):
+    JMeterAsyncKeywords = None
+
+#fake JMeter writes log file with one sample per character of test plan name, plan fail.jmx fails
+fakeJmeter = '''#!%s
+import sys
+plan, log = sys.argv[sys.argv.index("-t") + 1], sys.argv[sys.argv.index("-l") + 1]
+if plan.endswith("fail.jmx"):
+    sys.exit(3)
+rows = %r
+with open(log, "w") as logFile:
+    logFile.write("\\n".join(rows[:len(plan.split("/")[-1])]) + "\\n")
+'''
+
+
+@unittest.skipIf(JMeterAsyncKeywords == None, "asynchronous keywords require Python 3")
+class AsyncKeywordsTest(JtlTestCase):
+
+    def setUp(self):
+        super(AsyncKeywordsTest, self).setUp()
+        self.asyncKeywords = JMeterAsyncKeywords()
+        self.jmeterPath = writeLines(self.getPath("jmeter"), [fakeJmeter % (sys.executable,
+                                     [csvHeader] + createCsvRows([("A", 10 + i, True) for i in range(20)]))])
+        os.chmod(self.jmeterPath, os.stat(self.jmeterPath).st_mode | stat.S_IEXEC)
+
+    def tearDown(self):
+        self.asyncKeywords.setAsyncExecutor()
+        super(AsyncKeywordsTest, self).tearDown()
+
+    def runKeyword(self, coroutine):
+        return asyncio.run(coroutine)
+
+    def writePlan(self, name):
+        return writeLines(self.getPath(name), ["<jmeterTestPlan/>"])
+
+    def test_analysis_in_thread_executor_is_the_same_as_synchronous(self):
+        logPath = writeCsvLog(self.getPath("async.jtl"), [("AB"[i % 2], 10 + i, True) for i in range(20)])
+        result = self.runKeyword(self.asyncKeywords.analyseJtlAsync(logPath, None, None, None, None, "^A$"))
+        self.assertEqual(result, self.keywords.analyseJtl(logPath, includeLabels="^A$"))
+        handle = self.runKeyword(self.asyncKeywords.parseJtlAsync(logPath))
+        self.assertTrue(isinstance(handle, JMeterClasses.LogAnalysisInitiator))
+
+    def test_analysis_in_process_executor(self):
+        logPath = writeCsvLog(self.getPath("async.jtl"), [("A", 10 + i, True) for i in range(20)])
+        self.asyncKeywords.setAsyncExecutor("process", 2)
+        self.assertEqual(self.runKeyword(self.asyncKeywords.analyseJtlAsync(logPath)), self.keywords.analyseJtl(logPath))
+
+    def test_concurrent_runs_are_analysed_in_order_of_test_plans(self):
+        plans = [self.writePlan(name) for name in ["first.jmx", "second.jmx"]]
+        logs = [self.getPath(name) for name in ["first.jtl", "second.jtl"]]
+        results = self.runKeyword(self.asyncKeywords.runJmeterAnalyseJtlConvertConcurrently(self.jmeterPath, plans, logs))
+        self.assertEqual([r[0]['samples'] for r in results], [8, 9])
+        self.assertTrue(os.path.isfile(logs[0] + ".html"))
+
+    def test_failed_run_is_raised(self):
+        plans = [self.writePlan(name) for name in ["first.jmx", "fail.jmx"]]
+        logs = [self.getPath(name) for name in ["first.jtl", "fail.jtl"]]
+        try:
+            self.runKeyword(self.asyncKeywords.runJmeterAnalyseJtlConvertConcurrently(self.jmeterPath, plans, logs))
+            self.fail("failed JMeter run wasn't raised")
+        except JMeterClasses.JMeterLibException as e:
+            self.assertIn("Value returned by JMeter: 3", str(e))
+
+    def test_incorrect_executor_is_rejected(self):
+        self.assertRaises(JMeterClasses.JMeterLibException, self.asyncKeywords.setAsyncExecutor, "fiber")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import sys
+import unittest
+
+from jtlTestFiles import JtlTestCase
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmark"))
+
+import jtlBenchmark
+from jtlGenerator import JtlGenerator, LAYOUTS
+
+
+def getResults(samplesPerSec):
+    return {'csv10': {'parse': {'samplesPerSec': samplesPerSec}}}
+
+
+class BenchmarkTest(JtlTestCase):
+
+    def test_generated_log_files_of_all_layouts_are_analysed(self):
+        for layout in LAYOUTS:
+            logPath = JtlGenerator(layout, 300, 4, 0.1).write(self.getPath(layout + ".jtl"))
+            result = self.keywords.analyseJtl(logPath)
+            self.assertEqual(result[0]['samples'], 300, layout)
+            self.assertEqual(len(result) - 2, 4, layout)
+            self.assertEqual(result[0]['malformedRows'], 0, layout)
+
+    def test_generated_log_file_is_deterministic(self):
+        paths = [JtlGenerator('csv-header', 100).write(self.getPath(name)) for name in ["first.jtl", "second.jtl"]]
+        with open(paths[0]) as first:
+            with open(paths[1]) as second:
+                self.assertEqual(first.read(), second.read())
+
+    def test_throughput_drop_over_tolerance_is_regression(self):
+        baseline = {'results': getResults(1000.0)}
+        self.assertEqual(jtlBenchmark.compareWithBaseline(getResults(800.0), baseline, 0.25), [])
+        self.assertEqual(len(jtlBenchmark.compareWithBaseline(getResults(700.0), baseline, 0.25)), 1)
+
+    def test_baseline_of_other_python_version_is_not_compared(self):
+        self.assertTrue(jtlBenchmark.isComparable({'python': "%d.%d.%d" % sys.version_info[:3]}))
+        otherVersion = "3.11.7" if sys.version_info[0] == 2 else "2.7.18"
+        self.assertFalse(jtlBenchmark.isComparable({'python': otherVersion}))
+        self.assertFalse(jtlBenchmark.isComparable({}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import csv
+import io
+import unittest
+
+from jtlTestFiles import JtlTestCase, createCsvRows, csvHeader, writeLines
+import JMeterClasses
+
+
+class CsvReaderTest(JtlTestCase):
+
+    def writeBytes(self, name, data):
+        path = self.getPath(name)
+        with open(path, "wb") as logFile:
+            logFile.write(data)
+        return path
+
+    def readBlocks(self, data, blockSize):
+        analyser = JMeterClasses.CsvLogAnalyser(self.getPath("unused.jtl"))
+        return [line for lines in analyser.readLineBlocks(io.BytesIO(data), blockSize) for line in lines]
+
+    def test_lines_are_joined_across_blocks(self):
+        text = u"first,\u00e9\u00e9\r\nsecond\r\n\r\nthird,\u20ac"
+        expected = [u"first,\u00e9\u00e9", "second", "", u"third,\u20ac"] if str is not bytes \
+            else ["first,\xc3\xa9\xc3\xa9", "second", "", "third,\xe2\x82\xac"]
+        for blockSize in range(1, 12):
+            self.assertEqual(self.readBlocks(text.encode("utf-8"), blockSize), expected, blockSize)
+        self.assertEqual(self.readBlocks(b"", 4), [])
+
+    def test_rows_are_the_same_as_rows_of_csv_module(self):
+        rows = createCsvRows([("A", 10, True), ("B", 20, False)])
+        rows.append('1500000002000,30,"Search, books",200,"multi\nline",Thread Group 1-1,text,true,100,15')
+        rows.append('1500000003000,40,"quoted ""label""",200,OK,Thread Group 1-1,text,true,100,20')
+        logPath = writeLines(self.getPath("quoted.jtl"), [csvHeader] + rows)
+        with open(logPath, "r") as csvFile:
+            expected = list(csv.reader(csvFile, delimiter=",", quoting=csv.QUOTE_ALL, quotechar="\""))
+        self.assertEqual(list(JMeterClasses.CsvLogAnalyser(logPath).readRows()), expected)
+        handle = self.keywords.parseJtl(logPath)
+        self.assertEqual([s.getLabel() for s in handle.samples], ["A", "B", "Search, books", "quoted \"label\""])
+        self.assertEqual(handle.samples[2].getRespMsg(), "multi\nline")
+
+    def test_line_numbers_of_malformed_rows_count_continuation_lines(self):
+        rows = createCsvRows([("A", 10, True)] * 4)
+        rows[1] = rows[1].replace(",OK,", ",\"first\nsecond\nthird\",")
+        rows[3] = rows[3].replace(",13,", ",slow,").replace(",10,", ",slow,")
+        logPath = writeLines(self.getPath("lines.jtl"), [csvHeader] + rows)
+        self.assertEqual(self.keywords.analyseJtl(logPath)[0]['malformedRows'], 1)
+        with open(logPath + ".quarantine") as quarantineFile:
+            self.assertEqual(quarantineFile.readlines()[1].split("\t")[0], "7")
+
+    def test_crlf_log_file_without_last_line_end(self):
+        rows = [csvHeader] + createCsvRows([("A", 10, True), ("B", 20, True)])
+        logPath = self.writeBytes("crlf.jtl", "\r\n".join(rows).encode("utf-8"))
+        summary = self.keywords.analyseJtl(logPath)
+        self.assertEqual(summary[0]['samples'], 2)
+        self.assertEqual(summary[0]['malformedRows'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import collections
+import math
+import unittest
+
+from jtlTestFiles import JtlTestCase, writeCsvLog
+import JMeterClasses
+
+responseTimes = [(i * 37) % 211 + (i % 5) * 100 for i in range(1001)]
+
+
+def getJMeterPercentPoint(values, percent):
+    #StatCalculator.getPercentPoint of JMeter Aggregate Report computed from sorted list
+    values = sorted(values)
+    target = int(math.floor(len(values) * (percent / 100.0) + 0.5))
+    return values[min(len(values) - 1, max(0, target - 1))]
+
+
+class ExactPercentilesTest(unittest.TestCase):
+
+    def test_percent_points_are_the_same_as_of_sorted_values(self):
+        percents = [50, 75, 90, 95, 99, 99.9]
+        percentiles = JMeterClasses.ExactPercentiles(responseTimes).getPercentiles(percents, "jmeter")
+        self.assertEqual(list(percentiles.keys()), ["p50", "p75", "p90", "p95", "p99", "p99.9"])
+        self.assertEqual(list(percentiles.values()), [getJMeterPercentPoint(responseTimes, p) for p in percents])
+
+    def test_legacy_median_and_90_line(self):
+        percentiles = JMeterClasses.ExactPercentiles(responseTimes[:1000])
+        values = sorted(responseTimes[:1000])
+        self.assertEqual(percentiles.getLegacyMedian(), int((values[499] + values[500]) / 2))
+        self.assertEqual(percentiles.getLegacyPerc90(), values[900])
+        self.assertEqual(JMeterClasses.ExactPercentiles([7, 3, 5]).getLegacyMedian(), 5)
+
+    def test_counted_values_give_the_same_results(self):
+        counted = JMeterClasses.ExactPercentiles(collections.Counter(responseTimes))
+        listed = JMeterClasses.ExactPercentiles(responseTimes)
+        self.assertEqual(counted.count, len(responseTimes))
+        self.assertEqual(counted.getPercentiles([1, 50, 100], "jmeter"), listed.getPercentiles([1, 50, 100], "jmeter"))
+        mean = float(sum(responseTimes)) / len(responseTimes)
+        expected = math.sqrt(sum([(t - mean) ** 2 for t in responseTimes]) / len(responseTimes))
+        self.assertAlmostEqual(counted.getStdDev(mean), expected)
+
+    def test_no_values(self):
+        percentiles = JMeterClasses.ExactPercentiles([])
+        self.assertEqual(list(percentiles.getPercentiles([50, 99], "jmeter").values()), [0, 0])
+        self.assertEqual(percentiles.getLegacyMedian(), 0)
+
+
+class JtlPercentilesTest(JtlTestCase):
+
+    def test_percentiles_of_log_file_labels(self):
+        logPath = writeCsvLog(self.getPath("percentiles.jtl"), [("A", t, True) for t in range(100, 0, -1)])
+        percentiles = self.keywords.getJtlPercentiles(logPath, "50,95,99", "jmeter")
+        self.assertEqual(dict(percentiles["A"]), {'p50': 50, 'p95': 95, 'p99': 99})
+        self.assertEqual(percentiles["TOTAL"], percentiles["A"])
+
+
+class PercentileSettingsTest(JtlTestCase):
+
+    def setUp(self):
+        super(PercentileSettingsTest, self).setUp()
+        self.logPath = writeCsvLog(self.getPath("settings.jtl"), [("A", t, True) for t in range(100, 0, -1)])
+
+    def getAggregate(self):
+        return self.keywords.analyseJtl(self.logPath)[1]
+
+    def test_requested_percentiles_are_added_to_summary(self):
+        self.assertEqual(sorted(self.getAggregate()['percentiles'].keys()), ["p50", "p75", "p90", "p95", "p99", "p99.9"])
+        self.keywords.setPercentiles("95;99", "jmeter")
+        self.assertEqual(dict(self.getAggregate()['percentiles']), {'p95': 95, 'p99': 99})
+
+    def test_mode_is_used_for_median_and_90_line(self):
+        self.assertEqual(self.getAggregate()['median'], 50)
+        self.keywords.setPercentiles("50,90", "jmeter")
+        self.assertEqual((self.getAggregate()['median'], self.getAggregate()['percentil90']), (50, 90))
+        self.keywords.setPercentiles("50,90,99.9", "dashboard")
+        aggregate = self.getAggregate()
+        self.assertEqual((aggregate['median'], aggregate['percentil90']), (50.5, 90.9))
+        self.assertEqual(aggregate['percentiles']['p99.9'], 100)
+
+    def test_percentiles_of_one_call_do_not_change_settings(self):
+        self.keywords.setPercentiles("90", "jmeter")
+        self.assertEqual(self.keywords.getJtlPercentiles(self.logPath, "90", "dashboard", "A"), {'p90': 90.9})
+        handle = self.keywords.parseJtl(self.logPath)
+        self.assertEqual(dict(self.keywords.getJtlPercentiles(handle, "90,99", label="TOTAL")), {'p90': 90, 'p99': 99})
+        self.assertEqual(JMeterClasses.ExactPercentiles.getCacheKey(), ("jmeter", (90,)))
+
+    def test_incorrect_percents_and_mode_are_rejected(self):
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.setPercentiles, "50,abc")
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.setPercentiles, "0,50")
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.setPercentiles, "101")
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.getJtlPercentiles, self.logPath, "95", "hdr")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from jtlTestFiles import JtlTestCase, firstTimestamp, writeCsvLog, writeLines
+
+extendedHeader = "timeStamp,elapsed,label,responseCode,responseMessage,threadName,dataType,success," \
+                 "failureMessage,bytes,sentBytes,grpThreads,allThreads,URL,Latency,IdleTime,Connect"
+
+
+class ExtendedFieldsTest(JtlTestCase):
+
+    def writeExtendedCsvLog(self):
+        rows = ["%d,100,A,200,OK,Thread Group 1-%d,text,true,,1000,150,%d,%d,http://localhost/a,%d,5,%d"
+                % (firstTimestamp + i * 1000, i + 1, i + 1, i + 1, 50 + i, i) for i in range(10)]
+        return writeLines(self.getPath("extended.jtl"), [extendedHeader] + rows)
+
+    def test_csv_columns_are_mapped_by_header(self):
+        handle = self.keywords.parseJtl(self.writeExtendedCsvLog())
+        sample = handle.samples[3]
+        self.assertEqual((sample.getConnect(), sample.getSentBytes(), sample.getIdleTime()), ("3", "150", "5"))
+        self.assertEqual((sample.getLatency(), sample.getNa(), sample.getUrl()), ("53", "4", "http://localhost/a"))
+        statistics = self.keywords.getHandleLabelStatistics(handle, "A")
+        self.assertEqual(statistics['averageLatency'], "54.50")
+        self.assertEqual(statistics['averageConnect'], "4.50")
+        self.assertEqual(statistics['connectPercentil90'], 8)
+        self.assertEqual(statistics['sentKBytesPerSec'], "0.2")
+        self.assertEqual(statistics['averageIdleTime'], "5.00")
+        self.assertEqual(statistics['maxActiveThreads'], 10)
+
+    def test_missing_fields_are_none(self):
+        handle = self.keywords.parseJtl(writeCsvLog(self.getPath("basic.jtl"), [("A", 10, True)] * 5))
+        statistics = self.keywords.getHandleLabelStatistics(handle, "TOTAL")
+        for key in ['averageConnect', 'connectPercentil90', 'sentKBytesPerSec', 'averageIdleTime', 'maxActiveThreads']:
+            self.assertEqual(statistics[key], None, key)
+        self.assertEqual(statistics['averageLatency'], "5.00")
+
+    def test_xml_attributes_of_extended_fields(self):
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<testResults version="1.2">']
+        for i in range(4):
+            lines.append('<httpSample t="20" lt="10" ct="%d" sby="300" it="2" ng="%d" na="%d" ts="%d" s="true" lb="A" rc="200" '
+                         'rm="OK" tn="Thread Group 1-1" dt="text" by="100"/>' % (i * 2, i + 1, i + 2, firstTimestamp + i * 1000))
+        lines.append('</testResults>')
+        handle = self.keywords.parseJtl(writeLines(self.getPath("extended.xml"), lines))
+        statistics = self.keywords.getHandleLabelStatistics(handle, "A")
+        self.assertEqual(statistics['averageConnect'], "3.00")
+        self.assertEqual(statistics['averageIdleTime'], "2.00")
+        self.assertEqual(statistics['maxActiveThreads'], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from jtlTestFiles import JtlTestCase, createCsvRows, csvHeader, firstTimestamp, writeLines
+import JMeterClasses
+
+
+def getResult(results, label):
+    return [r for r in results if r['label'] == label][0]
+
+
+class FailureAnalysisTest(JtlTestCase):
+
+    def writeLog(self):
+        #every 4th sample of label A fails, messages of failures are Error 0 ... Error 4
+        rows = createCsvRows([("A" if i % 2 == 0 else "B", 10, i % 8 != 0) for i in range(80)])
+        rows = [r.replace("Internal Server Error", "Error %d" % (i // 8 % 5)) for i, r in enumerate(rows)]
+        return writeLines(self.getPath("failures.jtl"), [csvHeader] + rows)
+
+    def test_log_file_and_handle_give_the_same_counts(self):
+        logPath = self.writeLog()
+        fromLog = self.keywords.analyseJtlFailures(logPath)
+        self.assertEqual(fromLog, self.keywords.analyseJtlFailures(self.keywords.parseJtl(logPath)))
+        self.assertEqual([r['label'] for r in fromLog], ["A", "B", "TOTAL"])
+        total = getResult(fromLog, "TOTAL")
+        self.assertEqual((total['samples'], total['failures']), (80, 10))
+        self.assertEqual(total['responseCodes'], [{'responseCode': "200", 'count': 70, 'percent': "87.50"},
+                                                  {'responseCode': "500", 'count': 10, 'percent': "12.50"}])
+        self.assertEqual(getResult(fromLog, "B")['failures'], 0)
+
+    def test_messages_are_counted_with_bounded_capacity(self):
+        results = self.keywords.analyseJtlFailures(self.writeLog(), 2, 2)
+        messages = getResult(results, "A")['topFailureMessages']
+        self.assertEqual(len(messages), 2)
+        for m in messages:
+            #two counters overestimate count of tracked message by count of evicted ones
+            self.assertTrue(m['count'] - m['maxOverestimate'] <= 2 <= m['count'])
+
+    def test_failed_assertions_of_xml_log(self):
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<testResults version="1.2">']
+        for i in range(3):
+            lines.append('<httpSample t="10" lt="5" ts="%d" s="true" lb="A" rc="200" rm="OK" tn="Thread Group 1-1" dt="text" by="100">'
+                         % (firstTimestamp + i * 1000))
+            lines.append('<assertionResult><name>Body</name><failure>%s</failure><error>false</error>'
+                         '<failureMessage>missing text</failureMessage></assertionResult></httpSample>' % ("true" if i > 0 else "false"))
+        lines.append('</testResults>')
+        results = self.keywords.analyseJtlFailures(writeLines(self.getPath("assertions.jtl"), lines))
+        self.assertEqual(getResult(results, "A")['topAssertionFailures'],
+                         [{'assertion': "Body", 'message': "missing text", 'count': 2, 'maxOverestimate': 0}])
+        self.assertEqual(getResult(results, "TOTAL")['failures'], 0)
+
+    def test_samples_of_log_file_are_not_kept(self):
+        analyser = JMeterClasses.LogAnalysisInitiator.createAnalyserObject(self.writeLog())
+        failureAnalyser = JMeterClasses.FailureAnalyser()
+        analyser.sampleConsumer = failureAnalyser.addSample
+        analyser.getSamples()
+        self.assertEqual(analyser.samples, [])
+        self.assertEqual(failureAnalyser.getResults()[-1]['samples'], 80)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from jtlTestFiles import JtlTestCase, writeCsvLog
+import JMeterClasses
+
+
+class HtmlReportCacheTest(JtlTestCase):
+
+    def setUp(self):
+        super(HtmlReportCacheTest, self).setUp()
+        self.renderedLabels = []
+        self.renderRespTimeGraph = JMeterClasses.LogConverterHtml.renderRespTimeGraph
+        renderedLabels = self.renderedLabels
+        renderRespTimeGraph = self.renderRespTimeGraph
+        def countedRenderRespTimeGraph(converter, agg, aggCounter):
+            renderedLabels.append(agg.sampleName)
+            return renderRespTimeGraph(converter, agg, aggCounter)
+        JMeterClasses.LogConverterHtml.renderRespTimeGraph = countedRenderRespTimeGraph
+        self.logPath = writeCsvLog(self.getPath("cache.jtl"), [("ABC"[i % 3], 10 + i, True) for i in range(30)])
+
+    def tearDown(self):
+        JMeterClasses.LogConverterHtml.renderRespTimeGraph = self.renderRespTimeGraph
+        super(HtmlReportCacheTest, self).tearDown()
+
+    def convert(self, **filters):
+        self.keywords.convertHandleToHtml(self.keywords.parseJtl(self.logPath, **filters))
+
+    def test_cache_is_disabled_by_default(self):
+        self.assertFalse(JMeterClasses.HtmlFragmentCache().isEnabled())
+        self.convert()
+        self.convert()
+        self.assertEqual(self.renderedLabels, ["A", "B", "C", "TOTAL"] * 2)
+
+    def test_label_graph_is_shared_by_reports_of_different_label_filters(self):
+        self.keywords.setHtmlReportCache(16)
+        self.convert(excludeLabels="B")
+        self.convert(excludeLabels="C")
+        self.convert(includeLabels="^A$")
+        self.assertEqual(self.renderedLabels, ["A", "C", "TOTAL", "B", "TOTAL", "TOTAL"])
+
+    def test_label_of_other_samples_is_rendered_again(self):
+        self.keywords.setHtmlReportCache(16)
+        self.convert(excludeLabels="C")
+        self.convert(labelGroups="[AC]=>A", excludeLabels="B")
+        self.convert(startOffset=5, excludeLabels="C")
+        self.assertEqual(self.renderedLabels, ["A", "B", "TOTAL", "A", "TOTAL", "A", "B", "TOTAL"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import re
+import unittest
+
+from jtlTestFiles import JtlTestCase, writeCsvLog
+
+
+class HtmlSamplesTableTest(JtlTestCase):
+
+    def convert(self, name, count, disableReports=None, maxInlineSamples=None):
+        logPath = writeCsvLog(self.getPath(name), [("AB"[i % 2], 10 + i, i != 3) for i in range(count)])
+        htmlPath = self.keywords.convertHandleToHtml(self.keywords.parseJtl(logPath), disableReports, maxInlineSamples)
+        with open(htmlPath) as htmlFile:
+            return htmlPath, htmlFile.read()
+
+    def getRows(self, js, call):
+        return json.loads(re.search(re.escape(call) + r"(\[.*\])\);", js).group(1))
+
+    def test_samples_are_rendered_by_script_from_compact_data(self):
+        html = self.convert("small.jtl", 25)[1]
+        self.assertIn(", 25, 25, 50000, []);", html)
+        rows = self.getRows(html, "jmeterSampleData.addRows(0, ")
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(rows[3][:2], [1500000003000, 13])
+        self.assertEqual(html.count("new SamplesTable("), 3)
+        #rows of samples are not written as html, size of tables doesn't depend on amount of samples
+        self.assertEqual(self.convert("large.jtl", 100)[1].count("<tr"), html.count("<tr"))
+
+    def test_samples_over_inline_limit_are_written_into_chunk_files(self):
+        htmlPath, html = self.convert("chunked.jtl", 25, maxInlineSamples=5)
+        self.assertEqual(len(self.getRows(html, "jmeterSampleData.addRows(0, ")), 5)
+        chunkPath = htmlPath + ".samples0.js"
+        self.assertIn(", 25, 5, 50000, [\"" + os.path.basename(chunkPath) + "\"]);", html)
+        with open(chunkPath) as chunkFile:
+            self.assertEqual(len(self.getRows(chunkFile.read(), "jmeterSampleData.addChunk(0,")), 20)
+
+    def test_disabled_sample_tables_contain_no_sample_data(self):
+        html = self.convert("disabled.jtl", 25, disableReports=10)[1]
+        self.assertNotIn("new SampleData(", html)
+        self.assertNotIn("new SamplesTable(", html)
+
+
+if __name__ == '__main__':
+    unittest.main()
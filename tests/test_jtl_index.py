@@ -0,0 +1,73 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import unittest
+
+from jtlTestFiles import JtlTestCase, writeCsvLog
+import JMeterClasses
+
+
+class JtlIndexTest(JtlTestCase):
+
+    def writeLog(self):
+        samples = [("B" if i % 3 == 0 else "A", 10 + i * 7 % 50, i % 11 != 4) for i in range(60)]
+        return writeCsvLog(self.getPath("index.jtl"), samples, 1500)
+
+    def analyseWithIndex(self, logPath, **filters):
+        self.keywords.setJtlIndex(True)
+        self.keywords.analyseJtl(logPath)
+        self.keywords.clearAnalysisCache()
+        self.assertTrue(JMeterClasses.JtlIndex(logPath).isValid())
+        return self.keywords.analyseJtl(logPath, **filters)
+
+    def getSampleValues(self, handle):
+        return [sorted(vars(s).items()) for s in handle.samples]
+
+    def test_index_is_written_and_gives_the_same_statistics(self):
+        logPath = self.writeLog()
+        fromLog = self.keywords.analyseJtl(logPath)
+        self.assertFalse(os.path.exists(logPath + ".idx"))
+        self.assertEqual(self.analyseWithIndex(logPath), fromLog)
+
+    def test_filtered_statistics_and_thread_breakdown_of_index(self):
+        logPath = self.writeLog()
+        self.keywords.setThreadBreakdown(True)
+        filters = {'startOffset': 10, 'endOffset': 60, 'labelGroups': "[AB]=>AB"}
+        fromLog = self.keywords.analyseJtl(logPath, **filters)
+        self.keywords.clearAnalysisCache()
+        self.assertEqual(self.analyseWithIndex(logPath, **filters), fromLog)
+
+    def test_samples_are_created_from_index_rows(self):
+        logPath = self.writeLog()
+        fromLog = self.getSampleValues(self.keywords.parseJtl(logPath))
+        self.analyseWithIndex(logPath)
+        self.keywords.clearAnalysisCache()
+        handle = self.keywords.parseJtl(logPath)
+        self.assertTrue(isinstance(handle.samples, JMeterClasses.IndexSamples))
+        self.assertEqual(self.getSampleValues(handle), fromLog)
+        self.assertEqual(handle.samples[5].getLabel(), "A")
+        self.assertEqual(len(handle.samples[10:20]), 10)
+
+    def test_changed_log_file_invalidates_index(self):
+        logPath = self.writeLog()
+        self.analyseWithIndex(logPath)
+        writeCsvLog(logPath, [("A", 10, True)] * 3)
+        self.assertFalse(JMeterClasses.JtlIndex(logPath).isValid())
+        self.assertEqual(self.keywords.analyseJtl(logPath)[0]['samples'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import unittest
+
+from jtlTestFiles import JtlTestCase, createCsvRows, csvHeader, firstTimestamp, writeCsvLog, writeLines
+import JMeterClasses
+
+
+class JtlParsingTest(JtlTestCase):
+
+    def writeMalformedCsvLog(self):
+        rows = createCsvRows([("A", 10 + i, True) for i in range(5)])
+        rows[1] = rows[1].rsplit(",", 2)[0]
+        rows[3] = rows[3].replace(",13,", ",slow,", 1)
+        return writeLines(self.getPath("malformed.jtl"), [csvHeader] + rows)
+
+    def readQuarantine(self, logPath):
+        with open(logPath + ".quarantine") as quarantineFile:
+            return [line.rstrip("\n").split("\t") for line in quarantineFile]
+
+    def test_malformed_rows_are_skipped_and_quarantined(self):
+        logPath = self.writeMalformedCsvLog()
+        summary = self.keywords.analyseJtl(logPath)[0]
+        self.assertEqual(summary['samples'], 3)
+        self.assertEqual(summary['malformedRows'], 2)
+        quarantine = self.readQuarantine(logPath)
+        self.assertEqual(quarantine[0], ["line", "reason", "content"])
+        self.assertEqual([entry[0] for entry in quarantine[1:]], ["3", "5"])
+        self.assertIn("expected 10 columns, found 8", quarantine[1][1])
+        self.assertIn(",slow,", quarantine[2][2])
+
+    def test_quarantine_file_can_be_disabled(self):
+        logPath = self.writeMalformedCsvLog()
+        self.keywords.setJtlParsing("lenient", False)
+        self.assertEqual(self.keywords.analyseJtl(logPath)[0]['malformedRows'], 2)
+        self.assertFalse(os.path.exists(logPath + ".quarantine"))
+
+    def test_strict_mode_fails_on_first_malformed_row(self):
+        logPath = self.writeMalformedCsvLog()
+        self.keywords.setJtlParsing("strict")
+        try:
+            self.keywords.analyseJtl(logPath)
+            self.fail("malformed row was accepted in strict mode")
+        except JMeterClasses.JMeterLibException as e:
+            self.assertIn("Malformed line 3 of", str(e))
+
+    def test_header_row_is_not_quarantined(self):
+        logPath = writeCsvLog(self.getPath("valid.jtl"), [("A", 10, True), ("B", 20, False)])
+        summary = self.keywords.analyseJtl(logPath)[0]
+        self.assertEqual(summary['samples'], 2)
+        self.assertEqual(summary['malformedRows'], 0)
+        self.assertFalse(os.path.exists(logPath + ".quarantine"))
+
+    def test_header_without_mandatory_column_is_reported(self):
+        rows = [",".join(row.split(",")[:6] + row.split(",")[7:]) for row in createCsvRows([("A", 10, True)] * 3)]
+        logPath = writeLines(self.getPath("header.jtl"), [csvHeader.replace(",dataType", "")] + rows)
+        try:
+            self.keywords.analyseJtl(logPath)
+            self.fail("missing header column wasn't reported")
+        except JMeterClasses.JMeterLibException as e:
+            self.assertIn("Column dt is missing", str(e))
+        self.assertFalse(os.path.exists(logPath + ".quarantine"))
+
+    def test_samples_before_damaged_end_of_xml_log_are_kept(self):
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<testResults version="1.2">']
+        for i in range(3):
+            lines.append('<httpSample t="%d" lt="5" ts="%d" s="true" lb="A" rc="200" rm="OK" tn="Thread Group 1-1" dt="text" by="100"/>'
+                         % (10 + i, firstTimestamp + i * 1000))
+        lines.append('<httpSample t="20" lt="5" ts="')
+        logPath = writeLines(self.getPath("truncated.jtl"), lines)
+        summary = self.keywords.analyseJtl(logPath)[0]
+        self.assertEqual(summary['samples'], 3)
+        self.assertEqual(summary['malformedRows'], 1)
+        self.assertIn("xml error", self.readQuarantine(logPath)[1][1])
+
+    def test_only_assertion_results_of_xml_sample_are_assertions(self):
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<testResults version="1.2">',
+                 '<httpSample t="10" lt="5" ts="%d" s="true" lb="A" rc="200" rm="OK" tn="Thread Group 1-1" dt="text" by="100">'
+                 % firstTimestamp,
+                 '<assertionResult><name>Response Assertion</name><failure>false</failure><error>false</error></assertionResult>',
+                 '<responseData class="java.lang.String">&lt;html&gt;OK&lt;/html&gt;</responseData>',
+                 '<java.net.URL>http://localhost/a</java.net.URL>',
+                 '</httpSample>', '</testResults>']
+        handle = self.keywords.parseJtl(writeLines(self.getPath("assertions.jtl"), lines))
+        sample = handle.samples[0]
+        self.assertEqual(len(sample.getAssertions()), 1)
+        self.assertEqual(sample.getUrl(), "http://localhost/a")
+        summary = self.keywords.getHandleSummary(handle)[0]
+        self.assertEqual(summary['assertions'], 1)
+        self.assertEqual(summary['samplesSuccessRateInclAssert'], summary['samplesSuccessRateNoAssert'])
+        self.assertEqual(float(summary['assertionPassRate']), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from jtlTestFiles import JtlTestCase, writeCsvLog
+import JMeterClasses
+
+labels = ["setUp", "Search books", "Search authors", "Login", "Order 12", "Order 13", "tearDown"]
+
+
+class LabelFiltersTest(JtlTestCase):
+
+    def setUp(self):
+        super(LabelFiltersTest, self).setUp()
+        self.logPath = writeCsvLog(self.getPath("labels.jtl"), [(labels[i % 7], 10 + i, True) for i in range(70)])
+
+    def getSamples(self, result):
+        return dict((agg['sampleName'], len(agg['timeTable'])) for agg in result[1:])
+
+    def test_labels_are_included_and_excluded(self):
+        result = self.keywords.analyseJtl(self.logPath, includeLabels="^(Search|Login|set)", excludeLabels="authors$")
+        self.assertEqual(self.getSamples(result), {"setUp": 10, "Search books": 10, "Login": 10, "TOTAL": 30})
+        self.assertEqual(result[0]['samples'], 30)
+
+    def test_labels_are_grouped_by_first_matching_rule(self):
+        result = self.keywords.analyseJtl(self.logPath, excludeLabels="^(setUp|tearDown)$",
+                                          labelGroups=r"^Search .*=>Search; ^Order \d+=>Order; ^Search books=>Books")
+        self.assertEqual(self.getSamples(result), {"Search": 20, "Login": 10, "Order": 20, "TOTAL": 50})
+
+    def test_group_uses_groups_of_regex(self):
+        result = self.keywords.analyseJtl(self.logPath, labelGroups=[r"^(\w+) \w+$=>\1 *"])
+        self.assertEqual(self.getSamples(result), {"setUp": 10, "Search *": 20, "Login": 10, "Order *": 20,
+                                                   "tearDown": 10, "TOTAL": 70})
+
+    def test_incorrect_rules_are_rejected(self):
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.analyseJtl, self.logPath, includeLabels="(Search")
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.analyseJtl, self.logPath, labelGroups="Search")
+
+    def test_filter_without_matching_label_fails(self):
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.analyseJtl, self.logPath, includeLabels="^Logout$")
+
+
+if __name__ == '__main__':
+    unittest.main()
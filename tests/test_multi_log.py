@@ -0,0 +1,70 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from jtlTestFiles import JtlTestCase, writeCsvLog
+import JMeterClasses
+
+firstSamples = [("AB"[i % 2], 10 + i * 7 % 90, i % 13 != 3) for i in range(120)]
+secondSamples = [("AB"[i % 3 == 0], 50 + i * 11 % 70, True) for i in range(80)]
+statisticKeys = ['sampleName', 'median', 'percentil90', 'percentiles', 'stddev', 'errorCount']
+
+
+def getStatistics(result):
+    return [dict((k, agg[k]) for k in statisticKeys) for agg in result[1:]]
+
+
+class MultiLogTest(JtlTestCase):
+
+    def setUp(self):
+        super(MultiLogTest, self).setUp()
+        self.dashboardWindow = JMeterClasses.ExactPercentiles.dashboardWindow
+        writeCsvLog(self.getPath("first.jtl"), firstSamples)
+        writeCsvLog(self.getPath("second.jtl"), secondSamples)
+        writeCsvLog(self.getPath("all.log"), firstSamples + secondSamples)
+
+    def tearDown(self):
+        JMeterClasses.ExactPercentiles.dashboardWindow = self.dashboardWindow
+        super(MultiLogTest, self).tearDown()
+
+    def test_combined_statistics_are_the_same_as_of_one_log_file(self):
+        combined = self.keywords.analyseJtlFiles(self.getPath("*.jtl"), 2)['combined']
+        single = self.keywords.analyseJtl(self.getPath("all.log"))
+        self.assertEqual(getStatistics(combined), getStatistics(single))
+        for agg, singleAgg in zip(combined[1:], single[1:]):
+            self.assertEqual(agg['timeTable'], sorted(singleAgg['timeTable']))
+
+    def test_dashboard_percentiles_of_last_samples_are_combined(self):
+        JMeterClasses.ExactPercentiles.dashboardWindow = 50
+        self.keywords.setPercentiles([50, 90, 99], "dashboard")
+        combined = self.keywords.analyseJtlFiles([self.getPath("first.jtl"), self.getPath("second.jtl")], 1)['combined']
+        self.assertEqual(getStatistics(combined), getStatistics(self.keywords.analyseJtl(self.getPath("all.log"))))
+
+    def test_results_of_workers_contain_counts_of_response_times(self):
+        JMeterClasses.ExactPercentiles.dashboardWindow = 50
+        summary, aggrSamples, breakdown = JMeterClasses.accumulateLogInWorker((self.getPath("first.jtl"), (False, False, "lenient", True), None))
+        self.assertEqual(sum(aggrSamples[-1].timeCounts.values()), 120)
+        self.assertEqual(len(aggrSamples[-1].timeTable), 50)
+
+    def test_glob_pattern_is_analysed_as_one_log_file(self):
+        result = self.keywords.analyseJtl(self.getPath("*.jtl"))
+        self.assertEqual(result, self.keywords.analyseJtlFiles(self.getPath("*.jtl"))['combined'])
+        self.assertEqual(result[-1]['sampleName'], "TOTAL")
+        self.assertEqual(result[0]['samples'], 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from jtlTestFiles import JtlTestCase, writeCsvLog
+import JMeterClasses
+
+
+@unittest.skipIf(JMeterClasses.pyarrow == None, "pyarrow is not installed")
+class ParquetExportTest(JtlTestCase):
+
+    def setUp(self):
+        super(ParquetExportTest, self).setUp()
+        self.logPath = writeCsvLog(self.getPath("export.jtl"), [("AB"[i % 2], 10 + i, i != 3) for i in range(20)])
+
+    def test_samples_and_aggregates_are_written_into_parquet_files(self):
+        summary = self.keywords.analyseJtlConvertToParquet(self.logPath, batchSize=7)
+        self.assertEqual(summary[0]['samples'], 20)
+        samplesPath, assertionsPath, aggregatedPath = [self.logPath + name for name in [".samples.parquet", ".assertions.parquet",
+                                                                                         ".aggregated.parquet"]]
+        samplesFile = JMeterClasses.pyarrow.parquet.ParquetFile(samplesPath)
+        self.assertEqual(samplesFile.metadata.num_rows, 20)
+        self.assertEqual(samplesFile.metadata.num_row_groups, 3)
+        samples = samplesFile.read().to_pydict()
+        self.assertEqual(samples['label'][:3], ["A", "B", "A"])
+        self.assertEqual(samples['sampleTime'][:3], [10, 11, 12])
+        self.assertEqual(samples['status'][3], False)
+        aggregated = JMeterClasses.pyarrow.parquet.read_table(aggregatedPath).to_pydict()
+        self.assertEqual(aggregated['label'], ["A", "B", "TOTAL"])
+        self.assertEqual(aggregated['samples'], [10, 10, 20])
+        self.assertEqual(JMeterClasses.pyarrow.parquet.read_table(assertionsPath).num_rows, 0)
+
+    def test_handle_is_exported_into_arrow_files(self):
+        handle = self.keywords.parseJtl(self.logPath, excludeLabels="B")
+        samplesPath = self.keywords.convertHandleToParquet(handle, "arrow")[0]
+        samples = JMeterClasses.pyarrow.ipc.open_file(samplesPath).read_all().to_pydict()
+        self.assertEqual(samples['label'], ["A"] * 10)
+        self.assertEqual(samples['sampleId'], list(range(1, 11)))
+
+    def test_unknown_format_is_rejected(self):
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.analyseJtlConvertToParquet, self.logPath, "csv")
+
+
+if __name__ == '__main__':
+    unittest.main()
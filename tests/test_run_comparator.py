@@ -0,0 +1,132 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from jtlTestFiles import JtlTestCase, writeCsvLog
+import JMeterClasses
+
+baselineTimes = list(range(100, 300))
+
+
+def getStatistics(times, throughput=10.0, label="A"):
+    return {label: {'histogram': JMeterClasses.LatencyHistogram.fromValues(times), 'throughput': throughput}}
+
+
+def getLabelResult(report, label="A"):
+    return [r for r in report['labels'] if r['label'] == label][0]
+
+
+class RunComparatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comparator = JMeterClasses.RunComparator(0.05, 5.0)
+
+    def test_identical_runs_do_not_regress(self):
+        report = self.comparator.compare(getStatistics(baselineTimes), getStatistics(baselineTimes))
+        result = getLabelResult(report)
+        self.assertFalse(report['regression'])
+        self.assertEqual(result['deltaP50'], 0)
+        self.assertEqual(result['deltaThroughput'], 0)
+        self.assertFalse(result['improvement'])
+
+    def test_slower_run_regresses(self):
+        report = self.comparator.compare(getStatistics(baselineTimes), getStatistics([int(t * 1.4) for t in baselineTimes]))
+        result = getLabelResult(report)
+        self.assertTrue(report['regression'])
+        self.assertTrue(result['regression'])
+        self.assertTrue(result['pValue'] < 0.05)
+        self.assertTrue(result['deltaP50'] >= 5)
+
+    def test_faster_run_is_improvement(self):
+        report = self.comparator.compare(getStatistics(baselineTimes), getStatistics([int(t * 0.6) for t in baselineTimes]))
+        result = getLabelResult(report)
+        self.assertFalse(report['regression'])
+        self.assertTrue(result['improvement'])
+
+    def test_degradation_below_minimum_does_not_regress(self):
+        report = self.comparator.compare(getStatistics(baselineTimes * 20), getStatistics([t + 6 for t in baselineTimes] * 20))
+        result = getLabelResult(report)
+        self.assertTrue(result['pValue'] < 0.05)
+        self.assertFalse(result['regression'])
+
+    def test_throughput_drop_regresses_without_response_time_change(self):
+        report = self.comparator.compare(getStatistics(baselineTimes, 10.0), getStatistics(baselineTimes, 8.0))
+        result = getLabelResult(report)
+        self.assertTrue(result['pValue'] >= 0.05)
+        self.assertEqual(result['deltaThroughput'], -20)
+        self.assertTrue(result['regression'])
+
+    def test_labels_of_one_run_are_unmatched(self):
+        baseline = getStatistics(baselineTimes)
+        baseline.update(getStatistics(baselineTimes, label="Login"))
+        current = getStatistics(baselineTimes)
+        current.update(getStatistics(baselineTimes, label="Logout"))
+        report = self.comparator.compare(baseline, current)
+        self.assertEqual(report['unmatchedLabels'], ["Login", "Logout"])
+        self.assertEqual([r['label'] for r in report['labels']], ["A"])
+
+
+class CompareJtlRunsTest(JtlTestCase):
+
+    def writeRun(self, name, factor=1.0, interval=1000):
+        return writeCsvLog(self.getPath(name), [("A", int(t * factor), True) for t in baselineTimes], interval)
+
+    def test_log_files_are_compared_as_parsed_handles(self):
+        baselinePath = self.writeRun("baseline.jtl")
+        currentPath = self.writeRun("current.jtl", 1.4)
+        fromLogs = self.keywords.compareJtlRuns(baselinePath, currentPath)
+        fromHandles = self.keywords.compareJtlRuns(self.keywords.parseJtl(baselinePath), self.keywords.parseJtl(currentPath))
+        self.assertEqual(fromLogs, fromHandles)
+        self.assertTrue(fromLogs['regression'])
+
+    def test_lower_throughput_of_log_file_regresses(self):
+        report = self.keywords.compareJtlRuns(self.writeRun("baseline.jtl"), self.writeRun("current.jtl", interval=2000))
+        self.assertTrue(getLabelResult(report)['regression'])
+        self.assertEqual(getLabelResult(report)['deltaP50'], 0)
+
+    def test_latest_testrun_of_sqlite_file_is_compared(self):
+        historyPath = self.getPath("history.sql")
+        self.keywords.analyseJtlConvertToDb(self.writeRun("baseline.jtl"), historyDbPath=historyPath)
+        self.keywords.analyseJtlConvertToDb(self.writeRun("current.jtl", 1.4), historyDbPath=historyPath)
+        byId = self.keywords.compareJtlRuns(1, 2, historyPath)
+        self.assertTrue(byId['regression'])
+        latest = self.keywords.compareJtlRuns(self.getPath("current.jtl"), historyPath)
+        self.assertFalse(latest['regression'])
+        self.assertEqual(getLabelResult(latest)['deltaP50'], 0)
+
+    def test_regression_fails_keyword_with_label_details(self):
+        baselinePath = self.writeRun("baseline.jtl")
+        self.keywords.jtlRunShouldNotRegress(baselinePath, self.writeRun("same.jtl"))
+        try:
+            self.keywords.jtlRunShouldNotRegress(baselinePath, self.writeRun("current.jtl", 1.4))
+            self.fail("Regression didn't fail")
+        except AssertionError as e:
+            self.assertIn("Performance regression:\nA: median 39.7%", str(e))
+            self.assertIn("\nTOTAL: median 39.7%", str(e))
+
+    def test_testrun_with_retained_samples_is_rejected(self):
+        historyPath = self.getPath("history.sql")
+        self.keywords.setSampleRetention("nth", 10)
+        self.keywords.analyseJtlConvertToDb(self.writeRun("baseline.jtl"), historyDbPath=historyPath)
+        try:
+            self.keywords.compareJtlRuns(historyPath, self.getPath("baseline.jtl"))
+            self.fail("Testrun with part of samples was compared")
+        except JMeterClasses.JMeterLibException as e:
+            self.assertIn("contains 20 of 200 samples of label A", str(e))
+
+
+if __name__ == '__main__':
+    unittest.main()
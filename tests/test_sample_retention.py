@@ -0,0 +1,100 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import sqlite3
+import unittest
+
+from jtlTestFiles import JtlTestCase, writeCsvLog
+import JMeterClasses
+
+
+class SampleRetentionTest(JtlTestCase):
+
+    def parseSamples(self, samples):
+        return self.keywords.parseJtl(writeCsvLog(self.getPath("retention.jtl"), samples)).samples
+
+    def test_all_keeps_every_sample(self):
+        samples = self.parseSamples([("A", 10, True)] * 5)
+        self.assertEqual(JMeterClasses.SampleRetention().getRetainedIndexes(samples), None)
+        self.assertEqual(len(JMeterClasses.SampleRetention().getRetainedSamples(samples)), 5)
+
+    def test_aggregates_keeps_no_sample(self):
+        samples = self.parseSamples([("A", 10, True)] * 5)
+        self.keywords.setSampleRetention("aggregates")
+        self.assertEqual(JMeterClasses.SampleRetention().getRetainedSamples(samples), [])
+
+    def test_nth_keeps_every_nth_sample(self):
+        samples = self.parseSamples([("A", 10, True)] * 25)
+        self.keywords.setSampleRetention("nth", 10)
+        self.assertEqual(JMeterClasses.SampleRetention().getRetainedIndexes(samples), [0, 10, 20])
+
+    def test_failures_keeps_every_failure_and_repeatable_sample_of_successes(self):
+        samples = self.parseSamples([("A", 10, i % 7 != 3) for i in range(70)])
+        self.keywords.setSampleRetention("failures", 20)
+        retained = JMeterClasses.SampleRetention().getRetainedIndexes(samples)
+        failures = [i for i in range(70) if i % 7 == 3]
+        self.assertTrue(set(failures).issubset(retained))
+        self.assertEqual(len(retained), len(failures) + 20)
+        self.assertEqual(retained, JMeterClasses.SampleRetention().getRetainedIndexes(samples))
+
+    def test_incorrect_policy_is_rejected(self):
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.setSampleRetention, "some")
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.setSampleRetention, "nth", 0)
+
+    def test_html_report_of_label_without_retained_samples(self):
+        for policy, size in [("nth", 10), ("failures", 0)]:
+            logPath = writeCsvLog(self.getPath(policy + ".jtl"), [("B" if i == 7 else "A", 10 + i, True) for i in range(51)])
+            self.keywords.setSampleRetention(policy, size)
+            self.keywords.analyseJtlConvertToHtml(logPath)
+            with open(logPath + ".html") as htmlFile:
+                html = htmlFile.read()
+            self.assertIn("No samples of this label were kept by sample retention policy " + policy, html)
+
+    def test_sqlite_stores_retained_samples_and_rollup_of_all_samples(self):
+        logPath = writeCsvLog(self.getPath("db.jtl"), [("A", 10 + i, True) for i in range(51)])
+        self.keywords.setSampleRetention("nth", 10)
+        self.keywords.analyseJtlConvertToDb(logPath)
+        db = sqlite3.connect(logPath + ".sql")
+        try:
+            self.assertEqual(db.execute("SELECT COUNT(*) FROM Sample").fetchone()[0], 6)
+            self.assertEqual(db.execute("SELECT samples FROM Aggregated WHERE label='A'").fetchone()[0], 51)
+            self.assertEqual(db.execute("SELECT SUM(samples) FROM SampleRollup").fetchone()[0], 51)
+        finally:
+            db.close()
+
+
+    def test_html_all_samples_part_contains_only_retained_samples(self):
+        logPath = writeCsvLog(self.getPath("html.jtl"), [("A", 10 + i, i % 5 != 2) for i in range(20)])
+        self.keywords.setSampleRetention("failures", 0)
+        self.keywords.analyseJtlConvertToHtml(logPath)
+        with open(logPath + ".html") as htmlFile:
+            html = htmlFile.read()
+        self.assertIn("Only samples kept by sample retention policy failures are shown.", html)
+        self.assertIn("jmeterSampleData.addRows(0, [[1500000002000,12,", html)
+        self.assertEqual(html.count(",0,0,0,0,0,0,100,"), 4)
+
+    def test_aggregates_policy_writes_no_raw_rows_into_sqlite(self):
+        logPath = writeCsvLog(self.getPath("aggregates.jtl"), [("A", 10, i != 3) for i in range(30)])
+        self.keywords.setSampleRetention("aggregates")
+        self.keywords.analyseJtlConvertToDb(logPath)
+        db = sqlite3.connect(logPath + ".sql")
+        try:
+            self.assertEqual(db.execute("SELECT COUNT(*) FROM Sample").fetchone()[0], 0)
+            self.assertEqual(db.execute("SELECT samples FROM Aggregated WHERE label='A'").fetchone()[0], 30)
+        finally:
+            db.close()
+
+if __name__ == '__main__':
+    unittest.main()
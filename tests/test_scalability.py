@@ -0,0 +1,73 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from jtlTestFiles import JtlTestCase, firstTimestamp, writeCsvLog, writeLines
+import JMeterClasses
+
+
+def getUslThroughput(threads, lambd=10.0, sigma=0.05, kappa=0.001):
+    return lambd * threads / (1 + sigma * (threads - 1) + kappa * threads * (threads - 1))
+
+
+class ScalabilityTest(JtlTestCase):
+
+    def writeStepLoadLog(self):
+        #every level of step load lasts 5 seconds, throughput of level follows USL
+        rows = []
+        second = 0
+        for threads in [1, 2, 4, 8, 16, 32, 64]:
+            perSecond = int(round(getUslThroughput(threads)))
+            for i in range(5):
+                for j in range(perSecond):
+                    rows.append("%d,%d,A,200,OK,Thread Group 1-1,text,%s,100,10,%d,%d"
+                                % (firstTimestamp + second * 1000 + j * 1000 // perSecond, 20 + threads,
+                                   "true" if j > 0 or threads < 64 else "false", threads // 2 + 1, threads))
+                second += 1
+        return writeLines(self.getPath("stepload.jtl"), rows)
+
+    def test_levels_of_active_threads(self):
+        result = self.keywords.analyseJtlScalability(self.writeStepLoadLog())
+        levels = result['levels']
+        self.assertEqual([l['threads'] for l in levels], [1, 2, 4, 8, 16, 32, 64])
+        self.assertEqual(levels[0]['samples'], 50)
+        self.assertEqual(levels[0]['seconds'], 5)
+        self.assertEqual(levels[0]['throughput'], 10)
+        self.assertEqual(levels[3]['average'], 28)
+        self.assertTrue(levels[-1]['errorRate'] > 0)
+        self.assertEqual(levels[0]['errorRate'], 0)
+
+    def test_usl_fit_finds_saturation_point(self):
+        usl = self.keywords.analyseJtlScalability(self.writeStepLoadLog())['usl']
+        self.assertAlmostEqual(usl['lambda'], 10)
+        self.assertTrue(25 < usl['peakThreads'] < 37, usl)
+        self.assertTrue(abs(usl['peakThroughput'] - getUslThroughput(30.8)) < 10, usl)
+        self.assertTrue(usl['rSquared'] > 0.99, usl)
+
+    def test_group_threads_of_handle_and_minimum_samples(self):
+        handle = self.keywords.parseJtl(self.writeStepLoadLog())
+        result = self.keywords.analyseJtlScalability(handle, "grpThreads", 100)
+        self.assertEqual(result['threadsColumn'], "grpThreads")
+        self.assertEqual([l['threads'] for l in result['levels']], [3, 5, 9, 17, 33])
+
+    def test_log_file_without_threads_is_rejected(self):
+        logPath = writeCsvLog(self.getPath("basic.jtl"), [("A", 10, True)] * 5)
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.analyseJtlScalability, logPath)
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.analyseJtlScalability, logPath, "threads")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from jtlTestFiles import JtlTestCase
+import JMeterClasses
+import JMeterLib
+
+
+class JtlSettingsTest(JtlTestCase):
+
+    def test_library_scope_is_global(self):
+        self.assertEqual(JMeterLib.JMeterLib.ROBOT_LIBRARY_SCOPE, "GLOBAL")
+
+    def test_settings_are_shared_by_library_instances(self):
+        self.keywords.setSampleRetention("nth", 5)
+        self.assertEqual(JMeterClasses.SampleRetention().getCacheKey(), ("nth", 5))
+        JMeterClasses.JMeterKeywords().setPercentiles("90", "jmeter")
+        self.assertEqual(JMeterClasses.ExactPercentiles.getCacheKey(), ("jmeter", (90,)))
+
+    def test_reset_restores_defaults(self):
+        self.keywords.setPercentiles("90,99", "dashboard")
+        self.keywords.setJtlIndex(True)
+        self.keywords.setJtlParsing("strict", False)
+        self.keywords.setThreadBreakdown(True)
+        self.keywords.setSampleRetention("aggregates")
+        self.keywords.setAnalysisCache(4)
+        self.keywords.setHtmlReportCache(8, True)
+        self.keywords.resetJtlSettings()
+        self.assertEqual(JMeterClasses.ExactPercentiles.mode, "legacy")
+        self.assertEqual(JMeterClasses.ExactPercentiles.percents, [50, 75, 90, 95, 99, 99.9])
+        self.assertFalse(JMeterClasses.JtlIndex.enabled)
+        self.assertEqual((JMeterClasses.JtlQuarantine.mode, JMeterClasses.JtlQuarantine.enabled), ("lenient", True))
+        self.assertFalse(JMeterClasses.ThreadBreakdown.enabled)
+        self.assertEqual(JMeterClasses.SampleRetention().getCacheKey(), ("all", 10000))
+        self.assertEqual(JMeterClasses.analysisCache.maxEntries, 0)
+        self.assertFalse(JMeterClasses.htmlFragmentCache.isEnabled())
+        self.assertFalse(JMeterClasses.htmlFragmentCache.externalAssets)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from jtlTestFiles import JtlTestCase, writeCsvLog
+import JMeterClasses
+
+
+class SlaThresholdTest(JtlTestCase):
+
+    def writeLog(self):
+        #1000 samples (3 failed) of 102 or 103 ms started every 10 ms
+        samples = [("A", 102 + i % 2, i % 333 != 5) for i in range(1000)]
+        return writeCsvLog(self.getPath("sla.jtl"), samples, 10)
+
+    def getValues(self, report):
+        return dict((r['threshold'], r['value']) for r in report['results'])
+
+    def test_error_rate_below_one_percent_is_not_rounded(self):
+        report = self.keywords.checkJtlThresholds(self.writeLog(), "TOTAL errorRate < 0.5; TOTAL errors == 3")
+        self.assertTrue(report['passed'])
+        self.assertAlmostEqual(self.getValues(report)["TOTAL errorRate < 0.5"], 0.3)
+
+    def test_metrics_are_calculated_in_float_arithmetic(self):
+        report = self.keywords.checkJtlThresholds(self.writeLog(), ["TOTAL average > 102.4", "TOTAL throughput > 99",
+                                                                    "TOTAL kbPerSec > 9.9", "A stddev > 0.4"])
+        values = self.getValues(report)
+        self.assertTrue(report['passed'])
+        self.assertAlmostEqual(values["TOTAL average > 102.4"], 102.5)
+        self.assertAlmostEqual(values["TOTAL throughput > 99"], 1000 / 10.093)
+        self.assertAlmostEqual(values["TOTAL kbPerSec > 9.9"], 100 * 1000 / 10.093 / 1000)
+        self.assertAlmostEqual(values["A stddev > 0.4"], 0.5)
+
+    def test_fail_fast_stops_aggregation(self):
+        report = self.keywords.checkJtlThresholds(self.writeLog(), "TOTAL errors < 2", True)
+        self.assertFalse(report['passed'])
+        self.assertTrue(report['aborted'])
+        self.assertEqual(report['failedEarly'], "TOTAL errors < 2")
+
+    def test_unknown_label_fails(self):
+        report = self.keywords.checkJtlThresholds(self.writeLog(), "Login p95 < 500")
+        self.assertFalse(report['passed'])
+        self.assertEqual(report['results'][0]['value'], None)
+
+    def test_incorrect_threshold_is_rejected(self):
+        self.assertRaises(JMeterClasses.JMeterLibException, JMeterClasses.SlaEvaluator, "TOTAL speed < 5")
+        self.assertRaises(JMeterClasses.JMeterLibException, JMeterClasses.SlaEvaluator, "TOTAL p95 <")
+
+
+if __name__ == '__main__':
+    unittest.main()
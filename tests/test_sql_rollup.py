@@ -0,0 +1,78 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import sqlite3
+import unittest
+
+from jtlTestFiles import JtlTestCase, writeCsvLog, firstTimestamp
+
+#4 samples per second, labels A and B alternate, the 6th sample (B) fails
+rollupSamples = [("A" if i % 2 == 0 else "B", 10 + i, i != 5) for i in range(12)]
+
+
+class SqlRollupTest(JtlTestCase):
+
+    def convert(self, historyDbPath=None):
+        logPath = writeCsvLog(self.getPath("rollup.jtl"), rollupSamples, 250)
+        self.keywords.analyseJtlConvertToDb(logPath, historyDbPath=historyDbPath)
+        return historyDbPath or logPath + ".sql"
+
+    def select(self, dbPath, sqlSelect):
+        db = sqlite3.connect(dbPath)
+        try:
+            return db.execute(sqlSelect).fetchall()
+        finally:
+            db.close()
+
+    def test_start_times_of_samples_are_stored(self):
+        startTimes = self.select(self.convert(), "SELECT startTime FROM Sample ORDER BY sampleId")
+        self.assertEqual([r[0] for r in startTimes], [firstTimestamp + i * 250 for i in range(12)])
+
+    def test_rollup_keeps_counts_sums_and_extremes_per_label_and_second(self):
+        rows = self.select(self.convert(), "SELECT a.label, r.second, r.samples, r.errors, r.sumTime, r.minTime, "
+                                           "r.maxTime, r.sumLatency FROM SampleRollup r JOIN Aggregated a "
+                                           "ON r.aggId = a.aggId ORDER BY a.label, r.second")
+        second = firstTimestamp // 1000
+        self.assertEqual(rows, [("A", second, 2, 0, 22, 10, 12, 11),
+                                ("A", second + 1, 2, 0, 30, 14, 16, 15),
+                                ("A", second + 2, 2, 0, 38, 18, 20, 19),
+                                ("B", second, 2, 0, 24, 11, 13, 11),
+                                ("B", second + 1, 2, 1, 32, 15, 17, 15),
+                                ("B", second + 2, 2, 0, 40, 19, 21, 19)])
+
+    def test_rollup_totals_match_aggregated_results(self):
+        dbPath = self.convert()
+        rollup = self.select(dbPath, "SELECT a.label, SUM(r.samples), SUM(r.errors) FROM SampleRollup r "
+                                     "JOIN Aggregated a ON r.aggId = a.aggId GROUP BY a.label ORDER BY a.label")
+        aggregated = self.select(dbPath, "SELECT label, samples FROM Aggregated WHERE label != 'TOTAL' ORDER BY label")
+        self.assertEqual([r[:2] for r in rollup], aggregated)
+        self.assertEqual([r[2] for r in rollup], [0, 1])
+
+    def test_start_time_column_is_added_to_older_sqlite_file(self):
+        historyPath = self.getPath("history.sql")
+        db = sqlite3.connect(historyPath)
+        db.execute("CREATE TABLE Sample(sampleId INTEGER PRIMARY KEY autoincrement, aggId INTEGER, sampleTime INTEGER, "
+                   "respCode INTEGER, respMsg TEXT, threadName TEXT, dataType TEXT, status TEXT, bytes INTEGER, "
+                   "latency INTEGER, connect INTEGER, sentBytes INTEGER, idleTime INTEGER, grpThreads INTEGER, "
+                   "allThreads INTEGER, url TEXT)")
+        db.commit()
+        db.close()
+        self.convert(historyPath)
+        self.assertEqual(self.select(historyPath, "SELECT MIN(startTime) FROM Sample")[0][0], firstTimestamp)
+        self.assertEqual(self.select(historyPath, "SELECT SUM(samples) FROM SampleRollup")[0][0], 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from jtlTestFiles import JtlTestCase, csvHeader, firstTimestamp, writeLines
+import JMeterClasses
+
+threadNames = ["Login 1-1", "Login 1-2", "Browse 2-1", "Browse 2-2", "Browse 2-3", "setUp"]
+
+
+class ThreadBreakdownTest(JtlTestCase):
+
+    def writeLog(self):
+        rows = []
+        for i in range(60):
+            threadName = threadNames[i % len(threadNames)]
+            rows.append("%d,%d,A,%s,OK,%s,text,%s,100,5" % (firstTimestamp + i * 100, 10 + i % 6 * 10,
+                        "200" if i != 7 else "500", threadName, "true" if i != 7 else "false"))
+        return writeLines(self.getPath("threads.jtl"), [csvHeader] + rows)
+
+    def getByName(self, aggregates):
+        return dict((agg['name'], agg) for agg in aggregates)
+
+    def test_samples_are_aggregated_by_thread_group_and_thread(self):
+        self.keywords.setThreadBreakdown(True)
+        result = self.keywords.analyseJtl(self.writeLog())
+        breakdown = result[-1]
+        groups = self.getByName(breakdown['threadGroups'])
+        self.assertEqual(sorted(groups.keys()), ["Browse 2", "Login 1", "setUp"])
+        self.assertEqual(groups["Login 1"]['samples'], 20)
+        self.assertEqual(groups["Login 1"]['threads'], 2)
+        self.assertEqual(groups["Login 1"]['errors'], 1)
+        self.assertEqual(groups["Login 1"]['errorRate'], "5.00")
+        self.assertEqual(groups["Browse 2"]['threads'], 3)
+        self.assertEqual(groups["Browse 2"]['averageTime'], "40.00")
+        self.assertEqual((groups["setUp"]['minTime'], groups["setUp"]['maxTime']), (60, 60))
+        threads = self.getByName(breakdown['threads'])
+        self.assertEqual(len(threads), 6)
+        self.assertEqual(threads["Browse 2-3"]['threadGroup'], "Browse 2")
+        self.assertEqual(threads["Browse 2-3"]['samples'], 10)
+        self.assertEqual(threads["Login 1-2"]['errors'], 1)
+
+    def test_breakdown_of_handle_requires_setting(self):
+        logPath = self.writeLog()
+        handle = self.keywords.parseJtl(logPath)
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.getHandleThreadBreakdown, handle)
+        self.assertEqual(self.keywords.getHandleSummary(handle)[-1]['sampleName'], "TOTAL")
+        self.keywords.setThreadBreakdown(True)
+        breakdown = self.keywords.getHandleThreadBreakdown(self.keywords.parseJtl(logPath))
+        self.assertEqual(sum(agg['samples'] for agg in breakdown['threadGroups']), 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from jtlTestFiles import JtlTestCase, firstTimestamp, writeCsvLog, writeLines
+import JMeterClasses
+
+#one sample per second, response time is 100 + second of the test
+samples = [("A", 100 + i, True) for i in range(20)]
+
+
+def writeXmlLog(path, samples, interval=1000):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<testResults version="1.2">']
+    for i, (label, elapsed, success) in enumerate(samples):
+        lines.append('<httpSample t="%d" lt="5" ts="%d" s="%s" lb="%s" rc="200" rm="OK" tn="Thread Group 1-1" dt="text" by="100">'
+                     % (elapsed, firstTimestamp + i * interval, "true" if success else "false", label))
+        lines.append('<httpSample t="1" lt="1" ts="%d" s="true" lb="%s-0" rc="200" rm="OK" tn="Thread Group 1-1" dt="text" by="10"/>'
+                     % (firstTimestamp + i * interval, label))
+        lines.append('<java.net.URL>http://localhost/</java.net.URL></httpSample>')
+    lines.append('</testResults>')
+    return writeLines(path, lines)
+
+
+class TimeWindowTest(JtlTestCase):
+
+    def getTimes(self, logPath, **filters):
+        handle = self.keywords.parseJtl(logPath, **filters)
+        return [int(s.getSampleTime()) for s in handle.samples]
+
+    def test_offsets_skip_ramp_up_and_ramp_down(self):
+        logPath = writeCsvLog(self.getPath("window.jtl"), samples)
+        self.assertEqual(self.getTimes(logPath, startOffset=5, endOffset=3), list(range(105, 117)))
+        summary = self.keywords.analyseJtl(logPath, startOffset=5, endOffset=3)
+        self.assertEqual(summary[0]['samples'], 12)
+
+    def test_absolute_window(self):
+        logPath = writeCsvLog(self.getPath("window.jtl"), samples)
+        times = self.getTimes(logPath, windowStart=firstTimestamp + 2000, windowEnd=str(firstTimestamp + 4000))
+        self.assertEqual(times, [102, 103, 104])
+
+    def test_offsets_of_xml_log_are_the_same_as_of_csv_log(self):
+        csvPath = writeCsvLog(self.getPath("window.jtl"), samples)
+        xmlPath = writeXmlLog(self.getPath("window.xml"), samples)
+        self.assertEqual(self.getTimes(xmlPath, startOffset=5, endOffset=3), self.getTimes(csvPath, startOffset=5, endOffset=3))
+
+    def test_bounds_of_xml_log_are_read_from_its_beginning_and_end(self):
+        xmlPath = writeXmlLog(self.getPath("window.xml"), samples)
+        analyser = JMeterClasses.XmlLogAnalyser(xmlPath)
+        self.assertEqual(analyser.getFirstAndLastTimestamp(), (firstTimestamp, firstTimestamp + 19000))
+
+    def test_window_without_samples_fails(self):
+        logPath = writeCsvLog(self.getPath("window.jtl"), samples)
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.analyseJtl, logPath, startOffset=15, endOffset=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+#Robot Framework JMeter Library
+#
+#This program is free software: you can redistribute it and/or modify
+#it under the terms of the GNU Lesser General Public License as published by
+#the Free Software Foundation, either version 3 of the License, or
+#any later version.
+#
+#This program is distributed in the hope that it will be useful,
+#but WITHOUT ANY WARRANTY; without even the implied warranty of
+#MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#GNU Lesser General Public License for more details.
+#
+#You should have received a copy of the GNU Lesser General Public License
+#along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import unittest
+
+from jtlTestFiles import JtlTestCase, writeCsvLog
+import JMeterClasses
+
+
+class TrendDashboardTest(JtlTestCase):
+
+    def setUp(self):
+        super(TrendDashboardTest, self).setUp()
+        self.historyPath = self.getPath("history.sql")
+        for run, delay in enumerate([0, 20, 40]):
+            logPath = writeCsvLog(self.getPath("run%d.jtl" % run),
+                                  [("Login" if i % 2 else "Search", 100 + delay + i, True) for i in range(20)])
+            self.keywords.analyseJtlConvertToDb(logPath, historyDbPath=self.historyPath)
+
+    def readTrends(self, **options):
+        return JMeterClasses.TrendDashboard(self.historyPath, **options).readHistory()
+
+    def test_trends_of_all_runs_and_labels_are_read(self):
+        runs, trends = self.readTrends()
+        self.assertEqual([r[1] for r in runs], [self.getPath("run%d.jtl" % i) for i in range(3)])
+        self.assertEqual([label for label, trend in trends], ["Login", "Search", "TOTAL"])
+        medians = dict(trends)["Search"]['median']
+        self.assertEqual(len(medians), 3)
+        self.assertTrue(medians[0] < medians[1] < medians[2])
+
+    def test_labels_and_last_runs_are_selected(self):
+        runs, trends = self.readTrends(labels="^Log", lastRuns=2)
+        self.assertEqual([r[1] for r in runs], [self.getPath("run1.jtl"), self.getPath("run2.jtl")])
+        self.assertEqual([label for label, trend in trends], ["Login"])
+        self.assertEqual(len(trends[0][1]['samples']), 2)
+
+    def test_dashboard_is_written_without_changing_sqlite_file(self):
+        with open(self.historyPath, "rb") as db:
+            before = db.read()
+        htmlPath = self.keywords.createJtlTrendDashboard(self.historyPath)
+        self.assertEqual(htmlPath, self.historyPath + ".trend.html")
+        with open(htmlPath) as html:
+            content = html.read()
+        self.assertIn("Trend of 3 test runs", content)
+        self.assertIn("<a href=\"#trend0\">Login</a>", content)
+        self.assertIn("drawTrends(trendData);", content)
+        with open(self.historyPath, "rb") as db:
+            self.assertEqual(db.read(), before)
+
+    def test_missing_sqlite_files_are_rejected(self):
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.createJtlTrendDashboard,
+                          self.getPath("missing*.sql"))
+        self.assertRaises(JMeterClasses.JMeterLibException, self.keywords.createJtlTrendDashboard,
+                          self.getPath("missing.sql"))
+        self.assertFalse(os.path.exists(self.getPath("missing.sql")))
+
+
+if __name__ == '__main__':
+    unittest.main()